@@ -11,8 +11,28 @@ function throwIfUnauthorized(res) {
   }
 }
 
-export async function getApplications(config, token) {
-  const res = await fetch(`${config.apiUrl}/applications`, {
+// Everything the board and the detail modal render (history is left out).
+const BOARD_FIELDS = [
+  "applicationId",
+  "title",
+  "company",
+  "location",
+  "appliedDate",
+  "jobUrl",
+  "mission",
+  "notes",
+  "contact",
+  "status",
+  "closedReason",
+  "updatedAt",
+].join(",");
+
+async function getApplicationsPage(config, token, cursor) {
+  const url = new URL(`${config.apiUrl}/applications`);
+  url.searchParams.set("fields", BOARD_FIELDS);
+  if (cursor) url.searchParams.set("cursor", cursor);
+
+  const res = await fetch(url.toString(), {
     method: "GET",
     headers: {
       Authorization: `Bearer ${token}`,
@@ -29,6 +49,43 @@ export async function getApplications(config, token) {
   return await res.json();
 }
 
+// The API is paginated: follow nextCursor until the board has every card.
+export async function getApplications(config, token) {
+  const items = [];
+  let cursor = null;
+
+  do {
+    const page = await getApplicationsPage(config, token, cursor);
+    items.push(...(page.items || []));
+    cursor = page.nextCursor || null;
+  } while (cursor);
+
+  return { items };
+}
+
+// First page of cards, stats and recent activity in one call; further card
+// pages come from /applications with the returned nextCursor.
+export async function getDashboard(config, token) {
+  const url = new URL(`${config.apiUrl}/dashboard`);
+  url.searchParams.set("fields", BOARD_FIELDS);
+
+  const res = await fetch(url.toString(), {
+    method: "GET",
+    headers: {
+      Authorization: `Bearer ${token}`,
+    },
+  });
+
+  throwIfUnauthorized(res);
+
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`API dashboard error (${res.status}): ${text}`);
+  }
+
+  return await res.json();
+}
+
 export async function patchApplication(config, token, applicationId, payload) {
   const res = await fetch(`${config.apiUrl}/applications/${applicationId}`, {
     method: "PATCH",
@@ -69,22 +126,59 @@ export async function deleteApplication(config, token, applicationId) {
   return await res.json();
 }
 
+// The same Idempotency-Key goes with every attempt, so a retry after a
+// network error or a 5xx never creates the card twice.
+const CREATE_ATTEMPTS = 3;
+
 export async function createApplication(config, token, payload) {
-  const res = await fetch(`${config.apiUrl}/applications`, {
+  const idempotencyKey = crypto.randomUUID();
+  let res = null;
+
+  for (let attempt = 1; attempt <= CREATE_ATTEMPTS; attempt += 1) {
+    try {
+      res = await fetch(`${config.apiUrl}/applications`, {
+        method: "POST",
+        headers: {
+          Authorization: `Bearer ${token}`,
+          "Content-Type": "application/json",
+          "Idempotency-Key": idempotencyKey,
+        },
+        body: JSON.stringify(payload || {}),
+      });
+    } catch (err) {
+      if (attempt === CREATE_ATTEMPTS) throw err;
+      continue;
+    }
+    if (res.status < 500 || attempt === CREATE_ATTEMPTS) break;
+  }
+
+  throwIfUnauthorized(res);
+
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`API POST error (${res.status}): ${text}`);
+  }
+
+  return await res.json();
+}
+// Refresh specific cards in one call. Results come back in `ids` order,
+// with found=false for cards that no longer exist.
+export async function getApplicationsByIds(config, token, ids) {
+  const res = await fetch(`${config.apiUrl}/applications/batch-get`, {
     method: "POST",
     headers: {
       Authorization: `Bearer ${token}`,
       "Content-Type": "application/json",
     },
-    body: JSON.stringify(payload || {}),
+    body: JSON.stringify({ ids, fields: BOARD_FIELDS }),
   });
 
   throwIfUnauthorized(res);
 
-  if (!res.ok) {
+  if (!res.ok && res.status !== 207) {
     const text = await res.text();
-    throw new Error(`API POST error (${res.status}): ${text}`);
+    throw new Error(`API batch-get error (${res.status}): ${text}`);
   }
 
   return await res.json();
-}
\ No newline at end of file
+}
@@ -2,6 +2,7 @@ from aws_cdk import (
     Stack,
     aws_dynamodb as dynamodb,
     aws_lambda as _lambda,
+    aws_lambda_event_sources as event_sources,
     aws_apigatewayv2 as apigw,
     aws_apigatewayv2_integrations as integrations,
     RemovalPolicy,
@@ -10,6 +11,8 @@ from aws_cdk import (
     aws_cognito as cognito,
     aws_apigatewayv2_authorizers as authorizers,
     aws_logs as logs,
+    aws_s3 as s3,
+    aws_secretsmanager as secretsmanager,
     Duration,
 )
 from constructs import Construct
@@ -41,6 +44,45 @@ class BackendStack(Stack):
             ),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
             removal_policy=RemovalPolicy.DESTROY,
+            # Feeds the search indexer (see SearchIndexerLambda)
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
+            # Expires delta sync tombstones (DEL#) and idempotency records (IDEM#)
+            time_to_live_attribute="expiresAt",
+        )
+
+        # Status filter + "most recently updated" sort without a partition read
+        # GSI1PK = "USER#{sub}#STATUS#{status}" (maintained by the Lambda;
+        # older cards get it from services/api/scripts/backfill_status_index.py).
+        # Tombstones are indexed under STATUS#DELETED: delta sync and the
+        # updatedAt sort merge the partitions (services/api/src/data/recent.py)
+        table.add_global_secondary_index(
+            index_name="StatusIndex",
+            partition_key=dynamodb.Attribute(
+                name="GSI1PK",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            sort_key=dynamodb.Attribute(
+                name="updatedAt",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            projection_type=dynamodb.ProjectionType.ALL,
+        )
+
+        # Export archives (gzip NDJSON), served through pre-signed URLs
+        export_bucket = s3.Bucket(
+            self,
+            "ExportsBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+            lifecycle_rules=[
+                s3.LifecycleRule(
+                    prefix="exports/",
+                    expiration=Duration.days(1),
+                ),
+            ],
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True,
         )
 
         # Cognito User Pool
@@ -58,6 +100,18 @@ class BackendStack(Stack):
             auth_flows=cognito.AuthFlow(user_password=True),
         )
 
+        # HMAC key of the pagination cursors (core/cursor.py), read by the
+        # Lambda at runtime so that it never appears in the template
+        cursor_secret = secretsmanager.Secret(
+            self,
+            "CursorSecret",
+            description="Signing key of the API pagination cursors",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                password_length=64,
+                exclude_punctuation=True,
+            ),
+        )
+
         # Lambda Function
         function = _lambda.Function(
             self,
@@ -70,11 +124,51 @@ class BackendStack(Stack):
             memory_size=256,
             environment={
                 "TABLE_NAME": table.table_name,
+                "EXPORT_BUCKET": export_bucket.bucket_name,
+                "CURSOR_SECRET_ARN": cursor_secret.secret_arn,
             },
             log_retention=logs.RetentionDays.ONE_WEEK,
         )
 
         table.grant_read_write_data(function)
+        export_bucket.grant_read_write(function)
+        cursor_secret.grant_read(function)
+
+        # Search index and history cleanup, from the table stream
+        # (services/api/src/indexer.py), so the API write paths pay nothing for them.
+        # Cards written before it are indexed by services/api/scripts/backfill_search_index.py
+        indexer = _lambda.Function(
+            self,
+            "SearchIndexerLambda",
+            runtime=_lambda.Runtime.PYTHON_3_12,
+            handler="indexer.handler",
+            architecture=_lambda.Architecture.ARM_64,
+            code=_lambda.Code.from_asset(LAMBDA_SRC_DIR),
+            timeout=Duration.seconds(30),
+            memory_size=256,
+            environment={
+                "TABLE_NAME": table.table_name,
+            },
+            log_retention=logs.RetentionDays.ONE_WEEK,
+        )
+
+        table.grant_read_write_data(indexer)
+        indexer.add_event_source(
+            event_sources.DynamoEventSource(
+                table,
+                starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=100,
+                max_batching_window=Duration.seconds(1),
+                bisect_batch_on_error=True,
+                retry_attempts=5,
+                # Only application items: index entries must not feed back in
+                filters=[
+                    _lambda.FilterCriteria.filter(
+                        {"dynamodb": {"Keys": {"SK": {"S": _lambda.FilterRule.begins_with("APP#")}}}}
+                    ),
+                ],
+            )
+        )
 
         # HTTP API Gateway
         api = apigw.HttpApi(
@@ -95,6 +189,12 @@ class BackendStack(Stack):
                 allow_headers=[
                     "Authorization",
                     "Content-Type",
+                    "If-None-Match",
+                    "Idempotency-Key",
+                ],
+                expose_headers=[
+                    "ETag",
+                    "Idempotent-Replayed",
                 ],
             ),
         )
@@ -115,6 +215,16 @@ class BackendStack(Stack):
             authorizer=jwt_authorizer,
         )
 
+        api.add_routes(
+            path="/dashboard",
+            methods=[apigw.HttpMethod.GET],
+            integration=integrations.HttpLambdaIntegration(
+                "DashboardIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
         api.add_routes(
             path="/applications",
             methods=[apigw.HttpMethod.GET, apigw.HttpMethod.POST],
@@ -125,6 +235,96 @@ class BackendStack(Stack):
             authorizer=jwt_authorizer,
         )
 
+        api.add_routes(
+            path="/applications/batch",
+            methods=[apigw.HttpMethod.POST],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsBatchIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/batch-delete",
+            methods=[apigw.HttpMethod.POST],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsBatchDeleteIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/batch-get",
+            methods=[apigw.HttpMethod.POST],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsBatchGetIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/batch-status",
+            methods=[apigw.HttpMethod.POST],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsBatchStatusIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/import",
+            methods=[apigw.HttpMethod.POST],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsImportIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/export",
+            methods=[apigw.HttpMethod.POST],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsExportIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/stats",
+            methods=[apigw.HttpMethod.GET],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsStatsIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/search",
+            methods=[apigw.HttpMethod.GET],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationsSearchIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
+        api.add_routes(
+            path="/applications/{id}/history",
+            methods=[apigw.HttpMethod.GET],
+            integration=integrations.HttpLambdaIntegration(
+                "ApplicationHistoryIntegration",
+                function,
+            ),
+            authorizer=jwt_authorizer,
+        )
+
         api.add_routes(
             path="/applications/{id}",
             methods=[
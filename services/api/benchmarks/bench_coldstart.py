@@ -0,0 +1,156 @@
+"""Cold-start benchmark of the Lambda handler module.
+
+Each run starts a fresh interpreter, imports `app` (which is what the Lambda
+init phase does, client warm-up included) and serves one GET /health event.
+The median over several runs is compared to a budget so that an import that
+sneaks back onto the cold path fails loudly instead of quietly regressing.
+
+Usage (from services/api):
+    python benchmarks/bench_coldstart.py [--runs 15] [--budget-ms 400] [--top 10]
+    python benchmarks/bench_coldstart.py --update-baseline [--baseline PATH] [--src PATH]
+
+Without --budget-ms the budget is `budget_ms` of the baseline (by default
+the committed benchmarks/baselines/coldstart.json): its median + 20%. An
+absolute time only means something on the machine it was measured on, so
+the baseline records the interpreter, platform and CPU count, and its
+budget is only enforced when they match this run's.
+
+CI (.github/workflows/api_checks.yml) compares a pull request with its base
+on the same runner: it records a baseline from the base revision's sources
+(--src) and checks the pull request against it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SRC_DIR = HERE.parent / "src"
+BASELINE_FILE = HERE / "baselines" / "coldstart.json"
+TOLERANCE = 0.20
+
+PROBE = """
+import time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.handler({"rawPath": "/health", "requestContext": {"http": {"method": "GET"}, "routeKey": "GET /health"}}, None)
+t2 = time.perf_counter()
+print((t1 - t0) * 1000, (t2 - t1) * 1000)
+"""
+
+
+def _env(src_dir: Path) -> dict:
+    env = dict(os.environ)
+    env.setdefault("AWS_LAMBDA_FUNCTION_NAME", "bench-coldstart")
+    env.setdefault("AWS_DEFAULT_REGION", "eu-west-3")
+    env.setdefault("TABLE_NAME", "bench-table")
+    env["PYTHONPATH"] = str(src_dir)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def _machine() -> dict:
+    """What an absolute init time depends on, besides the code."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def measure_once(src_dir: Path = SRC_DIR) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=src_dir,
+        env=_env(src_dir),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    init_ms, first_ms = (float(v) for v in out.stdout.split()[-2:])
+    return init_ms, first_ms
+
+
+def top_imports(limit: int, src_dir: Path = SRC_DIR) -> list:
+    """Heaviest modules by cumulative import time (python -X importtime)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=src_dir,
+        env=_env(src_dir),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of services/api/src/app.py")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline file to write or check against")
+    parser.add_argument("--src", type=Path, default=SRC_DIR, help="sources to measure (default: this checkout's)")
+    args = parser.parse_args()
+    src_dir = args.src.resolve()
+
+    samples = [measure_once(src_dir) for _ in range(args.runs)]
+    init = [s[0] for s in samples]
+    first = [s[1] for s in samples]
+    init_median = statistics.median(init)
+
+    print(f"runs: {args.runs}")
+    print(f"init (import app): median {init_median:7.1f} ms  max {max(init):7.1f} ms")
+    print(f"first /health:     median {statistics.median(first):7.2f} ms")
+
+    if args.top:
+        print(f"\ntop {args.top} imports (cumulative):")
+        for cumulative_us, name in top_imports(args.top, src_dir):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if args.update_baseline:
+        baseline = {
+            "init_median_ms": round(init_median, 1),
+            "budget_ms": round(init_median * (1 + TOLERANCE), 1),
+            "runs": args.runs,
+            **_machine(),
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    budget = args.budget_ms
+    if budget is None and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        recorded = {name: baseline.get(name) for name in _machine()}
+        if recorded != _machine():
+            print(f"\nbaseline measured on {recorded}, this run on {_machine()}: budget not enforced")
+            print("re-record it on this machine with --update-baseline")
+            return 0
+        budget = baseline["budget_ms"]
+
+    if budget is not None:
+        verdict = "OK" if init_median <= budget else "REGRESSION"
+        print(f"\nbudget {budget:.1f} ms: {verdict}")
+        return 0 if init_median <= budget else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
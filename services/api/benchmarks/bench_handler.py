@@ -0,0 +1,367 @@
+"""Local load test of the Lambda handler.
+
+Drives `app.handler` in-process with synthetic HTTP API v2 events against a
+local DynamoDB stand-in, and reports per route: p50/p95/p99 latency,
+throughput, DynamoDB calls and consumed capacity (read from the EMF line each
+request prints, see core/metrics.py).
+
+Backends:
+- moto (default): `pip install -r benchmarks/requirements.txt`
+- DynamoDB Local: `--endpoint http://localhost:8000`
+- the local storage engines (see data/local_table.py): `--engine memory` or
+  `--engine sqlite`; no DynamoDB stand-in needed
+
+Usage (from services/api):
+    python benchmarks/bench_handler.py --users 5 --partition-size 300 --requests 2000
+    python benchmarks/bench_handler.py --update-baseline     # record benchmarks/baselines/handler.json
+    python benchmarks/bench_handler.py --compare             # exit 1 if a route's p95 regressed
+
+The committed baseline was recorded with the defaults (moto, 5 users x 300
+applications, 2000 requests, seed 42, cache off). It keeps those settings
+under "params" and the machine (Python, platform, CPU count) under
+"machine". --compare refuses runs made with other settings, and latencies
+only compare on a similar machine: re-record the baseline on the machine
+that runs --compare.
+
+The container cache is disabled unless --cache is given, so the numbers
+measure the DynamoDB path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+SRC_DIR = HERE.parent / "src"
+BASELINE_FILE = HERE / "baselines" / "handler.json"
+TOLERANCE = 0.25
+
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(HERE))
+
+from events import application_payload, http_event  # noqa: E402
+
+TABLE_NAME = "jobtracker-bench"
+
+# (route key, weight): roughly what the board does
+SCENARIO: List[Tuple[str, int]] = [
+    ("GET /applications", 30),
+    ("GET /applications?status", 10),
+    ("GET /applications/stats", 5),
+    ("GET /dashboard", 5),
+    ("GET /applications/{id}", 25),
+    ("PATCH /applications/{id}", 15),
+    ("PATCH /applications/{id} status", 5),
+    ("POST /applications", 10),
+    ("DELETE /applications/{id}", 5),
+]
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    os.environ["TABLE_NAME"] = TABLE_NAME
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-3")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.environ["CACHE_TTL_SECONDS"] = "5" if args.cache else "0"
+    os.environ["STORAGE_ENGINE"] = args.engine
+    if args.engine == "sqlite":
+        os.environ["SQLITE_PATH"] = str(Path(tempfile.mkdtemp(prefix="jobtracker-bench-")) / "bench.sqlite3")
+    if args.endpoint:
+        os.environ["AWS_ENDPOINT_URL_DYNAMODB"] = args.endpoint
+
+
+def _create_table(client) -> None:
+    existing = client.list_tables().get("TableNames", [])
+    if TABLE_NAME in existing:
+        client.delete_table(TableName=TABLE_NAME)
+        client.get_waiter("table_not_exists").wait(TableName=TABLE_NAME)
+
+    # Mirrors infra/stacks/backend_stack.py
+    client.create_table(
+        TableName=TABLE_NAME,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+            {"AttributeName": "GSI1PK", "AttributeType": "S"},
+            {"AttributeName": "updatedAt", "AttributeType": "S"},
+        ],
+        KeySchema=[
+            {"AttributeName": "PK", "KeyType": "HASH"},
+            {"AttributeName": "SK", "KeyType": "RANGE"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "StatusIndex",
+                "KeySchema": [
+                    {"AttributeName": "GSI1PK", "KeyType": "HASH"},
+                    {"AttributeName": "updatedAt", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
+    )
+    client.get_waiter("table_exists").wait(TableName=TABLE_NAME)
+
+
+class Driver:
+    """Calls the handler and collects latency + EMF metrics per route."""
+
+    def __init__(self, handler: Callable, after_call: Optional[Callable[[], None]] = None) -> None:
+        self.handler = handler
+        self.after_call = after_call
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.capacity: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def call(self, label: str, event: Dict[str, Any], record: bool = True) -> Dict[str, Any]:
+        captured = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(captured):
+            response = self.handler(event, None)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.after_call is not None:
+            self.after_call()
+
+        if record:
+            self.samples[label].append(elapsed_ms)
+            self.statuses[label][response["statusCode"]] += 1
+            for line in captured.getvalue().splitlines():
+                if line.startswith('{"_aws"'):
+                    emf = json.loads(line)
+                    for name in ("DynamoDBCalls", "ConsumedRCU", "ConsumedWCU", "ItemCount", "ResponseBytes"):
+                        self.capacity[label][name] += emf.get(name, 0)
+        return response
+
+
+def _body(response: Dict[str, Any]) -> Any:
+    body = response.get("body") or ""
+    if response.get("isBase64Encoded"):
+        import base64
+        import gzip
+
+        body = gzip.decompress(base64.b64decode(body)).decode("utf-8")
+    return json.loads(body) if body else None
+
+
+def _seed(driver: Driver, users: List[str], partition_size: int, rng: random.Random) -> Dict[str, List[str]]:
+    ids: Dict[str, List[str]] = {}
+    for sub in users:
+        ids[sub] = []
+        remaining = partition_size
+        while remaining > 0:
+            chunk = min(remaining, 200)
+            payload = [application_payload(rng) for _ in range(chunk)]
+            response = driver.call("seed", http_event("POST /applications/batch", sub, body=payload), record=False)
+            for result in _body(response)["results"]:
+                if result.get("ok"):
+                    ids[sub].append(result["applicationId"])
+            remaining -= chunk
+    return ids
+
+
+def _run(driver: Driver, ids: Dict[str, List[str]], requests: int, rng: random.Random) -> float:
+    labels = [label for label, _ in SCENARIO]
+    weights = [weight for _, weight in SCENARIO]
+    users = list(ids)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        label = rng.choices(labels, weights)[0]
+        sub = rng.choice(users)
+        owned = ids[sub]
+
+        if label == "GET /applications":
+            event = http_event("GET /applications", sub, query={"limit": "50"})
+        elif label == "GET /applications?status":
+            event = http_event("GET /applications", sub, query={"status": "CLOSED", "sort": "updatedAt"})
+        elif label in ("GET /applications/stats", "GET /dashboard"):
+            event = http_event(label, sub)
+        elif label == "POST /applications":
+            event = http_event("POST /applications", sub, body=application_payload(rng))
+        elif not owned:
+            continue
+        elif label == "GET /applications/{id}":
+            event = http_event(label, sub, path_params={"id": rng.choice(owned)})
+        elif label == "PATCH /applications/{id}":
+            event = http_event(label, sub, path_params={"id": rng.choice(owned)}, body={"notes": "bench edit"})
+        elif label == "PATCH /applications/{id} status":
+            body = rng.choice(
+                [
+                    {"status": "ACCEPTED"},
+                    {"status": "IN_PROGRESS"},
+                    {"status": "CLOSED", "closedReason": rng.choice(["REFUSED", "ABANDONED"])},
+                ]
+            )
+            event = http_event("PATCH /applications/{id}", sub, path_params={"id": rng.choice(owned)}, body=body)
+        else:
+            event = http_event(label, sub, path_params={"id": owned.pop(rng.randrange(len(owned)))})
+
+        response = driver.call(label, event)
+        if label == "POST /applications" and response["statusCode"] == 201:
+            owned.append(_body(response)["applicationId"])
+
+    return time.perf_counter() - started
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _report(driver: Driver, wall_seconds: float) -> Dict[str, Dict[str, float]]:
+    summary: Dict[str, Dict[str, float]] = {}
+    header = f"{'route':34} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'calls':>6} {'RCU':>7} {'WCU':>7} {'KiB':>7}  statuses"
+    print(header)
+    print("-" * len(header))
+    total = 0
+    for label, _ in SCENARIO:
+        samples = driver.samples.get(label)
+        if not samples:
+            continue
+        n = len(samples)
+        total += n
+        cap = driver.capacity[label]
+        row = {
+            "n": n,
+            "p50": statistics.median(samples),
+            "p95": _percentile(samples, 95),
+            "p99": _percentile(samples, 99),
+            "rps": n / (sum(samples) / 1000),
+            "rcu": cap["ConsumedRCU"] / n,
+            "wcu": cap["ConsumedWCU"] / n,
+        }
+        summary[label] = row
+        statuses = " ".join(f"{code}x{count}" for code, count in sorted(driver.statuses[label].items()))
+        print(
+            f"{label:34} {n:6d} {row['p50']:8.2f} {row['p95']:8.2f} {row['p99']:8.2f} {row['rps']:8.0f}"
+            f" {cap['DynamoDBCalls'] / n:6.2f} {row['rcu']:7.2f} {row['wcu']:7.2f}"
+            f" {cap['ResponseBytes'] / n / 1024:7.1f}  {statuses}"
+        )
+    print(f"\n{total} requests in {wall_seconds:.2f} s ({total / wall_seconds:.0f} req/s overall); latencies in ms, capacity per request")
+    return summary
+
+
+def _params(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "users": args.users,
+        "partitionSize": args.partition_size,
+        "requests": args.requests,
+        "seed": args.seed,
+        "backend": args.engine if args.engine != "dynamodb" else "dynamodb-local" if args.endpoint else "moto",
+        "cache": args.cache,
+    }
+
+
+def _compare(summary: Dict[str, Dict[str, float]], params: Dict[str, Any]) -> int:
+    if not BASELINE_FILE.exists():
+        print(f"no baseline at {BASELINE_FILE}, run with --update-baseline first")
+        return 1
+
+    recorded = json.loads(BASELINE_FILE.read_text())
+    if recorded["params"] != params:
+        print(f"\nbaseline recorded with {recorded['params']}, this run used {params}: not comparable")
+        return 1
+
+    print(f"\nbaseline machine: {recorded['machine']}")
+    baseline = recorded["routes"]
+    failed = False
+    print(f"\np95 vs baseline (tolerance {TOLERANCE:.0%}):")
+    for label, row in summary.items():
+        base = baseline.get(label)
+        if not base:
+            continue
+        ratio = row["p95"] / base["p95"] if base["p95"] else 1.0
+        verdict = "OK" if ratio <= 1 + TOLERANCE else "REGRESSION"
+        failed = failed or verdict != "OK"
+        print(f"  {label:34} {base['p95']:8.2f} -> {row['p95']:8.2f} ms  ({ratio:5.2f}x) {verdict}")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local load test of the Lambda handler")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--partition-size", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--engine", choices=["dynamodb", "memory", "sqlite"], default="dynamodb", help="STORAGE_ENGINE to run against")
+    parser.add_argument("--endpoint", help="DynamoDB Local endpoint; moto is used when omitted")
+    parser.add_argument("--cache", action="store_true", help="keep the per-container read cache enabled")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+
+    _configure_env(args)
+
+    mock = contextlib.nullcontext()
+    after_call = None
+    if args.engine == "dynamodb" and not args.endpoint:
+        from moto import mock_aws
+        from moto.core.model_instances import reset_model_data
+
+        mock = mock_aws()
+        # moto keeps every model it creates for its dashboard, including the
+        # copy of the table it takes before each transaction: without this,
+        # memory grows by the table size on every write
+        after_call = reset_model_data
+
+    with mock:
+        if args.engine == "dynamodb":
+            import botocore.session
+
+            client = botocore.session.get_session().create_client("dynamodb")
+            _create_table(client)
+
+        import app
+
+        rng = random.Random(args.seed)
+        users = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(args.users)]
+
+        driver = Driver(app.handler, after_call)
+        print(f"seeding {args.users} users x {args.partition_size} applications...")
+        ids = _seed(driver, users, args.partition_size, rng)
+        wall = _run(driver, ids, args.requests, rng)
+        summary = _report(driver, wall)
+
+    if args.update_baseline:
+        BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_FILE.write_text(
+            json.dumps(
+                {
+                    "params": _params(args),
+                    "machine": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "cpus": os.cpu_count(),
+                    },
+                    "routes": {label: {k: round(v, 3) for k, v in row.items()} for label, row in summary.items()},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"\nbaseline written to {BASELINE_FILE}")
+        return 0
+
+    if args.compare:
+        return _compare(summary, _params(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Micro-benchmark of the JSON serializer backends (core/response.py).
+
+Encodes realistic `GET /applications` payloads (cards with notes, mission,
+history and Decimal numbers, as boto3 returns them) and decodes a PATCH body,
+once per available backend.
+
+Usage (from services/api):
+    python benchmarks/bench_json.py [--items 200] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core import response  # noqa: E402
+
+
+def make_item(i: int) -> dict:
+    app_id = str(uuid.uuid4())
+    return {
+        "PK": "USER#3f1c2a9e-5d7b-4c1e-9a0b-8e6f4d2c1b0a",
+        "SK": f"APP#{app_id}",
+        "applicationId": app_id,
+        "title": f"Backend Engineer (Python/AWS) #{i}",
+        "company": "Société Générale de Logiciels",
+        "location": "Berlin, Deutschland",
+        "appliedDate": "2026-03-14",
+        "jobUrl": f"https://jobs.example.com/offers/{i}",
+        "mission": "Concevoir et maintenir des API serverless. " * 12,
+        "notes": "Relancer le recruteur après l'entretien technique — très bon feeling. " * 8,
+        "contact": "recrutement@example.com",
+        "status": "CLOSED",
+        "closedReason": "REFUSED",
+        "history": [
+            {"at": "2026-03-14T09:12:00+00:00", "from": None, "to": "IN_PROGRESS"},
+            {"at": "2026-04-02T16:40:00+00:00", "from": "IN_PROGRESS", "to": "CLOSED"},
+        ],
+        "createdAt": "2026-03-14T09:12:00+00:00",
+        "updatedAt": "2026-04-02T16:40:00+00:00",
+        "version": Decimal(3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payload = {"items": [make_item(i) for i in range(args.items)], "nextCursor": None}
+    body = b'{"status": "CLOSED", "closedReason": "REFUSED", "notes": "' + b"x" * 2000 + b'"}'
+
+    backends = [("json", response._dumps_stdlib, response._loads_stdlib)]
+    if response.orjson is not None:
+        backends.append(("orjson", response._dumps_orjson, response._loads_orjson))
+    else:
+        print("orjson not installed: only the stdlib backend is measured")
+
+    size = len(response._dumps_stdlib(payload))
+    print(f"{args.items} items, {size / 1024:.1f} KiB encoded, {args.repeat} runs (active: {response.JSON_BACKEND})")
+
+    baseline = None
+    for name, dumps, loads in backends:
+        encode = min(timeit.repeat(lambda: dumps(payload), number=args.repeat, repeat=3)) / args.repeat
+        decode = min(timeit.repeat(lambda: loads(body), number=args.repeat, repeat=3)) / args.repeat
+        baseline = baseline or encode
+        print(
+            f"{name:>7}: encode {encode * 1e3:8.3f} ms  decode {decode * 1e6:8.2f} us"
+            f"  ({baseline / encode:4.1f}x vs json)"
+        )
+
+
+if __name__ == "__main__":
+    main()
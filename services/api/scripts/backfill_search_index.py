@@ -0,0 +1,75 @@
+"""Backfill the search index (TOK# entries) of the existing applications.
+
+The index behind GET /applications/search is written by the stream consumer
+(indexer.handler) when a card changes, so cards last written before it was
+deployed are not found until their next edit.
+
+This scans the table for APP# items and writes the index entries of each
+one (data.search.index_requests, as for a newly created card). Index entries
+hold nothing but their key, so the puts are idempotent: the script can be
+re-run, and can run while the API and the indexer are live.
+
+Usage (from services/api, with TABLE_NAME and AWS credentials set):
+    python scripts/backfill_search_index.py [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from data.dynamo import BufferedBatchWriter, iter_scan  # noqa: E402
+from data.search import INDEXED_FIELDS, index_requests  # noqa: E402
+
+logger = logging.getLogger("backfill_search_index")
+
+
+def backfill(dry_run: bool = False) -> dict:
+    """Write the index entries of every application. Returns counters."""
+    counts = {"scanned": 0, "entries": 0, "failed": 0}
+    names = {f"#f{i}": field for i, field in enumerate(INDEXED_FIELDS)}
+
+    with BufferedBatchWriter() as writer:
+        for item in iter_scan(
+            FilterExpression="begins_with(SK, :app_prefix)",
+            ProjectionExpression=", ".join(["PK", "SK", *names]),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={":app_prefix": "APP#"},
+        ):
+            counts["scanned"] += 1
+            app_id = item["SK"][len("APP#"):]
+            for request in index_requests(item["PK"], app_id, None, item):
+                counts["entries"] += 1
+                if not dry_run:
+                    writer.put(request["PutRequest"]["Item"], tag=(item["PK"], app_id))
+
+    failed = set(writer.failed)
+    for pk, app_id in sorted(failed):
+        logger.warning("Could not index %s %s", pk, app_id)
+    counts["failed"] = len(failed)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="only count the entries to write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    counts = backfill(dry_run=args.dry_run)
+    logger.info(
+        "%s %d index entries for %d applications (%d failed, re-run to retry them)",
+        "Would write" if args.dry_run else "Wrote",
+        counts["entries"],
+        counts["scanned"],
+        counts["failed"],
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
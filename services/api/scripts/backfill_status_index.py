@@ -0,0 +1,110 @@
+"""Backfill GSI1PK on the applications written before StatusIndex existed.
+
+StatusIndex (GET /applications?status=, ?sort=updatedAt) only holds items
+carrying GSI1PK. Create and status changes set it, but cards last written
+before the index was added have none, so they are missing from the filtered
+views until their next status change.
+
+Delta sync and the updatedAt sort read the index too, where deletion
+tombstones (DEL#) live under TOMBSTONE_STATUS: tombstones written before
+they carried GSI1PK are missing from the sync feed until they expire.
+
+This scans the table for APP# and DEL# items without GSI1PK and sets it from
+their status (TOMBSTONE_STATUS for tombstones). Each update is conditioned
+on GSI1PK still being absent and the status being the one scanned (the
+tombstone still existing), so the script is idempotent, can run while the
+API is live, and never overwrites what a concurrent write set (a card whose
+status changed meanwhile already has its GSI1PK).
+
+Usage (from services/api, with TABLE_NAME and AWS credentials set):
+    python scripts/backfill_status_index.py [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+from data.dynamo import TOMBSTONE_PREFIX, TOMBSTONE_STATUS, get_table, iter_scan, status_index_pk  # noqa: E402
+
+logger = logging.getLogger("backfill_status_index")
+
+STATUSES = ("IN_PROGRESS", "ACCEPTED", "CLOSED")
+
+
+def backfill(dry_run: bool = False) -> dict:
+    """Set GSI1PK on every application and tombstone lacking it. Returns counters."""
+    table = get_table()
+    counts = {"scanned": 0, "updated": 0, "skipped": 0}
+
+    for item in iter_scan(
+        FilterExpression=(
+            "(begins_with(SK, :app_prefix) OR begins_with(SK, :tombstone_prefix)) AND attribute_not_exists(GSI1PK)"
+        ),
+        ProjectionExpression="PK, SK, #status",
+        ExpressionAttributeNames={"#status": "status"},
+        ExpressionAttributeValues={":app_prefix": "APP#", ":tombstone_prefix": TOMBSTONE_PREFIX},
+    ):
+        counts["scanned"] += 1
+        tombstone = item["SK"].startswith(TOMBSTONE_PREFIX)
+        status = TOMBSTONE_STATUS if tombstone else item.get("status")
+        if not tombstone and status not in STATUSES:
+            logger.warning("Skipping %s %s: unexpected status %r", item["PK"], item["SK"], status)
+            counts["skipped"] += 1
+            continue
+        if dry_run:
+            counts["updated"] += 1
+            continue
+
+        if tombstone:
+            # Not recreated if it expired meanwhile
+            condition = {"ConditionExpression": "attribute_not_exists(GSI1PK) AND attribute_exists(SK)"}
+            values = {":gsi1pk": status_index_pk(item["PK"], status)}
+        else:
+            condition = {
+                "ConditionExpression": "attribute_not_exists(GSI1PK) AND #status = :status",
+                "ExpressionAttributeNames": {"#status": "status"},
+            }
+            values = {":gsi1pk": status_index_pk(item["PK"], status), ":status": status}
+        try:
+            table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression="SET GSI1PK = :gsi1pk",
+                ExpressionAttributeValues=values,
+                **condition,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            # Written (or deleted) by the API meanwhile
+            counts["skipped"] += 1
+            continue
+        counts["updated"] += 1
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="only count the items to update")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    counts = backfill(dry_run=args.dry_run)
+    logger.info(
+        "%s %d of %d applications and tombstones (%d skipped)",
+        "Would update" if args.dry_run else "Updated",
+        counts["updated"],
+        counts["scanned"],
+        counts["skipped"],
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
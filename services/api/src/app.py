@@ -2,55 +2,57 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-from core.response import json_response, not_found
+from core import middleware
+from core.router import Route, Router, lazy
+from data.dynamo import warm_up
 from routes.applications import (
+    batch_create_applications,
+    batch_delete_applications,
+    batch_get_applications,
+    batch_transition_applications,
     create_application,
     delete_application,
     get_application,
+    get_application_history,
+    get_application_stats,
     list_applications,
     patch_application,
+    search_applications,
+)
+from routes.dashboard import get_dashboard
+from routes.health import health
+
+
+# Per-route chains: authenticated routes, with or without a parsed JSON body
+AUTH = [middleware.auth]
+AUTH_JSON = [middleware.auth, middleware.json_body]
+
+# Import/export pull csv, gzip and S3: imported on first use (see core.router.lazy)
+router = Router(
+    [
+        Route("GET /health", health),
+        Route("GET /dashboard", get_dashboard, AUTH),
+        Route("GET /applications", list_applications, AUTH),
+        Route("POST /applications", create_application, AUTH_JSON),
+        Route("POST /applications/batch", batch_create_applications, AUTH_JSON),
+        Route("POST /applications/batch-delete", batch_delete_applications, AUTH_JSON),
+        Route("POST /applications/batch-get", batch_get_applications, AUTH_JSON),
+        Route("POST /applications/batch-status", batch_transition_applications, AUTH_JSON),
+        Route("POST /applications/import", lazy("routes.imports", "import_applications"), AUTH),
+        Route("POST /applications/export", lazy("routes.exports", "export_applications"), AUTH),
+        Route("GET /applications/stats", get_application_stats, AUTH),
+        Route("GET /applications/search", search_applications, AUTH),
+        Route("GET /applications/{id}", get_application, AUTH),
+        Route("GET /applications/{id}/history", get_application_history, AUTH),
+        Route("PATCH /applications/{id}", patch_application, AUTH_JSON),
+        Route("DELETE /applications/{id}", delete_application, AUTH),
+    ],
+    middlewares=[middleware.metrics, middleware.compression, middleware.timing, middleware.errors],
 )
 
+# Init phase: build the DynamoDB client before the first request arrives.
+warm_up()
 
-def handler(event: Dict[str, Any], context: Any):
-    request_ctx = event.get("requestContext", {})
-    method = request_ctx.get("http", {}).get("method")
-    path = event.get("rawPath") or request_ctx.get("http", {}).get("path") or ""
-
-    route_key = request_ctx.get("routeKey") or event.get("routeKey")
-
-    # Health
-    if route_key == "GET /health" or (method == "GET" and path == "/health"):
-        return json_response({"ok": True, "message": "Backend alive"})
-
-    # Applications collection
-    if route_key == "GET /applications":
-        return list_applications(event)
-
-    if route_key == "POST /applications":
-        return create_application(event)
-
-    # Application by ID
-    if (
-        route_key in {"GET /applications/{id}", "PATCH /applications/{id}", "DELETE /applications/{id}"}
-        or (method in {"GET", "PATCH", "DELETE"} and path.startswith("/applications/"))
-    ):
-        path_params = event.get("pathParameters") or {}
-        app_id = path_params.get("id") or ""
-
-        if not app_id:
-            app_id = path[len("/applications/") :].strip("/")
-
-        if not app_id:
-            return not_found("Missing application id")
-
-        if method == "GET":
-            return get_application(event, app_id)
-
-        if method == "PATCH":
-            return patch_application(event, app_id)
-
-        if method == "DELETE":
-            return delete_application(event, app_id)
 
-    return not_found("Route not matched")
\ No newline at end of file
+def handler(event: Dict[str, Any], context: Any):
+    return router.dispatch(event)
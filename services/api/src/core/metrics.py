@@ -0,0 +1,138 @@
+"""Request metrics in CloudWatch Embedded Metric Format (EMF).
+
+One JSON line per request is printed to stdout; CloudWatch Logs extracts the
+metrics from it asynchronously, so nothing is added to the request path but
+a print.
+
+Metrics (dimension: Route):
+- Duration, ResponseBytes, ColdStart
+- DynamoDBCalls, DynamoDBLatency (sum over calls), ConsumedRCU, ConsumedWCU, ItemCount
+
+Properties (searchable with Logs Insights, not metrics): statusCode,
+userSub, a per-operation DynamoDB breakdown. The user id is kept out of the
+dimensions on purpose: one metric per user would be costly.
+
+`record_dynamodb_call` is called by data.dynamo for every request to
+DynamoDB. Calls may come from worker threads, hence the lock.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Union
+
+NAMESPACE = os.environ.get("METRICS_NAMESPACE", "JobTracker/Api")
+
+# Operations whose consumed capacity counts as reads (the others are writes)
+READ_OPERATIONS = {"get_item", "query", "scan", "batch_get_item", "transact_get_items"}
+
+_METRIC_UNITS = {
+    "Duration": "Milliseconds",
+    "ResponseBytes": "Bytes",
+    "ColdStart": "Count",
+    "DynamoDBCalls": "Count",
+    "DynamoDBLatency": "Milliseconds",
+    "ConsumedRCU": "Count",
+    "ConsumedWCU": "Count",
+    "ItemCount": "Count",
+}
+
+_lock = threading.Lock()
+_current: Optional["RequestMetrics"] = None
+_cold_start = True
+
+
+class RequestMetrics:
+    """Counters accumulated while one request is being served."""
+
+    def __init__(self, route: str) -> None:
+        self.route = route
+        self.started = time.perf_counter()
+        self.values: Dict[str, float] = {name: 0 for name in _METRIC_UNITS}
+        self.operations: Dict[str, Dict[str, float]] = {}
+        self.properties: Dict[str, Any] = {}
+
+    def add_call(self, operation: str, latency_ms: float, capacity: float, items: int) -> None:
+        with _lock:
+            self.values["DynamoDBCalls"] += 1
+            self.values["DynamoDBLatency"] += latency_ms
+            self.values["ConsumedRCU" if operation in READ_OPERATIONS else "ConsumedWCU"] += capacity
+            self.values["ItemCount"] += items
+
+            op = self.operations.setdefault(operation, {"calls": 0, "ms": 0.0, "capacity": 0.0})
+            op["calls"] += 1
+            op["ms"] += latency_ms
+            op["capacity"] += capacity
+
+    def to_emf(self) -> Dict[str, Any]:
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": NAMESPACE,
+                        "Dimensions": [["Route"]],
+                        "Metrics": [{"Name": name, "Unit": unit} for name, unit in _METRIC_UNITS.items()],
+                    }
+                ],
+            },
+            "Route": self.route,
+            **{name: round(value, 3) for name, value in self.values.items()},
+            **self.properties,
+            "dynamodb": self.operations,
+        }
+
+
+def start_request(route: str) -> RequestMetrics:
+    """Open the metrics context of a request (one at a time per container)."""
+    global _current, _cold_start
+
+    metrics = RequestMetrics(route)
+    metrics.values["ColdStart"] = 1 if _cold_start else 0
+    _cold_start = False
+    _current = metrics
+    return metrics
+
+
+def finish_request(metrics: RequestMetrics, status: Optional[int], response_bytes: int, sub: Optional[str]) -> None:
+    """Close the context and print its EMF line."""
+    global _current
+
+    metrics.values["Duration"] = (time.perf_counter() - metrics.started) * 1000
+    metrics.values["ResponseBytes"] = response_bytes
+    metrics.properties["statusCode"] = status
+    if sub:
+        metrics.properties["userSub"] = sub
+
+    _current = None
+    print(json.dumps(metrics.to_emf(), separators=(",", ":")), flush=True)
+
+
+def _capacity_units(consumed: Union[None, Dict[str, Any], Iterable[Dict[str, Any]]]) -> float:
+    if not consumed:
+        return 0.0
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(c.get("CapacityUnits") or 0 for c in consumed))
+
+
+def record_dynamodb_call(operation: str, latency_ms: float, response: Optional[Dict[str, Any]]) -> None:
+    """Account one DynamoDB call on the current request (no-op outside a request)."""
+    metrics = _current
+    if metrics is None:
+        return
+
+    response = response or {}
+    if "Items" in response:
+        items = int(response.get("Count", len(response["Items"])))
+    elif "Responses" in response:
+        items = sum(len(table_items) for table_items in response["Responses"].values())
+    elif response.get("Item") is not None:
+        items = 1
+    else:
+        items = 0
+
+    metrics.add_call(operation, latency_ms, _capacity_units(response.get("ConsumedCapacity")), items)
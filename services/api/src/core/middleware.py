@@ -0,0 +1,97 @@
+"""Middlewares for core.router.
+
+Each one is `(request, next_handler) -> response` and does one job that
+every route used to repeat by hand:
+
+- metrics: one EMF line per request (see core.metrics)
+- compression: compress_response() according to Accept-Encoding
+- timing: `server-timing` header and a log line per request
+- errors: any uncaught exception becomes a logged 500
+- auth: Cognito `sub` -> request.sub / request.pk, or 401
+- json_body: request body parsed once (base64 bodies included), or 400
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import logging
+import time
+from typing import Any, Dict
+
+from core import metrics as request_metrics
+from core.auth import get_sub
+from core.request import get_header
+from core.response import bad_request, compress_response, json_loads, server_error, unauthorized
+from core.router import Handler, Request
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def metrics(request: Request, next_handler: Handler) -> Dict[str, Any]:
+    """Outermost: measures the whole request, including compression."""
+    current = request_metrics.start_request(request.route_key or "unmatched")
+    response: Dict[str, Any] = {}
+    try:
+        response = next_handler(request)
+        return response
+    finally:
+        request_metrics.finish_request(
+            current,
+            response.get("statusCode"),
+            len(response.get("body") or ""),
+            request.sub,
+        )
+
+
+def compression(request: Request, next_handler: Handler) -> Dict[str, Any]:
+    response = next_handler(request)
+    return compress_response(response, get_header(request.event, "accept-encoding"))
+
+
+def timing(request: Request, next_handler: Handler) -> Dict[str, Any]:
+    started = time.perf_counter()
+    response = next_handler(request)
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    headers = response.setdefault("headers", {})
+    headers["server-timing"] = f"app;dur={duration_ms:.1f}"
+    logger.info("%s -> %s in %.1f ms", request.route_key or "-", response.get("statusCode"), duration_ms)
+    return response
+
+
+def errors(request: Request, next_handler: Handler) -> Dict[str, Any]:
+    try:
+        return next_handler(request)
+    except Exception:
+        logger.exception("Unhandled error in %s", request.route_key or "-")
+        return server_error()
+
+
+def auth(request: Request, next_handler: Handler) -> Dict[str, Any]:
+    sub = get_sub(request.event)
+    if not sub:
+        return unauthorized()
+
+    request.sub = sub
+    request.pk = f"USER#{sub}"
+    return next_handler(request)
+
+
+def raw_body(request: Request) -> str:
+    """Request body as text, decoding API Gateway's base64 encoding if needed."""
+    body = request.event.get("body") or ""
+    if request.event.get("isBase64Encoded"):
+        return base64.b64decode(body).decode("utf-8")
+    return body
+
+
+def json_body(request: Request, next_handler: Handler) -> Dict[str, Any]:
+    """Parse the JSON body into request.body (an empty body parses as {})."""
+    try:
+        text = raw_body(request)
+        request.body = json_loads(text) if text.strip() else {}
+    except (ValueError, binascii.Error):
+        return bad_request("Invalid JSON body")
+    return next_handler(request)
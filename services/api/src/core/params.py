@@ -0,0 +1,95 @@
+"""Query parameters shared by the routes that page through applications.
+
+GET /applications, GET /dashboard, GET /applications/search and the
+history route take the same `limit` and `fields` parameters; their parsing,
+and the ProjectionExpression built from `fields`, live here.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Attributes a client may ask for through `fields=`
+LISTABLE_FIELDS = (
+    "applicationId",
+    "title",
+    "company",
+    "location",
+    "appliedDate",
+    "jobUrl",
+    "mission",
+    "notes",
+    "contact",
+    "status",
+    "closedReason",
+    "closedAt",
+    "lastTransition",
+    "history",
+    "createdAt",
+    "updatedAt",
+    "version",
+)
+
+# What the board renders on a card: no notes/mission/history blobs
+CARD_FIELDS = (
+    "applicationId",
+    "title",
+    "company",
+    "location",
+    "appliedDate",
+    "status",
+    "closedReason",
+    "lastTransition",
+    "createdAt",
+    "updatedAt",
+    "version",
+)
+
+
+def parse_limit(raw: Optional[str]) -> Optional[int]:
+    """Parse the `limit` query parameter. Returns None if invalid."""
+    if raw is None or raw == "":
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        return None
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return None
+    return limit
+
+
+def parse_fields(raw: Optional[str]) -> Tuple[Optional[Tuple[str, ...]], Optional[str]]:
+    """Parse the `fields` query parameter.
+
+    - missing / "card": CARD_FIELDS
+    - "all": no projection (full items)
+    - "a,b,c": explicit subset of LISTABLE_FIELDS
+
+    Returns (fields, error). fields is None when the full item is wanted.
+    """
+    if raw is None or raw.strip() in {"", "card"}:
+        return CARD_FIELDS, None
+    if raw.strip() == "all":
+        return None, None
+
+    requested = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(LISTABLE_FIELDS))
+    if unknown:
+        return None, f"Unknown fields: {', '.join(unknown)}"
+
+    # applicationId is always returned so the client can address the card
+    fields = ["applicationId"] + [f for f in dict.fromkeys(requested) if f != "applicationId"]
+    return tuple(fields), None
+
+
+def projection(fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Build ProjectionExpression kwargs (placeholders avoid reserved words like `status`)."""
+    names = {f"#p{i}": field for i, field in enumerate(fields)}
+    return {
+        "ProjectionExpression": ", ".join(names.keys()),
+        "ExpressionAttributeNames": names,
+    }
@@ -0,0 +1,47 @@
+"""Request helpers.
+
+HTTP API (payload v2) lower-cases header names, but we do not rely on it so
+routes can be driven by hand-written events too.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from core.response import CODINGS, encoded_etag
+
+
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Return a request header value (case-insensitive) or None."""
+    headers = event.get("headers") or {}
+    wanted = name.lower()
+    for key, value in headers.items():
+        if key.lower() == wanted:
+            return value
+    return None
+
+
+def matched_etag(event: Dict[str, Any], etag: str) -> Optional[str]:
+    """The validator of the request's If-None-Match matching entity `etag`, or None.
+
+    The client holds one representation of the entity: identity (`etag`) or
+    compressed (core.response.encoded_etag), whichever it was sent. That
+    validator is returned, for the 304 to carry (`etag` for `*`).
+
+    Weak validators (W/"...") are compared by their opaque part, as RFC 9110
+    requires for If-None-Match.
+    """
+    header = get_header(event, "if-none-match")
+    if not header:
+        return None
+
+    accepted = {etag, *(encoded_etag(etag, coding) for coding in CODINGS)}
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in accepted:
+            return candidate
+    return None
@@ -6,26 +6,137 @@ API Gateway (HTTP API) expects Lambda proxy responses with:
 - body: JSON string
 
 These helpers keep responses consistent across all routes.
+
+JSON goes through one serializer layer (json_dumps / json_loads): orjson when
+it is bundled, the stdlib otherwise (or when JSON_BACKEND=json). Both encode
+Decimal (what boto3 returns for numbers), set and datetime values.
 """
 
 from __future__ import annotations
 
+import base64
+import gzip
+import hashlib
 import json
-from typing import Any, Dict, Optional
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
+
+try:  # optional: not part of the Lambda runtime, ship it in the bundle to enable br
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment bundle
+    brotli = None
+
+try:  # optional: much faster encoding of large lists
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment bundle
+    orjson = None
 
 
 DEFAULT_HEADERS: Dict[str, str] = {
     "content-type": "application/json",
 }
 
+# Bodies smaller than this are not worth the CPU (and may grow when compressed)
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Content codings compress_response() may apply. Each encoded representation
+# gets its own ETag (see encoded_etag)
+CODINGS = ("gzip", "br")
+
+
+def _json_default(value: Any) -> Any:
+    """Encode what boto3 hands back besides plain JSON types (numbers are Decimal)."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps_stdlib(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _loads_stdlib(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+def _dumps_orjson(value: Any) -> bytes:
+    # datetime is native; Decimal / set / bytes go through _json_default
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _loads_orjson(data: Union[str, bytes]) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, callers need not care
+    return orjson.loads(data)
+
+
+if orjson is not None and os.environ.get("JSON_BACKEND", "orjson") != "json":
+    JSON_BACKEND = "orjson"
+    json_dumps_bytes = _dumps_orjson
+    json_loads = _loads_orjson
+else:
+    JSON_BACKEND = "json"
+    json_dumps_bytes = _dumps_stdlib
+    json_loads = _loads_stdlib
+
+
+def json_dumps(value: Any) -> str:
+    """Serialize `value` to a compact JSON string with the active backend."""
+    return json_dumps_bytes(value).decode("utf-8")
+
+
+def make_etag(*parts: Any) -> str:
+    """Return a strong ETag (quoted) derived from `parts`."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
 
-def json_response(body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-    """Return a standard JSON Lambda proxy response."""
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """ETag of the `coding`-encoded representation of the entity tagged `etag`.
+
+    RFC 9110 8.8.3: a strong validator changes with the content coding, so
+    gzip, br and identity bodies must not share one.
+    """
+    return f'{etag[:-1]}-{coding}"'
+
+
+def json_response(
+    body: Any,
+    status: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    *,
+    etag: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return a standard JSON Lambda proxy response (with an `etag` header if given)."""
     merged_headers = {**DEFAULT_HEADERS, **(headers or {})}
+    if etag:
+        merged_headers["etag"] = etag
     return {
         "statusCode": status,
         "headers": merged_headers,
-        "body": json.dumps(body, ensure_ascii=False),
+        "body": json_dumps(body),
+    }
+
+
+def not_modified(etag: str) -> Dict[str, Any]:
+    """304 with an empty body: the client's cached representation is still current.
+
+    `etag` is the validator of that representation (see core.request.matched_etag),
+    and `vary` is sent as on the 200 it revalidates.
+    """
+    return {
+        "statusCode": 304,
+        "headers": {"etag": etag, "vary": "accept-encoding"},
+        "body": "",
     }
 
 
@@ -41,5 +152,84 @@ def not_found(message: str = "Not Found", *, code: str = "NOT_FOUND") -> Dict[st
     return json_response({"message": message, "code": code}, status=404)
 
 
+def conflict(message: str = "Conflict", *, code: str = "CONFLICT") -> Dict[str, Any]:
+    return json_response({"message": message, "code": code}, status=409)
+
+
+def unprocessable(message: str = "Unprocessable Entity", *, code: str = "UNPROCESSABLE") -> Dict[str, Any]:
+    return json_response({"message": message, "code": code}, status=422)
+
+
+def gone(message: str = "Gone", *, code: str = "GONE") -> Dict[str, Any]:
+    return json_response({"message": message, "code": code}, status=410)
+
+
 def server_error(message: str = "Internal Server Error", *, code: str = "SERVER_ERROR") -> Dict[str, Any]:
     return json_response({"message": message, "code": code}, status=500)
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Return the codings allowed by an Accept-Encoding header, best q-value first."""
+    if not accept_encoding:
+        return []
+
+    weighted = []
+    for position, part in enumerate(accept_encoding.split(",")):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            weighted.append((-q, position, coding))
+    return [coding for _, _, coding in sorted(weighted)]
+
+
+def _pick_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    for coding in _accepted_encodings(accept_encoding):
+        if coding == "br" and brotli is not None:
+            return "br"
+        if coding in {"gzip", "*"}:
+            return "gzip"
+    return None
+
+
+def compress_response(response: Dict[str, Any], accept_encoding: Optional[str]) -> Dict[str, Any]:
+    """Compress a proxy response body when the client accepts it and it is large enough.
+
+    The compressed body is returned base64-encoded (isBase64Encoded) with the
+    matching content-encoding and its own ETag (encoded_etag); `vary:
+    accept-encoding` is set whenever the body was eligible so caches keep the
+    variants apart.
+    """
+    body = response.get("body")
+    if not isinstance(body, str) or response.get("isBase64Encoded"):
+        return response
+
+    raw = body.encode("utf-8")
+    if len(raw) < COMPRESSION_MIN_BYTES:
+        return response
+
+    headers = {**response.get("headers", {}), "vary": "accept-encoding"}
+    coding = _pick_encoding(accept_encoding)
+    if coding is None:
+        return {**response, "headers": headers}
+
+    if coding == "br":
+        compressed = brotli.compress(raw, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL)
+
+    headers["content-encoding"] = coding
+    if headers.get("etag"):
+        headers["etag"] = encoded_etag(headers["etag"], coding)
+    return {
+        **response,
+        "headers": headers,
+        "body": base64.b64encode(compressed).decode("ascii"),
+        "isBase64Encoded": True,
+    }
@@ -0,0 +1,128 @@
+"""Table-driven router.
+
+Routes are declared once as "METHOD /path" keys (the same strings API Gateway
+puts in `requestContext.routeKey`), each with its middleware chain composed
+when the Router is built. Dispatching a request is then one dict lookup
+plus the pre-built chain, whatever the number of routes.
+
+Events without a routeKey (local runs, tests) fall back to matching
+method + rawPath: static paths by dict lookup, templated ones ("{id}") by a
+precompiled regex.
+
+A middleware is a callable `(request, next_handler) -> response`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from core.response import not_found
+
+
+Handler = Callable[["Request"], Dict[str, Any]]
+Middleware = Callable[["Request", Handler], Dict[str, Any]]
+
+_PARAM = re.compile(r"\{(\w+)\}")
+
+
+class Request:
+    """What a route handler receives.
+
+    `sub`/`pk` are filled by the auth middleware, `body` by the JSON body
+    middleware; `event` stays available for anything else (headers...).
+    """
+
+    __slots__ = ("event", "route_key", "path_params", "params", "sub", "pk", "body")
+
+    def __init__(self, event: Dict[str, Any], route_key: str, path_params: Dict[str, str]) -> None:
+        self.event = event
+        self.route_key = route_key
+        self.path_params = path_params
+        self.params: Dict[str, str] = event.get("queryStringParameters") or {}
+        self.sub: Optional[str] = None
+        self.pk: Optional[str] = None
+        self.body: Any = None
+
+
+class Route:
+    """A route key, its handler and its own middlewares (run after the global ones)."""
+
+    def __init__(self, key: str, handler: Handler, middlewares: Iterable[Middleware] = ()) -> None:
+        self.key = key
+        self.handler = handler
+        self.middlewares = list(middlewares)
+
+
+def lazy(module: str, name: str) -> Handler:
+    """Handler imported on first call, to keep rarely used modules out of the cold start."""
+    resolved: List[Handler] = []
+
+    def _handler(request: Request) -> Dict[str, Any]:
+        if not resolved:
+            resolved.append(getattr(importlib.import_module(module), name))
+        return resolved[0](request)
+
+    _handler.__name__ = name
+    return _handler
+
+
+def _compose(handler: Handler, middlewares: List[Middleware]) -> Handler:
+    """Wrap `handler` so that middlewares[0] runs first."""
+    for middleware in reversed(middlewares):
+        handler = (lambda mw, nxt: lambda request: mw(request, nxt))(middleware, handler)
+    return handler
+
+
+def _path_pattern(path: str) -> Pattern[str]:
+    segments = []
+    for segment in path.split("/"):
+        param = _PARAM.fullmatch(segment)
+        segments.append(f"(?P<{param.group(1)}>[^/]+)" if param else re.escape(segment))
+    return re.compile("^" + "/".join(segments) + "$")
+
+
+class Router:
+    def __init__(self, routes: Iterable[Route], middlewares: Iterable[Middleware] = ()) -> None:
+        global_middlewares = list(middlewares)
+
+        self._table: Dict[str, Handler] = {}
+        self._templated: List[Tuple[str, Pattern[str], str]] = []
+
+        for route in routes:
+            self._table[route.key] = _compose(route.handler, global_middlewares + route.middlewares)
+            method, _, path = route.key.partition(" ")
+            if "{" in path:
+                self._templated.append((method, _path_pattern(path), route.key))
+
+        self._not_found = _compose(lambda request: not_found("Route not matched"), global_middlewares)
+
+    def _resolve(self, event: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, str]]:
+        request_ctx = event.get("requestContext") or {}
+        route_key = request_ctx.get("routeKey") or event.get("routeKey")
+        if route_key in self._table:
+            return route_key, event.get("pathParameters") or {}
+
+        http = request_ctx.get("http") or {}
+        method = http.get("method")
+        path = (event.get("rawPath") or http.get("path") or "").rstrip("/") or "/"
+
+        static_key = f"{method} {path}"
+        if static_key in self._table:
+            return static_key, {}
+
+        for route_method, pattern, key in self._templated:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match:
+                return key, match.groupdict()
+        return None, {}
+
+    def dispatch(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        route_key, path_params = self._resolve(event)
+        request = Request(event, route_key or "", path_params)
+        if route_key is None:
+            return self._not_found(request)
+        return self._table[route_key](request)
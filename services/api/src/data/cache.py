@@ -0,0 +1,113 @@
+"""Per-container read-through cache.
+
+A warm Lambda container serves bursts of reads for the same user (the
+dashboard loads the list, then opens cards). This bounded LRU + TTL cache
+keeps recent DynamoDB reads in memory so those repeats skip the network.
+
+Keys are tuples whose second element is the partition key:
+- ("item", pk, sk): a single application (None caches a miss)
+- ("query", pk, params): one list page and its ETag
+
+Every write path calls invalidate_partition(pk), so a container never serves
+its own stale writes. Writes made by other containers become visible after at most
+CACHE_TTL_SECONDS.
+
+Reads running on data.dynamo.fan_out worker threads share the cache, so
+entries are accessed under a lock.
+
+Configuration (environment):
+- CACHE_TTL_SECONDS (default 5, 0 disables the cache)
+- CACHE_MAX_ENTRIES (default 512)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+
+MISS = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or MISS."""
+        if not self.enabled:
+            return MISS
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return MISS
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_partition(self, pk: str) -> None:
+        """Drop every entry that belongs to partition `pk`."""
+        with self._lock:
+            for key in [k for k in self._entries if isinstance(k, tuple) and len(k) > 1 and k[1] == pk]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+cache = TTLCache(
+    max_entries=int(os.environ.get("CACHE_MAX_ENTRIES", "512")),
+    ttl=float(os.environ.get("CACHE_TTL_SECONDS", "5")),
+)
+
+
+def invalidate_partition(pk: str) -> None:
+    cache.invalidate_partition(pk)
+
+
+def cache_stats() -> Dict[str, int]:
+    return cache.stats()
@@ -6,16 +6,104 @@ The table is created by CDK and its name is injected into the Lambda
 as the environment variable `TABLE_NAME`.
 
 This module centralizes DynamoDB initialization so routes stay clean.
+
+Routes talk to a Table-shaped facade (`ClientTable`) over the low-level
+botocore client rather than boto3's resource layer: it is cheaper to import
+and to call, and values go through the small serializer in data.dynamo_types.
+The client is created during the Lambda init phase (see warm_up), so the
+first request does not pay for it.
+
+The storage engine is picked by the STORAGE_ENGINE environment variable:
+- dynamodb (default): ClientTable
+- memory: data.local_table over dicts, for tests and benchmarks
+- sqlite: data.local_table over an SQLite file (SQLITE_PATH), for self-hosting
+All of them implement `Table`, the interface the routes program against.
 """
 
 from __future__ import annotations
 
+import logging
 import os
-import boto3
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+from botocore.exceptions import ClientError
+
+from core.metrics import record_dynamodb_call
+from data.dynamo_types import deserialize_map, serialize_map
+
+logger = logging.getLogger(__name__)
+
+
+# BatchWriteItem accepts at most 25 requests per call
+BATCH_WRITE_SIZE = 25
+BATCH_MAX_ATTEMPTS = 5
+BATCH_BASE_DELAY_SECONDS = 0.05
+
+# BatchGetItem accepts at most 100 keys per call
+BATCH_GET_SIZE = 100
+
+# TransactWriteItems accepts at most 100 items per call
+TRANSACT_WRITE_SIZE = 100
+
+# Global secondary indexes (see infra/stacks/backend_stack.py)
+# StatusIndex: GSI1PK = "USER#{sub}#STATUS#{status}", sort key = updatedAt.
+# Cards are indexed under their status and deletion tombstones under
+# TOMBSTONE_STATUS, so the views by updatedAt merge its partitions (data.recent)
+STATUS_INDEX = "StatusIndex"
+
+# Key attributes (partition, sort) of the table and of each index, for the
+# local engines
+KEY_SCHEMA = ("PK", "SK")
+INDEX_KEYS = {
+    STATUS_INDEX: ("GSI1PK", "updatedAt"),
+}
+
+LOCAL_ENGINES = ("memory", "sqlite")
+
+# Status transitions of an application, one item each, oldest first:
+# SK = "HIST#{applicationId}#{at}" (outside the APP# range read by lists)
+HISTORY_PREFIX = "HIST#"
+
+# Deleted applications, kept for TOMBSTONE_TTL_SECONDS so that delta sync
+# clients learn about deletes: SK = "DEL#{applicationId}", expired through
+# the table's TTL attribute. Indexed under TOMBSTONE_STATUS in StatusIndex
+TOMBSTONE_PREFIX = "DEL#"
+TOMBSTONE_STATUS = "DELETED"
+TTL_ATTRIBUTE = "expiresAt"
+TOMBSTONE_TTL_SECONDS = int(os.environ.get("TOMBSTONE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Idempotency-Key records of POST /applications: SK = "IDEM#{key}", holding
+# the original response, expired through the same TTL attribute
+IDEMPOTENCY_PREFIX = "IDEM#"
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
 
+# fan_out() worker threads. They share the client, which is thread-safe and
+# keeps up to 10 pooled connections (botocore's max_pool_connections default)
+FANOUT_MAX_WORKERS = 4
+_FANOUT_THREAD_PREFIX = "fanout"
 
-_dynamodb_resource = None
+
+_client = None
 _table = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Request fields holding attribute maps, and response fields to decode
+_SERIALIZED_REQUEST_FIELDS = ("Key", "Item", "ExpressionAttributeValues", "ExclusiveStartKey")
+_DESERIALIZED_RESPONSE_FIELDS = ("Item", "Attributes", "LastEvaluatedKey")
+
+
+def status_index_pk(pk: str, status: str) -> str:
+    """Partition key value of an application in STATUS_INDEX."""
+    return f"{pk}#STATUS#{status}"
+
+
+def history_prefix(app_id: str) -> str:
+    """SK prefix of the history items of application `app_id`."""
+    return f"{HISTORY_PREFIX}{app_id}#"
 
 
 def _get_table_name() -> str:
@@ -25,15 +113,430 @@ def _get_table_name() -> str:
     return table_name
 
 
-def get_table():
-    """Return a cached DynamoDB Table object."""
-    global _dynamodb_resource, _table
+class Table(Protocol):
+    """Storage interface of the routes: the subset of the Table API they use.
+
+    Arguments, results and errors (botocore ClientError with DynamoDB's
+    codes) are those of DynamoDB, with plain Python values.
+    """
+
+    name: str
+
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+    def update_item(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+    def transact_write_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]: ...
+
+    def batch_get_item(self, keys: List[Dict[str, Any]], **kwargs: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: ...
+
+    def batch_write_item(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]: ...
+
+
+class ClientTable:
+    """Subset of the boto3 Table API on top of the low-level client.
+
+    Arguments and results use plain Python values like the resource layer
+    does. Condition and key expressions must be strings.
+
+    Every call asks for ReturnConsumedCapacity=TOTAL and is reported, with
+    its latency, to core.metrics.
+    """
+
+    def __init__(self, client, name: str) -> None:
+        self.client = client
+        self.name = name
+
+    def _call(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        for field in _SERIALIZED_REQUEST_FIELDS:
+            if field in kwargs:
+                kwargs[field] = serialize_map(kwargs[field])
+        kwargs.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+        response = self._timed(operation, TableName=self.name, **kwargs)
+
+        for field in _DESERIALIZED_RESPONSE_FIELDS:
+            if field in response:
+                response[field] = deserialize_map(response[field])
+        if "Items" in response:
+            response["Items"] = [deserialize_map(item) for item in response["Items"]]
+        return response
+
+    def _timed(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        """Call the client, report latency/capacity, decode ConditionalCheckFailed items."""
+        started = time.perf_counter()
+        try:
+            response = getattr(self.client, operation)(**kwargs)
+        except ClientError as e:
+            record_dynamodb_call(operation, (time.perf_counter() - started) * 1000, None)
+            # ReturnValuesOnConditionCheckFailure puts the current item here
+            if e.response.get("Item"):
+                e.response["Item"] = deserialize_map(e.response["Item"])
+            # ...or, for transactions, in the reason of the item that failed
+            for reason in e.response.get("CancellationReasons") or []:
+                if reason.get("Item"):
+                    reason["Item"] = deserialize_map(reason["Item"])
+            raise
+        record_dynamodb_call(operation, (time.perf_counter() - started) * 1000, response)
+        return response
+
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("get_item", **kwargs)
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("put_item", **kwargs)
+
+    def update_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("update_item", **kwargs)
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("delete_item", **kwargs)
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("query", **kwargs)
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("scan", **kwargs)
+
+    def transact_write_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """TransactWriteItems on this table.
+
+        `items` are {"Put" | "Update" | "Delete" | "ConditionCheck": {...}}
+        entries written like the arguments of the single-item methods, without
+        TableName. On TransactionCanceledException, the items returned in
+        CancellationReasons are decoded too (see cancellation_reasons).
+        """
+        wire = []
+        for entry in items:
+            (action, params), = entry.items()
+            params = dict(params, TableName=self.name)
+            for field in _SERIALIZED_REQUEST_FIELDS:
+                if field in params:
+                    params[field] = serialize_map(params[field])
+            wire.append({action: params})
+
+        return self._timed("transact_write_items", TransactItems=wire, ReturnConsumedCapacity="TOTAL")
+
+    def batch_get_item(self, keys: List[Dict[str, Any]], **kwargs: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """BatchGetItem on this table. Returns (items found, unprocessed keys).
+
+        `kwargs` go next to the keys (ProjectionExpression,
+        ExpressionAttributeNames, ConsistentRead).
+        """
+        response = self._timed(
+            "batch_get_item",
+            RequestItems={self.name: {"Keys": [serialize_map(key) for key in keys], **kwargs}},
+            ReturnConsumedCapacity="TOTAL",
+        )
+
+        items = [deserialize_map(item) for item in (response.get("Responses") or {}).get(self.name) or []]
+        unprocessed = (response.get("UnprocessedKeys") or {}).get(self.name) or {}
+        return items, [deserialize_map(key) for key in unprocessed.get("Keys") or []]
+
+    def batch_write_item(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """BatchWriteItem on this table. Returns the unprocessed requests."""
+        wire = []
+        for request in requests:
+            if "PutRequest" in request:
+                wire.append({"PutRequest": {"Item": serialize_map(request["PutRequest"]["Item"])}})
+            else:
+                wire.append({"DeleteRequest": {"Key": serialize_map(request["DeleteRequest"]["Key"])}})
+
+        response = self._timed(
+            "batch_write_item",
+            RequestItems={self.name: wire},
+            ReturnConsumedCapacity="TOTAL",
+        )
+
+        unprocessed = []
+        for request in (response.get("UnprocessedItems") or {}).get(self.name) or []:
+            if "PutRequest" in request:
+                unprocessed.append({"PutRequest": {"Item": deserialize_map(request["PutRequest"]["Item"])}})
+            else:
+                unprocessed.append({"DeleteRequest": {"Key": deserialize_map(request["DeleteRequest"]["Key"])}})
+        return unprocessed
+
+
+def cancellation_reasons(error: ClientError) -> List[Dict[str, Any]]:
+    """Per-item reasons of a cancelled transaction, in TransactItems order.
+
+    Each reason has a `Code` ("None" for the items that did not fail,
+    "ConditionalCheckFailed", "TransactionConflict"...) and, with
+    ReturnValuesOnConditionCheckFailure=ALL_OLD, the current `Item`.
+    Empty for any other error.
+    """
+    if error.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+        return []
+    return error.response.get("CancellationReasons") or []
+
+
+def get_client():
+    """Return the cached low-level DynamoDB client.
+
+    Built from a botocore session directly: boto3 (and its resource models)
+    is never imported on the request path.
+    """
+    global _client
+
+    if _client is None:
+        import botocore.session
+
+        _client = botocore.session.get_session().create_client("dynamodb")
+    return _client
+
+
+def _local_stream(changes: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> None:
+    """Hand local writes to the stream consumer, as the table's stream does.
+
+    Only application items are delivered, like the event source filter in
+    infra/stacks/backend_stack.py.
+    """
+    records = []
+    for old, new in changes:
+        image = new if new is not None else old
+        if not str(image.get("SK", "")).startswith("APP#"):
+            continue
+        change: Dict[str, Any] = {"Keys": serialize_map({name: image[name] for name in KEY_SCHEMA})}
+        if old is not None:
+            change["OldImage"] = serialize_map(old)
+        if new is not None:
+            change["NewImage"] = serialize_map(new)
+        event_name = "INSERT" if old is None else "REMOVE" if new is None else "MODIFY"
+        records.append({"eventName": event_name, "dynamodb": change})
+    if not records:
+        return
+
+    # Imported here: the consumer itself imports this module
+    import indexer
+
+    try:
+        indexer.handler({"Records": records}, None)
+    except Exception:
+        logger.exception("Local stream consumer failed on %d records", len(records))
+
+
+def _local_table(engine: str) -> Table:
+    from data.local_table import LocalTable, MemoryStore
+
+    name = os.environ.get("TABLE_NAME") or "jobtracker"
+    if engine == "memory":
+        store: Any = MemoryStore(KEY_SCHEMA, INDEX_KEYS, TTL_ATTRIBUTE)
+    else:
+        from data.sqlite_store import SQLiteStore
+
+        store = SQLiteStore(os.environ.get("SQLITE_PATH") or "jobtracker.sqlite3", name, KEY_SCHEMA, INDEX_KEYS, TTL_ATTRIBUTE)
+    return LocalTable(store, name, on_change=_local_stream)
+
+
+def get_table() -> Table:
+    """Return the cached Table of the configured STORAGE_ENGINE."""
+    global _table
 
     if _table is not None:
         return _table
 
-    if _dynamodb_resource is None:
-        _dynamodb_resource = boto3.resource("dynamodb")
+    engine = (os.environ.get("STORAGE_ENGINE") or "dynamodb").strip().lower()
+    if engine == "dynamodb":
+        _table = ClientTable(get_client(), _get_table_name())
+    elif engine in LOCAL_ENGINES:
+        _table = _local_table(engine)
+    else:
+        raise RuntimeError(f"Unknown STORAGE_ENGINE {engine!r} (dynamodb, memory or sqlite)")
+    return _table
+
+
+def fan_out(calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """Run independent calls concurrently and return their results by name.
+
+    Meant for reads that do not depend on each other: the request then waits
+    for the slowest one instead of their sum. The pool lives as long as the
+    container, so warm invocations reuse its threads. If calls fail, the
+    first error (in `calls` order) is raised once all of them are done.
+
+    Called from one of the pool's own threads, the calls run one after the
+    other instead: waiting on the pool from inside it could exhaust it.
+    """
+    global _executor
+
+    if threading.current_thread().name.startswith(_FANOUT_THREAD_PREFIX):
+        return {name: call() for name, call in calls.items()}
+
+    # Created here, not by racing workers
+    get_table()
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix=_FANOUT_THREAD_PREFIX)
+
+    futures = {name: _executor.submit(call) for name, call in calls.items()}
+    results: Dict[str, Any] = {}
+    error: Optional[BaseException] = None
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+    return results
+
+
+def warm_up() -> None:
+    """Create the client during the init phase (no-op outside Lambda or without TABLE_NAME)."""
+    if not os.environ.get("AWS_LAMBDA_FUNCTION_NAME") or not os.environ.get("TABLE_NAME"):
+        return
+    try:
+        get_table()
+    except Exception:
+        logger.exception("DynamoDB client warm-up failed, it will be created on first use")
+
+
+def iter_query(**query_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every item matched by a Query, following LastEvaluatedKey page by page.
+
+    Only one page is held in memory at a time.
+    """
+    table = get_table()
+    while True:
+        response = table.query(**query_kwargs)
+        yield from response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        query_kwargs["ExclusiveStartKey"] = last_key
+
+
+def iter_scan(**scan_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every item of the table matched by a Scan, page by page.
+
+    For maintenance scripts (see scripts/), never on the request path.
+    """
+    table = get_table()
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield from response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+
+def _backoff(attempt: int) -> None:
+    """Sleep with exponential backoff and full jitter before retry `attempt`."""
+    time.sleep(random.uniform(0, BATCH_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+
+def batch_get(keys: List[Dict[str, Any]], **kwargs: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run BatchGetItem over `keys`, BATCH_GET_SIZE keys per call.
+
+    `UnprocessedKeys` are retried with exponential backoff up to
+    BATCH_MAX_ATTEMPTS times. Items come back in no particular order.
+
+    Returns (items, keys that could not be read). Keys of missing items are in
+    neither list.
+    """
+    table = get_table()
+    items: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+
+    for start in range(0, len(keys), BATCH_GET_SIZE):
+        pending = keys[start : start + BATCH_GET_SIZE]
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                _backoff(attempt)
+            try:
+                found, pending = table.batch_get_item(pending, **kwargs)
+            except Exception:
+                logger.exception("BatchGetItem failed (attempt %d)", attempt + 1)
+                continue
+            items.extend(found)
+            if not pending:
+                break
+
+        failed.extend(pending)
+
+    return items, failed
+
+
+def batch_write(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run BatchWriteItem over `requests` (PutRequest / DeleteRequest dicts).
+
+    Requests are sent in chunks of BATCH_WRITE_SIZE. `UnprocessedItems` are
+    retried with exponential backoff up to BATCH_MAX_ATTEMPTS times.
+
+    Returns the requests that could not be written (empty list on success).
+    """
+    table = get_table()
+    failed: List[Dict[str, Any]] = []
+
+    for start in range(0, len(requests), BATCH_WRITE_SIZE):
+        pending = requests[start : start + BATCH_WRITE_SIZE]
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                _backoff(attempt)
+            try:
+                pending = table.batch_write_item(pending)
+            except Exception:
+                logger.exception("BatchWriteItem failed (attempt %d)", attempt + 1)
+                continue
+            if not pending:
+                break
+
+        failed.extend(pending)
+
+    return failed
+
+
+def batch_put_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Put `items` with BatchWriteItem. Returns the items that were not written."""
+    failed = batch_write([{"PutRequest": {"Item": item}} for item in items])
+    return [request["PutRequest"]["Item"] for request in failed]
+
+
+class BufferedBatchWriter:
+    """Bounded BatchWriteItem buffer for streaming writers.
+
+    Items are buffered until BATCH_WRITE_SIZE are pending, then flushed through
+    batch_write(), so memory stays flat however many items go through it.
+    Each item may carry a `tag` (e.g. a line number) reported back in `failed`
+    when it could not be written.
+
+    Use as a context manager so the last partial chunk is flushed.
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[Dict[str, Any]] = []
+        self._tags: Dict[tuple, Any] = {}
+        self.written = 0
+        self.failed: List[Any] = []
+
+    def put(self, item: Dict[str, Any], tag: Optional[Any] = None) -> None:
+        self._pending.append({"PutRequest": {"Item": item}})
+        self._tags[(item["PK"], item["SK"])] = tag
+        if len(self._pending) >= BATCH_WRITE_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        failed = batch_write(self._pending)
+        for request in failed:
+            item = request["PutRequest"]["Item"]
+            self.failed.append(self._tags.get((item["PK"], item["SK"])))
+        self.written += len(self._pending) - len(failed)
+        self._pending = []
+        self._tags = {}
+
+    def __enter__(self) -> "BufferedBatchWriter":
+        return self
 
-    _table = _dynamodb_resource.Table(_get_table_name())
-    return _table
\ No newline at end of file
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
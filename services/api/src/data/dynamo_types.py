@@ -0,0 +1,87 @@
+"""Lightweight DynamoDB attribute value (de)serializer.
+
+The low-level client speaks the typed wire format ({"S": "..."}, {"N": "1"}...).
+This replaces boto3's resource layer and TypeSerializer/TypeDeserializer,
+which are slower to import and to run, with two small recursive functions.
+
+Numbers come back as int when integral and as Decimal otherwise.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+
+def serialize(value: Any) -> Dict[str, Any]:
+    """Python value -> DynamoDB AttributeValue."""
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, float):
+        return {"N": repr(value)}
+    if isinstance(value, dict):
+        return {"M": {k: serialize(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [serialize(v) for v in value]}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if isinstance(value, (set, frozenset)):
+        if all(isinstance(v, str) for v in value):
+            return {"SS": list(value)}
+        if all(isinstance(v, (int, float, Decimal)) and not isinstance(v, bool) for v in value):
+            return {"NS": [str(v) for v in value]}
+        if all(isinstance(v, (bytes, bytearray)) for v in value):
+            return {"BS": [bytes(v) for v in value]}
+    raise TypeError(f"Unsupported type for DynamoDB: {type(value).__name__}")
+
+
+def _number(raw: str) -> Any:
+    if "." in raw or "e" in raw or "E" in raw:
+        return Decimal(raw)
+    return int(raw)
+
+
+def deserialize(attribute: Dict[str, Any]) -> Any:
+    """DynamoDB AttributeValue -> Python value."""
+    (tag, raw), = attribute.items()
+    if tag == "S":
+        return raw
+    if tag == "N":
+        return _number(raw)
+    if tag == "BOOL":
+        return raw
+    if tag == "NULL":
+        return None
+    if tag == "M":
+        return {k: deserialize(v) for k, v in raw.items()}
+    if tag == "L":
+        return [deserialize(v) for v in raw]
+    if tag == "SS":
+        return set(raw)
+    if tag == "NS":
+        return {_number(v) for v in raw}
+    if tag == "B":
+        return raw
+    if tag == "BS":
+        return set(raw)
+    raise TypeError(f"Unsupported DynamoDB type: {tag}")
+
+
+def serialize_map(values: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Serialize an item / key / ExpressionAttributeValues mapping."""
+    if values is None:
+        return None
+    return {k: serialize(v) for k, v in values.items()}
+
+
+def deserialize_map(values: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Deserialize an item / key mapping returned by the client."""
+    if values is None:
+        return None
+    return {k: deserialize(v) for k, v in values.items()}
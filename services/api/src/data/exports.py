@@ -0,0 +1,105 @@
+"""Export sinks.
+
+An export is a gzip-compressed NDJSON file (one application per line) written
+item by item, so the size of the archive never depends on Lambda memory nor
+on the 6 MB response payload limit.
+
+Two sinks are available, picked from the environment:
+- `EXPORT_BUCKET`: S3 (or any S3-compatible endpoint via `EXPORT_S3_ENDPOINT`),
+  the file is served through a pre-signed GET URL
+- `EXPORT_DIR`: local directory (development), the file is served as a file:// URL
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from core.response import json_dumps_bytes
+
+
+EXPORT_URL_TTL_SECONDS = 15 * 60
+
+# Above this size the temporary archive spills from memory to /tmp
+_SPOOL_MAX_BYTES = 1024 * 1024
+
+_s3_client = None
+
+
+class ExportNotConfigured(RuntimeError):
+    """Raised when neither EXPORT_BUCKET nor EXPORT_DIR is set."""
+
+
+def write_ndjson_gz(items: Iterable[Dict[str, Any]], fileobj) -> int:
+    """Encode `items` one at a time as gzip NDJSON into `fileobj`. Returns the item count."""
+    count = 0
+    with gzip.GzipFile(fileobj=fileobj, mode="wb") as gz:
+        for item in items:
+            gz.write(json_dumps_bytes(item))
+            gz.write(b"\n")
+            count += 1
+    return count
+
+
+def _get_s3_client():
+    global _s3_client
+
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client("s3", endpoint_url=os.environ.get("EXPORT_S3_ENDPOINT") or None)
+    return _s3_client
+
+
+def _export_to_s3(bucket: str, key: str, items: Iterable[Dict[str, Any]]) -> Tuple[str, int]:
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as tmp:
+        count = write_ndjson_gz(items, tmp)
+        tmp.seek(0)
+
+        client = _get_s3_client()
+        filename = key.rsplit("/", 1)[-1]
+        client.upload_fileobj(
+            tmp,
+            bucket,
+            key,
+            ExtraArgs={
+                "ContentType": "application/gzip",
+                "ContentDisposition": f'attachment; filename="{filename}"',
+            },
+        )
+
+    url = client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=EXPORT_URL_TTL_SECONDS,
+    )
+    return url, count
+
+
+def _export_to_dir(directory: str, key: str, items: Iterable[Dict[str, Any]]) -> Tuple[str, int]:
+    path = Path(directory) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as fh:
+        count = write_ndjson_gz(items, fh)
+    return path.resolve().as_uri(), count
+
+
+def export_items(key: str, items: Iterable[Dict[str, Any]]) -> Tuple[str, int, Optional[int]]:
+    """Write `items` to the configured sink under `key`.
+
+    Returns (download_url, item_count, url_ttl_seconds). The TTL is None for local files.
+    """
+    bucket = os.environ.get("EXPORT_BUCKET")
+    if bucket:
+        url, count = _export_to_s3(bucket, key, items)
+        return url, count, EXPORT_URL_TTL_SECONDS
+
+    directory = os.environ.get("EXPORT_DIR")
+    if directory:
+        url, count = _export_to_dir(directory, key, items)
+        return url, count, None
+
+    raise ExportNotConfigured("EXPORT_BUCKET or EXPORT_DIR must be set")
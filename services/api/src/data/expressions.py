@@ -0,0 +1,581 @@
+"""DynamoDB expressions evaluated in-process, for the local engines.
+
+Covers the expression language the routes use, and the rest of its common
+subset:
+- conditions (Key/Filter/ConditionExpression): = <> < <= > >=, BETWEEN,
+  IN, AND / OR / NOT, parentheses, attribute_exists, attribute_not_exists,
+  attribute_type, begins_with, contains, size
+- UpdateExpression: SET (with + / -, if_not_exists, list_append), REMOVE,
+  ADD, DELETE
+- ProjectionExpression: comma-separated paths
+
+Paths may be nested (a.b, a[0]); #names and :values are resolved from
+ExpressionAttributeNames / ExpressionAttributeValues. Invalid expressions
+raise ExpressionError (a ValidationException in DynamoDB).
+"""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+PathPart = Union[str, int]
+Path = Tuple[PathPart, ...]
+
+# Value of an attribute that does not exist
+MISSING = object()
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>\d+)
+      | (?P<name>\#?[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | (?P<op><>|<=|>=|[=<>(),.\[\]+-])
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+_UPDATE_CLAUSES = {"SET", "REMOVE", "ADD", "DELETE"}
+_CONDITION_FUNCTIONS = {"attribute_exists", "attribute_not_exists", "attribute_type", "begins_with", "contains"}
+
+
+class ExpressionError(ValueError):
+    """Invalid expression, or an update that cannot apply to the item."""
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ExpressionError(f"Invalid syntax near {expression[position:position + 20]!r}")
+        kind = match.lastgroup or ""
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, expression: str, names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]]) -> None:
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    # Token helpers
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else ("end", "")
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def at_keyword(self, *keywords: str) -> bool:
+        kind, text = self.peek()
+        return kind == "name" and text.upper() in keywords
+
+    def at_op(self, op: str) -> bool:
+        return self.peek() == ("op", op)
+
+    def expect_op(self, op: str) -> None:
+        if self.next() != ("op", op):
+            raise ExpressionError(f"Expected {op!r}")
+
+    def expect_end(self) -> None:
+        if self.peek()[0] != "end":
+            raise ExpressionError(f"Unexpected token {self.peek()[1]!r}")
+
+    # Operands
+
+    def path(self) -> Tuple[str, Path]:
+        parts: List[PathPart] = [self._name()]
+        while True:
+            if self.at_op("."):
+                self.next()
+                parts.append(self._name())
+            elif self.at_op("["):
+                self.next()
+                kind, text = self.next()
+                if kind != "number":
+                    raise ExpressionError("List index must be a number")
+                parts.append(int(text))
+                self.expect_op("]")
+            else:
+                return ("path", tuple(parts))
+
+    def _name(self) -> str:
+        kind, text = self.next()
+        if kind != "name":
+            raise ExpressionError(f"Expected an attribute name, got {text!r}")
+        if text.startswith("#"):
+            if text not in self.names:
+                raise ExpressionError(f"Undefined attribute name {text}")
+            return self.names[text]
+        return text
+
+    def value(self) -> Tuple[str, Any]:
+        kind, text = self.next()
+        if kind != "value":
+            raise ExpressionError(f"Expected a value placeholder, got {text!r}")
+        if text not in self.values:
+            raise ExpressionError(f"Undefined attribute value {text}")
+        return ("value", self.values[text])
+
+    def operand(self) -> Tuple[Any, ...]:
+        kind, text = self.peek()
+        if kind == "value":
+            return self.value()
+        if kind == "name" and text == "size" and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect_op("(")
+            target = self.path()
+            self.expect_op(")")
+            return ("size", target)
+        return self.path()
+
+    # Conditions
+
+    def condition(self) -> Tuple[Any, ...]:
+        node = self._and()
+        while self.at_keyword("OR"):
+            self.next()
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> Tuple[Any, ...]:
+        node = self._not()
+        while self.at_keyword("AND"):
+            self.next()
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self) -> Tuple[Any, ...]:
+        if self.at_keyword("NOT"):
+            self.next()
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self) -> Tuple[Any, ...]:
+        if self.at_op("("):
+            self.next()
+            node = self.condition()
+            self.expect_op(")")
+            return node
+
+        kind, text = self.peek()
+        if kind == "name" and text in _CONDITION_FUNCTIONS and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect_op("(")
+            args = [self.path()]
+            if text not in ("attribute_exists", "attribute_not_exists"):
+                self.expect_op(",")
+                args.append(self.operand())
+            self.expect_op(")")
+            return ("function", text, args)
+
+        left = self.operand()
+        if self.at_keyword("BETWEEN"):
+            self.next()
+            low = self.operand()
+            if not self.at_keyword("AND"):
+                raise ExpressionError("Expected AND in BETWEEN")
+            self.next()
+            return ("between", left, low, self.operand())
+        if self.at_keyword("IN"):
+            self.next()
+            self.expect_op("(")
+            candidates = [self.operand()]
+            while self.at_op(","):
+                self.next()
+                candidates.append(self.operand())
+            self.expect_op(")")
+            return ("in", left, candidates)
+
+        kind, op = self.next()
+        if kind != "op" or op not in _COMPARATORS:
+            raise ExpressionError(f"Expected a comparison, got {op!r}")
+        return ("compare", op, left, self.operand())
+
+    # Updates
+
+    def update(self) -> List[Tuple[str, Any]]:
+        actions: List[Tuple[str, Any]] = []
+        if not self.at_keyword(*_UPDATE_CLAUSES):
+            raise ExpressionError("UpdateExpression must start with SET, REMOVE, ADD or DELETE")
+        while self.peek()[0] != "end":
+            if not self.at_keyword(*_UPDATE_CLAUSES):
+                raise ExpressionError(f"Unexpected token {self.peek()[1]!r}")
+            clause = self.next()[1].upper()
+            while True:
+                target = self.path()
+                if clause == "SET":
+                    self.expect_op("=")
+                    actions.append(("SET", (target, self._set_value())))
+                elif clause == "REMOVE":
+                    actions.append(("REMOVE", target))
+                else:
+                    actions.append((clause, (target, self.value())))
+                if not self.at_op(","):
+                    break
+                self.next()
+        return actions
+
+    def _set_value(self) -> Tuple[Any, ...]:
+        node = self._set_operand()
+        if self.at_op("+") or self.at_op("-"):
+            op = self.next()[1]
+            return ("arith", op, node, self._set_operand())
+        return node
+
+    def _set_operand(self) -> Tuple[Any, ...]:
+        kind, text = self.peek()
+        if kind == "name" and text in ("if_not_exists", "list_append") and self.peek(1) == ("op", "("):
+            self.next()
+            self.expect_op("(")
+            first = self.path() if text == "if_not_exists" else self._set_operand()
+            self.expect_op(",")
+            second = self._set_operand()
+            self.expect_op(")")
+            return (text, first, second)
+        return self.operand()
+
+    # Projections
+
+    def projection(self) -> List[Path]:
+        paths = [self.path()[1]]
+        while self.at_op(","):
+            self.next()
+            paths.append(self.path()[1])
+        return paths
+
+
+# Evaluation
+
+
+def _kind(value: Any) -> str:
+    """DynamoDB type of a Python value (as data.dynamo_types serializes it)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, (int, float, Decimal)):
+        return "N"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (bytes, bytearray)):
+        return "B"
+    if isinstance(value, dict):
+        return "M"
+    if isinstance(value, (list, tuple)):
+        return "L"
+    if isinstance(value, (set, frozenset)):
+        kinds = {_kind(v) for v in value}
+        return {"S": "SS", "N": "NS", "B": "BS"}.get(kinds.pop() if len(kinds) == 1 else "", "SS")
+    return type(value).__name__
+
+
+def get_path(item: Any, path: Path) -> Any:
+    """Value at `path` in `item`, or MISSING."""
+    current = item
+    for part in path:
+        if isinstance(part, int):
+            if not isinstance(current, list) or part >= len(current):
+                return MISSING
+        elif not isinstance(current, dict) or part not in current:
+            return MISSING
+        current = current[part]
+    return current
+
+
+def _operand(item: Dict[str, Any], node: Tuple[Any, ...]) -> Any:
+    kind = node[0]
+    if kind == "value":
+        return node[1]
+    if kind == "path":
+        return get_path(item, node[1])
+    if kind == "size":
+        value = get_path(item, node[1][1])
+        if value is MISSING or _kind(value) in ("N", "BOOL", "NULL"):
+            return MISSING
+        return len(value)
+    if kind == "if_not_exists":
+        value = get_path(item, node[1][1])
+        return _operand(item, node[2]) if value is MISSING else value
+    if kind == "list_append":
+        first, second = _operand(item, node[1]), _operand(item, node[2])
+        if not isinstance(first, list) or not isinstance(second, list):
+            raise ExpressionError("list_append needs two lists")
+        return first + second
+    if kind == "arith":
+        left, right = _operand(item, node[2]), _operand(item, node[3])
+        if _kind(left) != "N" or _kind(right) != "N":
+            raise ExpressionError("Arithmetic needs two numbers")
+        return left + right if node[1] == "+" else left - right
+    raise ExpressionError(f"Unexpected operand {kind}")
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if left is MISSING or right is MISSING:
+        return op == "<>"
+    same_kind = _kind(left) == _kind(right)
+    if op == "=":
+        return same_kind and left == right
+    if op == "<>":
+        return not (same_kind and left == right)
+    # Ordering is only defined between numbers, strings or binaries
+    if not same_kind or _kind(left) not in ("N", "S", "B"):
+        return False
+    if op == "<":
+        return left < right
+    if op == "<=":
+        return left <= right
+    if op == ">":
+        return left > right
+    return left >= right
+
+
+def _evaluate(item: Dict[str, Any], node: Tuple[Any, ...]) -> bool:
+    kind = node[0]
+    if kind == "and":
+        return _evaluate(item, node[1]) and _evaluate(item, node[2])
+    if kind == "or":
+        return _evaluate(item, node[1]) or _evaluate(item, node[2])
+    if kind == "not":
+        return not _evaluate(item, node[1])
+    if kind == "compare":
+        return _compare(node[1], _operand(item, node[2]), _operand(item, node[3]))
+    if kind == "between":
+        value = _operand(item, node[1])
+        return _compare(">=", value, _operand(item, node[2])) and _compare("<=", value, _operand(item, node[3]))
+    if kind == "in":
+        value = _operand(item, node[1])
+        return any(_compare("=", value, _operand(item, candidate)) for candidate in node[2])
+
+    name, args = node[1], node[2]
+    value = get_path(item, args[0][1])
+    if name == "attribute_exists":
+        return value is not MISSING
+    if name == "attribute_not_exists":
+        return value is MISSING
+    if value is MISSING:
+        return False
+    argument = _operand(item, args[1])
+    if name == "attribute_type":
+        return _kind(value) == argument
+    if name == "begins_with":
+        return _kind(value) in ("S", "B") and _kind(value) == _kind(argument) and value.startswith(argument)
+    # contains
+    if _kind(value) == "S":
+        return isinstance(argument, str) and argument in value
+    if isinstance(value, (set, frozenset, list)):
+        return argument in value
+    return False
+
+
+def parse_condition(
+    expression: str,
+    names: Optional[Dict[str, str]] = None,
+    values: Optional[Dict[str, Any]] = None,
+) -> Tuple[Any, ...]:
+    """Parse a condition into a tree for evaluate() / key_condition()."""
+    parser = _Parser(expression, names, values)
+    node = parser.condition()
+    parser.expect_end()
+    return node
+
+
+def evaluate(node: Tuple[Any, ...], item: Optional[Dict[str, Any]]) -> bool:
+    """Whether `item` (None: absent) satisfies a parsed condition."""
+    return _evaluate(item or {}, node)
+
+
+def check_condition(
+    expression: Optional[str],
+    item: Optional[Dict[str, Any]],
+    names: Optional[Dict[str, str]] = None,
+    values: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Whether `item` satisfies ConditionExpression `expression` (True without one)."""
+    if not expression:
+        return True
+    return evaluate(parse_condition(expression, names, values), item)
+
+
+def key_condition(
+    expression: str,
+    hash_attribute: str,
+    range_attribute: str,
+    names: Optional[Dict[str, str]] = None,
+    values: Optional[Dict[str, Any]] = None,
+) -> Tuple[Any, Optional[Tuple[str, List[Any]]]]:
+    """Split a KeyConditionExpression into (hash value, range condition).
+
+    The range condition is None or (op, operands) with op one of
+    = < <= > >= between begins_with.
+    """
+    node = parse_condition(expression, names, values)
+    terms: List[Tuple[Any, ...]] = []
+    pending = [node]
+    while pending:
+        term = pending.pop()
+        if term[0] == "and":
+            pending.extend((term[2], term[1]))
+        else:
+            terms.append(term)
+
+    hash_value: Any = MISSING
+    range_condition: Optional[Tuple[str, List[Any]]] = None
+    for term in terms:
+        if term[0] == "compare" and term[2] == ("path", (hash_attribute,)) and term[1] == "=" and term[3][0] == "value":
+            if hash_value is not MISSING:
+                raise ExpressionError("KeyConditionExpression has two conditions on the partition key")
+            hash_value = term[3][1]
+            continue
+        if range_condition is not None:
+            raise ExpressionError("KeyConditionExpression has more than one sort key condition")
+        if term[0] == "compare" and term[1] != "<>" and term[2] == ("path", (range_attribute,)) and term[3][0] == "value":
+            range_condition = (term[1], [term[3][1]])
+        elif term[0] == "between" and term[1] == ("path", (range_attribute,)) and term[2][0] == term[3][0] == "value":
+            range_condition = ("between", [term[2][1], term[3][1]])
+        elif term[0] == "function" and term[1] == "begins_with" and term[2][0] == ("path", (range_attribute,)) and term[2][1][0] == "value":
+            range_condition = ("begins_with", [term[2][1][1]])
+        else:
+            raise ExpressionError("Unsupported KeyConditionExpression")
+    if hash_value is MISSING:
+        raise ExpressionError(f"KeyConditionExpression must test {hash_attribute} for equality")
+    return hash_value, range_condition
+
+
+def range_matches(condition: Optional[Tuple[str, List[Any]]], value: Any) -> bool:
+    """Whether a sort key value satisfies a range condition from key_condition()."""
+    if condition is None:
+        return True
+    op, operands = condition
+    if op == "between":
+        return _compare(">=", value, operands[0]) and _compare("<=", value, operands[1])
+    if op == "begins_with":
+        return _kind(value) in ("S", "B") and _kind(value) == _kind(operands[0]) and value.startswith(operands[0])
+    return _compare(op, value, operands[0])
+
+
+def _set_path(item: Dict[str, Any], path: Path, value: Any) -> None:
+    parent = get_path(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int):
+        if not isinstance(parent, list):
+            raise ExpressionError("The document path provided in the update expression is invalid for update")
+        if last >= len(parent):
+            parent.append(value)
+        else:
+            parent[last] = value
+    elif isinstance(parent, dict):
+        parent[last] = value
+    else:
+        raise ExpressionError("The document path provided in the update expression is invalid for update")
+
+
+def _remove_path(item: Dict[str, Any], path: Path) -> None:
+    parent = get_path(item, path[:-1]) if len(path) > 1 else item
+    last = path[-1]
+    if isinstance(last, int):
+        if isinstance(parent, list) and last < len(parent):
+            del parent[last]
+    elif isinstance(parent, dict):
+        parent.pop(last, None)
+
+
+def apply_update(
+    item: Dict[str, Any],
+    expression: str,
+    names: Optional[Dict[str, str]] = None,
+    values: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Return `item` (not modified) with UpdateExpression `expression` applied.
+
+    As in DynamoDB, every operand is read from the item before the update.
+    """
+    parser = _Parser(expression, names, values)
+    actions = parser.update()
+    parser.expect_end()
+
+    updated = _deep_copy(item)
+    for clause, argument in actions:
+        if clause == "SET":
+            target, value_node = argument
+            _set_path(updated, target[1], _deep_copy(_operand(item, value_node)))
+        elif clause == "REMOVE":
+            _remove_path(updated, argument[1])
+        else:
+            target, (_, operand) = argument
+            current = get_path(item, target[1])
+            if clause == "ADD":
+                if current is MISSING:
+                    result = _deep_copy(operand)
+                elif _kind(current) == "N" and _kind(operand) == "N":
+                    result = current + operand
+                elif isinstance(current, (set, frozenset)) and isinstance(operand, (set, frozenset)):
+                    result = set(current) | set(operand)
+                else:
+                    raise ExpressionError("ADD needs a number or a set of the same type")
+            else:
+                if current is MISSING:
+                    continue
+                if not isinstance(current, (set, frozenset)) or not isinstance(operand, (set, frozenset)):
+                    raise ExpressionError("DELETE needs a set")
+                result = set(current) - set(operand)
+            if isinstance(result, set) and not result:
+                _remove_path(updated, target[1])
+            else:
+                _set_path(updated, target[1], result)
+    return updated
+
+
+def project(
+    item: Dict[str, Any],
+    expression: Optional[str],
+    names: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """The attributes of `item` named by ProjectionExpression `expression` (all without one)."""
+    if not expression:
+        return item
+    parser = _Parser(expression, names, None)
+    paths = parser.projection()
+    parser.expect_end()
+
+    projected: Dict[str, Any] = {}
+    for path in paths:
+        value = get_path(item, path)
+        if value is MISSING:
+            continue
+        container: Any = projected
+        for index, part in enumerate(path[:-1]):
+            following = path[index + 1]
+            empty: Any = [] if isinstance(following, int) else {}
+            if isinstance(container, dict):
+                container = container.setdefault(part, empty)
+            else:
+                container.append(empty)
+                container = container[-1]
+        if isinstance(container, dict):
+            container[path[-1]] = value
+        else:
+            container.append(value)
+    return projected
+
+
+def _deep_copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _deep_copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_deep_copy(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return set(value)
+    return value
+
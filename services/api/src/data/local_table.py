@@ -0,0 +1,473 @@
+"""Local storage engines: the Table facade over in-process stores.
+
+LocalTable has the methods of data.dynamo.ClientTable (see data.dynamo.Table)
+and their DynamoDB semantics: condition checks, TransactWriteItems
+cancellation reasons, sparse secondary indexes, Limit / LastEvaluatedKey
+pagination. Failures raise botocore's ClientError with DynamoDB's error
+codes, so the routes handle them unchanged.
+
+Stores hold the items:
+- MemoryStore: dicts, for tests and benchmarks (STORAGE_ENGINE=memory)
+- data.sqlite_store.SQLiteStore: one SQLite table with an index per GSI,
+  for self-hosting (STORAGE_ENGINE=sqlite)
+
+What DynamoDB does outside the request path is emulated too:
+- the stream: committed changes are handed to `on_change`
+- TTL: items whose `ttl_attribute` (epoch seconds) is past are swept at
+  most every TTL_SWEEP_SECONDS, during writes
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+from core.metrics import record_dynamodb_call
+from data.dynamo_types import deserialize_map, serialize_map
+from data.expressions import (
+    ExpressionError,
+    apply_update,
+    check_condition,
+    evaluate,
+    key_condition,
+    parse_condition,
+    project,
+    range_matches,
+)
+
+TTL_SWEEP_SECONDS = 60
+
+# DynamoDB's limit on the actions of one TransactWriteItems
+TRANSACT_MAX_ITEMS = 100
+
+# (hash attribute, range attribute) of the table and of each index
+KeySchema = Tuple[str, str]
+RangeCondition = Optional[Tuple[str, List[Any]]]
+Change = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def _error(code: str, message: str, operation: str, **extra: Any) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}, **extra}, operation)
+
+
+def copy_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Detached copy of `item`, with values normalized as DynamoDB stores them."""
+    return deserialize_map(serialize_map(item)) or {}
+
+
+class MemoryStore:
+    """Items in dicts, guarded by one lock. Every read returns copies."""
+
+    def __init__(self, key_schema: KeySchema, indexes: Dict[str, KeySchema], ttl_attribute: Optional[str] = None) -> None:
+        self.key_schema = key_schema
+        self.indexes = indexes
+        self.ttl_attribute = ttl_attribute
+        self._lock = threading.RLock()
+        self._partitions: Dict[Any, Dict[Any, Dict[str, Any]]] = {}
+        # index -> hash value -> table keys of the items in it
+        self._members: Dict[str, Dict[Any, set]] = {name: {} for name in indexes}
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _key(self, item: Dict[str, Any]) -> Tuple[Any, Any]:
+        hash_attribute, range_attribute = self.key_schema
+        return item[hash_attribute], item[range_attribute]
+
+    def get(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            hash_value, range_value = self._key(key)
+            item = self._partitions.get(hash_value, {}).get(range_value)
+            return copy_item(item) if item is not None else None
+
+    def put(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self.delete(item)
+            hash_value, range_value = self._key(item)
+            self._partitions.setdefault(hash_value, {})[range_value] = copy_item(item)
+            for name, (index_hash, index_range) in self.indexes.items():
+                if isinstance(item.get(index_hash), str) and isinstance(item.get(index_range), str):
+                    self._members[name].setdefault(item[index_hash], set()).add((hash_value, range_value))
+
+    def delete(self, key: Dict[str, Any]) -> None:
+        with self._lock:
+            hash_value, range_value = self._key(key)
+            item = self._partitions.get(hash_value, {}).pop(range_value, None)
+            if item is None:
+                return
+            for name, (index_hash, _) in self.indexes.items():
+                members = self._members[name].get(item.get(index_hash))
+                if members is not None:
+                    members.discard((hash_value, range_value))
+
+    def query(
+        self,
+        index: Optional[str],
+        hash_value: Any,
+        range_condition: RangeCondition,
+        forward: bool,
+        start: Optional[Dict[str, Any]],
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """Items of one (index) partition matching `range_condition`, in key order after `start`."""
+        with self._lock:
+            if index is None:
+                range_attribute = self.key_schema[1]
+                items = list(self._partitions.get(hash_value, {}).values())
+            else:
+                range_attribute = self.indexes[index][1]
+                items = [self._partitions[pk][sk] for pk, sk in self._members[index].get(hash_value, ())]
+
+            position = self._position_function(range_attribute, index)
+            items = [item for item in items if range_matches(range_condition, item[range_attribute])]
+            items.sort(key=position, reverse=not forward)
+            if start is not None:
+                after = position(start)
+                items = [item for item in items if (position(item) > after if forward else position(item) < after)]
+            if limit is not None:
+                items = items[:limit]
+            return [copy_item(item) for item in items]
+
+    def scan(self, start: Optional[Dict[str, Any]], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Every item of the table, in (hash, range) key order after `start`."""
+        with self._lock:
+            items = sorted((item for partition in self._partitions.values() for item in partition.values()), key=self._key)
+            if start is not None:
+                after = self._key(start)
+                items = [item for item in items if self._key(item) > after]
+            if limit is not None:
+                items = items[:limit]
+            return [copy_item(item) for item in items]
+
+    def _position_function(self, range_attribute: str, index: Optional[str]) -> Callable[[Dict[str, Any]], Tuple]:
+        if index is None:
+            return lambda item: (item[range_attribute],)
+        # Items with the same index range key are ordered by table key
+        hash_attribute, table_range = self.key_schema
+        return lambda item: (item[range_attribute], item[hash_attribute], item[table_range])
+
+    def sweep(self, now: int) -> int:
+        """Delete the items whose TTL is past. Returns how many."""
+        if not self.ttl_attribute:
+            return 0
+        with self._lock:
+            expired = [
+                item
+                for partition in self._partitions.values()
+                for item in partition.values()
+                if isinstance(item.get(self.ttl_attribute), int) and item[self.ttl_attribute] < now
+            ]
+            for item in expired:
+                self.delete(item)
+            return len(expired)
+
+
+class LocalTable:
+    """Table facade (same methods as data.dynamo.ClientTable) over a local store.
+
+    Calls are reported to core.metrics like DynamoDB calls, without consumed
+    capacity.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        name: str,
+        on_change: Optional[Callable[[List[Change]], None]] = None,
+    ) -> None:
+        self.store = store
+        self.name = name
+        self.on_change = on_change
+        self._last_sweep = 0.0
+
+    # Helpers
+
+    def _timed(self, operation: str, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            response = call()
+        except ExpressionError as e:
+            record_dynamodb_call(operation, (time.perf_counter() - started) * 1000, None)
+            raise _error("ValidationException", str(e), operation) from e
+        except ClientError:
+            record_dynamodb_call(operation, (time.perf_counter() - started) * 1000, None)
+            raise
+        record_dynamodb_call(operation, (time.perf_counter() - started) * 1000, response)
+        return response
+
+    def _key_of(self, key: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        hash_attribute, range_attribute = self.store.key_schema
+        if not isinstance(key, dict) or not isinstance(key.get(hash_attribute), str) or not isinstance(key.get(range_attribute), str):
+            raise _error("ValidationException", "The provided key element does not match the schema", operation)
+        return {hash_attribute: key[hash_attribute], range_attribute: key[range_attribute]}
+
+    def _notify(self, changes: List[Change]) -> None:
+        changes = [(old, new) for old, new in changes if old is not None or new is not None]
+        if changes and self.on_change is not None:
+            self.on_change(changes)
+
+    def _maybe_sweep(self) -> None:
+        now = time.time()
+        if now - self._last_sweep >= TTL_SWEEP_SECONDS:
+            self._last_sweep = now
+            self.store.sweep(int(now))
+
+    def _check(
+        self,
+        operation: str,
+        params: Dict[str, Any],
+        current: Optional[Dict[str, Any]],
+    ) -> None:
+        """Raise ConditionalCheckFailedException unless `current` meets the write's condition."""
+        if check_condition(
+            params.get("ConditionExpression"),
+            current,
+            params.get("ExpressionAttributeNames"),
+            params.get("ExpressionAttributeValues"),
+        ):
+            return
+        extra = {}
+        if params.get("ReturnValuesOnConditionCheckFailure") == "ALL_OLD" and current is not None:
+            extra["Item"] = current
+        raise _error("ConditionalCheckFailedException", "The conditional request failed", operation, **extra)
+
+    def _apply(self, action: str, params: Dict[str, Any], current: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The item after `action`; `current` is the item before it."""
+        if action == "Put":
+            return copy_item(params["Item"])
+        if action == "Delete":
+            return None
+        if action == "Update":
+            base = current if current is not None else self._key_of(params["Key"], "UpdateItem")
+            updated = apply_update(
+                base,
+                params["UpdateExpression"],
+                params.get("ExpressionAttributeNames"),
+                params.get("ExpressionAttributeValues"),
+            )
+            if self._key_of(updated, "UpdateItem") != self._key_of(base, "UpdateItem"):
+                raise ExpressionError("Cannot update attribute of the primary key")
+            return copy_item(updated)
+        return current
+
+    def _write(self, operation: str, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = self._key_of(params["Item"] if action == "Put" else params["Key"], operation)
+        with self.store.transaction():
+            current = self.store.get(key)
+            self._check(operation, params, current)
+            new = self._apply(action, params, current)
+            if new is None:
+                self.store.delete(key)
+            else:
+                self.store.put(new)
+        self._notify([(current, new)])
+        self._maybe_sweep()
+
+        returned = params.get("ReturnValues") or "NONE"
+        response: Dict[str, Any] = {}
+        if returned == "ALL_OLD" and current is not None:
+            response["Attributes"] = current
+        elif returned == "ALL_NEW" and new is not None:
+            response["Attributes"] = new
+        elif returned in ("UPDATED_OLD", "UPDATED_NEW"):
+            old_item, new_item = current or {}, new or {}
+            changed = {name for name in set(old_item) | set(new_item) if old_item.get(name) != new_item.get(name)}
+            source = old_item if returned == "UPDATED_OLD" else new_item
+            attributes = {name: source[name] for name in changed if name in source}
+            if attributes:
+                response["Attributes"] = attributes
+        return response
+
+    # Table API
+
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        def call() -> Dict[str, Any]:
+            item = self.store.get(self._key_of(kwargs["Key"], "GetItem"))
+            if item is None:
+                return {}
+            return {"Item": project(item, kwargs.get("ProjectionExpression"), kwargs.get("ExpressionAttributeNames"))}
+
+        return self._timed("get_item", call)
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._timed("put_item", lambda: self._write("PutItem", "Put", kwargs))
+
+    def update_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._timed("update_item", lambda: self._write("UpdateItem", "Update", kwargs))
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._timed("delete_item", lambda: self._write("DeleteItem", "Delete", kwargs))
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._timed("query", lambda: self._query(**kwargs))
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._timed("scan", lambda: self._scan(**kwargs))
+
+    def _scan(self, **kwargs: Any) -> Dict[str, Any]:
+        names = kwargs.get("ExpressionAttributeNames")
+        filter_node = (
+            parse_condition(kwargs["FilterExpression"], names, kwargs.get("ExpressionAttributeValues"))
+            if kwargs.get("FilterExpression")
+            else None
+        )
+
+        limit = kwargs.get("Limit")
+        candidates = self.store.scan(kwargs.get("ExclusiveStartKey"), limit + 1 if limit else None)
+        evaluated = candidates[:limit] if limit else candidates
+
+        items = [item for item in evaluated if filter_node is None or evaluate(filter_node, item)]
+        response: Dict[str, Any] = {
+            "Items": [project(item, kwargs.get("ProjectionExpression"), names) for item in items],
+            "Count": len(items),
+            "ScannedCount": len(evaluated),
+        }
+        if limit and len(candidates) > limit:
+            response["LastEvaluatedKey"] = self._last_key(evaluated[-1], None)
+        return response
+
+    def _query(self, **kwargs: Any) -> Dict[str, Any]:
+        index = kwargs.get("IndexName")
+        if index is None:
+            schema = self.store.key_schema
+        elif index in self.store.indexes:
+            schema = self.store.indexes[index]
+        else:
+            raise _error("ValidationException", f"The table does not have the specified index: {index}", "Query")
+
+        names = kwargs.get("ExpressionAttributeNames")
+        values = kwargs.get("ExpressionAttributeValues")
+        hash_value, range_condition = key_condition(kwargs["KeyConditionExpression"], schema[0], schema[1], names, values)
+        filter_node = parse_condition(kwargs["FilterExpression"], names, values) if kwargs.get("FilterExpression") else None
+
+        limit = kwargs.get("Limit")
+        # One more than Limit tells whether a next page exists
+        candidates = self.store.query(
+            index,
+            hash_value,
+            range_condition,
+            kwargs.get("ScanIndexForward", True),
+            kwargs.get("ExclusiveStartKey"),
+            limit + 1 if limit else None,
+        )
+        evaluated = candidates[:limit] if limit else candidates
+
+        items = [item for item in evaluated if filter_node is None or evaluate(filter_node, item)]
+        response: Dict[str, Any] = {"Count": len(items), "ScannedCount": len(evaluated)}
+        if kwargs.get("Select") != "COUNT":
+            response["Items"] = [project(item, kwargs.get("ProjectionExpression"), names) for item in items]
+        if limit and len(candidates) > limit:
+            response["LastEvaluatedKey"] = self._last_key(evaluated[-1], index)
+        return response
+
+    def _last_key(self, item: Dict[str, Any], index: Optional[str]) -> Dict[str, Any]:
+        attributes = list(self.store.key_schema)
+        if index is not None:
+            attributes.extend(self.store.indexes[index])
+        return {name: item[name] for name in attributes}
+
+    def transact_write_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """TransactWriteItems: every condition is checked before anything is written."""
+        return self._timed("transact_write_items", lambda: self._transact(items))
+
+    def _transact(self, items: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(items) > TRANSACT_MAX_ITEMS:
+            raise _error(
+                "ValidationException",
+                f"Member must have length less than or equal to {TRANSACT_MAX_ITEMS}",
+                "TransactWriteItems",
+            )
+        entries: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = []
+        seen = set()
+        for entry in items:
+            (action, params), = entry.items()
+            key = self._key_of(params["Item"] if action == "Put" else params["Key"], "TransactWriteItems")
+            marker = tuple(sorted(key.items()))
+            if marker in seen:
+                raise _error(
+                    "ValidationException",
+                    "Transaction request cannot include multiple operations on one item",
+                    "TransactWriteItems",
+                )
+            seen.add(marker)
+            entries.append((action, params, key))
+
+        changes: List[Change] = []
+        with self.store.transaction():
+            currents = [self.store.get(key) for _, _, key in entries]
+            reasons: List[Dict[str, Any]] = []
+            for (action, params, _), current in zip(entries, currents):
+                try:
+                    self._check("TransactWriteItems", params, current)
+                    reasons.append({"Code": "None"})
+                except ClientError as e:
+                    reason = {"Code": "ConditionalCheckFailed", "Message": "The conditional request failed"}
+                    if e.response.get("Item") is not None:
+                        reason["Item"] = e.response["Item"]
+                    reasons.append(reason)
+            if any(reason["Code"] != "None" for reason in reasons):
+                raise _error(
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons for specific reasons",
+                    "TransactWriteItems",
+                    CancellationReasons=reasons,
+                )
+
+            for (action, params, key), current in zip(entries, currents):
+                new = self._apply(action, params, current)
+                if action == "ConditionCheck":
+                    continue
+                if new is None:
+                    self.store.delete(key)
+                else:
+                    self.store.put(new)
+                changes.append((current, new))
+
+        self._notify(changes)
+        self._maybe_sweep()
+        return {}
+
+    def batch_get_item(self, keys: List[Dict[str, Any]], **kwargs: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """BatchGetItem: (items found, unprocessed keys), the latter always empty."""
+
+        def call() -> Dict[str, Any]:
+            found = []
+            for key in keys:
+                item = self.store.get(self._key_of(key, "BatchGetItem"))
+                if item is not None:
+                    found.append(project(item, kwargs.get("ProjectionExpression"), kwargs.get("ExpressionAttributeNames")))
+            return {"Responses": {self.name: found}}
+
+        response = self._timed("batch_get_item", call)
+        return response["Responses"][self.name], []
+
+    def batch_write_item(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """BatchWriteItem: every request is applied, none comes back unprocessed."""
+
+        def call() -> Dict[str, Any]:
+            changes: List[Change] = []
+            with self.store.transaction():
+                for request in requests:
+                    if "PutRequest" in request:
+                        item = request["PutRequest"]["Item"]
+                        key = self._key_of(item, "BatchWriteItem")
+                        current = self.store.get(key)
+                        new: Optional[Dict[str, Any]] = copy_item(item)
+                        self.store.put(new)
+                    else:
+                        key = self._key_of(request["DeleteRequest"]["Key"], "BatchWriteItem")
+                        current, new = self.store.get(key), None
+                        self.store.delete(key)
+                    changes.append((current, new))
+            self._notify(changes)
+            self._maybe_sweep()
+            return {}
+
+        self._timed("batch_write_item", call)
+        return []
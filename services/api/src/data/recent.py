@@ -0,0 +1,109 @@
+"""A user's cards by updatedAt, merged from the StatusIndex partitions.
+
+StatusIndex (GSI1PK = "USER#{sub}#STATUS#{status}", sort key updatedAt)
+holds each card under its status, and each delta sync tombstone under
+TOMBSTONE_STATUS. A view by updatedAt across statuses (sort=updatedAt, delta
+sync, the dashboard activity feed) is a merge of one Query per partition,
+run concurrently (data.dynamo.fan_out). Each Query reads at most `limit`
+items, which is enough to find the first `limit` of the merge.
+
+Where the merge stopped in each partition is kept in a cursor
+
+    {"PK": pk, "partitions": {status: ExclusiveStartKey or None}}
+
+None meaning "from the start". Exhausted partitions are left out, and a
+cursor without partitions is not returned: the merge is over.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.params import projection
+from data.dynamo import STATUS_INDEX, fan_out, get_table, status_index_pk
+
+CARD_STATUSES = ("IN_PROGRESS", "ACCEPTED", "CLOSED")
+
+# Key of an item in StatusIndex, from which a partition Query resumes
+INDEX_KEY_ATTRIBUTES = ("PK", "SK", "GSI1PK", "updatedAt")
+
+
+def start_cursor(pk: str, statuses: Iterable[str]) -> Dict[str, Any]:
+    """Cursor of the first page of the merge of `statuses`."""
+    return {"PK": pk, "partitions": {status: None for status in statuses}}
+
+
+def _index_key(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {attribute: item[attribute] for attribute in INDEX_KEY_ATTRIBUTES}
+
+
+def query_merged(
+    cursor: Dict[str, Any],
+    *,
+    forward: bool,
+    limit: int,
+    since: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """One page of the merge: (items, cursor of the next page or None).
+
+    - forward: oldest first (True) or most recent first
+    - since: only items updated strictly after this timestamp
+    - fields: attributes to return (None: full items)
+    """
+    pk = cursor["PK"]
+    partitions: Dict[str, Optional[Dict[str, Any]]] = cursor["partitions"]
+    projection_kwargs = projection(tuple(dict.fromkeys(fields + INDEX_KEY_ATTRIBUTES))) if fields is not None else {}
+
+    def _query(status: str, start: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": STATUS_INDEX,
+            "KeyConditionExpression": "GSI1PK = :gsi1pk",
+            "ExpressionAttributeValues": {":gsi1pk": status_index_pk(pk, status)},
+            "ScanIndexForward": forward,
+            "Limit": limit,
+            **projection_kwargs,
+        }
+        if since is not None:
+            query_kwargs["KeyConditionExpression"] += " AND updatedAt > :since"
+            query_kwargs["ExpressionAttributeValues"][":since"] = since
+        if start:
+            query_kwargs["ExclusiveStartKey"] = start
+        return get_table().query(**query_kwargs)
+
+    responses = fan_out(
+        {status: (lambda status=status, start=start: _query(status, start)) for status, start in partitions.items()}
+    )
+
+    # Stable sort: items of one partition keep the order the index gave them
+    candidates = [(status, item) for status, response in responses.items() for item in response.get("Items", [])]
+    candidates.sort(key=lambda candidate: candidate[1]["updatedAt"], reverse=not forward)
+    page = candidates[:limit]
+
+    next_partitions: Dict[str, Optional[Dict[str, Any]]] = {}
+    for status, response in responses.items():
+        taken = [item for page_status, item in page if page_status == status]
+        if len(taken) < len(response.get("Items", [])):
+            next_partitions[status] = _index_key(taken[-1]) if taken else partitions[status]
+        elif response.get("LastEvaluatedKey"):
+            next_partitions[status] = response["LastEvaluatedKey"]
+
+    items = [item for _, item in page]
+    if fields is not None:
+        items = [{field: item[field] for field in fields if field in item} for item in items]
+    return items, {"PK": pk, "partitions": next_partitions} if next_partitions else None
+
+
+def iter_merged(
+    pk: str,
+    statuses: Iterable[str],
+    *,
+    forward: bool,
+    page_size: int,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the whole merge, page by page (only one page in memory at a time)."""
+    cursor: Optional[Dict[str, Any]] = start_cursor(pk, statuses)
+    while cursor is not None:
+        items, cursor = query_merged(cursor, forward=forward, limit=page_size, fields=fields)
+        yield from items
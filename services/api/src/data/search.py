@@ -0,0 +1,128 @@
+"""Per-user inverted index behind GET /applications/search.
+
+Index entries live in the user's partition, next to the applications:
+
+    PK = USER#{sub}    SK = TOK#{token}#{applicationId}
+
+so the applications matching a token are one Query on the SK prefix, and a
+token prefix ("berl") is the same Query with a shorter prefix.
+
+Tokens come from INDEXED_FIELDS: lowercased, accents stripped, split on
+anything that is not a letter or a digit, stop words and 1-letter tokens
+dropped.
+
+The index is written by the DynamoDB Streams consumer (indexer.handler), not
+by the API: create/PATCH/delete pay nothing for it, and search results trail
+writes by the stream delay (usually well under a second).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from data.dynamo import iter_query
+
+INDEX_PREFIX = "TOK#"
+
+INDEXED_FIELDS = ("title", "company", "location", "notes", "mission")
+
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 40
+
+# Too frequent to narrow anything down (French and English)
+STOPWORDS = frozenset(
+    {
+        "and", "are", "for", "from", "in", "of", "on", "or", "the", "to", "with",
+        "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "en", "est",
+        "et", "la", "le", "les", "par", "pour", "sur", "un", "une",
+    }
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase `text` and strip accents ("Société" -> "societe")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Distinct index tokens of `text`, in order of appearance."""
+    tokens: Dict[str, None] = {}
+    for word in _WORD.findall(normalize(text)):
+        if len(word) >= MIN_TOKEN_LENGTH and word not in STOPWORDS:
+            tokens[word[:MAX_TOKEN_LENGTH]] = None
+    return list(tokens)
+
+
+def item_tokens(item: Optional[Dict[str, Any]]) -> Set[str]:
+    """Tokens of an application (empty for None)."""
+    if not item:
+        return set()
+    tokens: Set[str] = set()
+    for field in INDEXED_FIELDS:
+        value = item.get(field)
+        if isinstance(value, str) and value:
+            tokens.update(tokenize(value))
+    return tokens
+
+
+def index_sk(token: str, app_id: str) -> str:
+    return f"{INDEX_PREFIX}{token}#{app_id}"
+
+
+def index_requests(
+    pk: str,
+    app_id: str,
+    old: Optional[Dict[str, Any]],
+    new: Optional[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """BatchWriteItem requests moving the index of one application from `old` to `new`.
+
+    Only the tokens that appear or disappear are written, so a notes edit
+    touches a handful of entries, and a status change none.
+    """
+    old_tokens = item_tokens(old)
+    new_tokens = item_tokens(new)
+
+    requests: List[Dict[str, Any]] = [
+        {"DeleteRequest": {"Key": {"PK": pk, "SK": index_sk(token, app_id)}}}
+        for token in sorted(old_tokens - new_tokens)
+    ]
+    requests.extend(
+        {"PutRequest": {"Item": {"PK": pk, "SK": index_sk(token, app_id)}}}
+        for token in sorted(new_tokens - old_tokens)
+    )
+    return requests
+
+
+def matching_ids(pk: str, token: str, prefix: bool = False) -> Set[str]:
+    """Ids of the applications of `pk` containing `token` (or a token starting with it)."""
+    key_prefix = f"{INDEX_PREFIX}{token}" if prefix else f"{INDEX_PREFIX}{token}#"
+    return {
+        entry["SK"].rsplit("#", 1)[1]
+        for entry in iter_query(
+            KeyConditionExpression="PK = :pk AND begins_with(SK, :token_prefix)",
+            ExpressionAttributeValues={":pk": pk, ":token_prefix": key_prefix},
+            ProjectionExpression="SK",
+        )
+    }
+
+
+def search_ids(pk: str, tokens: Iterable[str]) -> Set[str]:
+    """Ids of the applications of `pk` matching every token.
+
+    The last token also matches as a prefix, so results show up while the
+    user is still typing it.
+    """
+    tokens = list(tokens)
+    matched: Optional[Set[str]] = None
+    for position, token in enumerate(tokens):
+        ids = matching_ids(pk, token, prefix=position == len(tokens) - 1)
+        matched = ids if matched is None else matched & ids
+        if not matched:
+            return set()
+    return matched or set()
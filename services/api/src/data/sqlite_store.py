@@ -0,0 +1,235 @@
+"""SQLite store behind data.local_table.LocalTable (STORAGE_ENGINE=sqlite).
+
+One SQL table per DynamoDB table:
+
+    pk, sk          table key (PRIMARY KEY, WITHOUT ROWID)
+    data            the item, as DynamoDB wire-format JSON
+    <index>_hash,
+    <index>_range   key attributes of each secondary index (NULL when the
+                    item is not in it), with a SQL index on
+                    (<index>_hash, <index>_range, pk, sk)
+    expires_at      TTL attribute, indexed for the sweep
+
+so Query (on the table or an index) is one indexed range scan, and SQL
+LIMIT applies the page size. Key attributes are strings, like the table's
+(see infra/stacks/backend_stack.py).
+
+The connection is shared by threads (data.dynamo.fan_out) behind a lock.
+Writes run in BEGIN IMMEDIATE transactions, and file databases use WAL, so
+several processes can share one file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from data.dynamo_types import deserialize_map, serialize_map
+
+KeySchema = Tuple[str, str]
+RangeCondition = Optional[Tuple[str, List[Any]]]
+
+_SQL_OPERATORS = {"=": "=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+def _identifier(name: str) -> str:
+    return re.sub(r"\W", "_", name)
+
+
+def _prefix_end(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with `prefix` (None: unbounded)."""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class SQLiteStore:
+    """Items of one table in SQLite, with an SQL index per secondary index."""
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        key_schema: KeySchema,
+        indexes: Dict[str, KeySchema],
+        ttl_attribute: Optional[str] = None,
+    ) -> None:
+        self.key_schema = key_schema
+        self.indexes = indexes
+        self.ttl_attribute = ttl_attribute
+        self.table = f"items_{_identifier(table)}"
+        self._columns = {name: (f"{_identifier(name)}_hash", f"{_identifier(name)}_range") for name in indexes}
+        self._lock = threading.RLock()
+        self._depth = 0
+
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        index_columns = "".join(f", {hash_column} TEXT, {range_column} TEXT" for hash_column, range_column in self._columns.values())
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            f"pk TEXT NOT NULL, sk TEXT NOT NULL, data TEXT NOT NULL, expires_at INTEGER{index_columns}, "
+            "PRIMARY KEY (pk, sk)) WITHOUT ROWID",
+            f"CREATE INDEX IF NOT EXISTS {self.table}_expires ON {self.table} (expires_at) WHERE expires_at IS NOT NULL",
+        ]
+        for name, (hash_column, range_column) in self._columns.items():
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_{_identifier(name)} "
+                f"ON {self.table} ({hash_column}, {range_column}, pk, sk) WHERE {hash_column} IS NOT NULL"
+            )
+        with self._lock:
+            for statement in statements:
+                self._connection.execute(statement)
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the enclosed reads and writes in one SQLite transaction."""
+        with self._lock:
+            outermost = self._depth == 0
+            if outermost:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outermost:
+                self._connection.execute("COMMIT")
+
+    def _key(self, item: Dict[str, Any]) -> Tuple[str, str]:
+        hash_attribute, range_attribute = self.key_schema
+        return item[hash_attribute], item[range_attribute]
+
+    @staticmethod
+    def _decode(data: str) -> Dict[str, Any]:
+        return deserialize_map(json.loads(data)) or {}
+
+    def get(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT data FROM {self.table} WHERE pk = ? AND sk = ?",
+                self._key(key),
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def put(self, item: Dict[str, Any]) -> None:
+        columns = ["pk", "sk", "data", "expires_at"]
+        expires_at = item.get(self.ttl_attribute) if self.ttl_attribute else None
+        values: List[Any] = [
+            *self._key(item),
+            json.dumps(serialize_map(item), separators=(",", ":")),
+            expires_at if isinstance(expires_at, int) and not isinstance(expires_at, bool) else None,
+        ]
+        for name, (hash_column, range_column) in self._columns.items():
+            index_hash, index_range = (item.get(attribute) for attribute in self.indexes[name])
+            indexed = isinstance(index_hash, str) and isinstance(index_range, str)
+            columns.extend((hash_column, range_column))
+            values.extend((index_hash, index_range) if indexed else (None, None))
+
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                values,
+            )
+
+    def delete(self, key: Dict[str, Any]) -> None:
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self.table} WHERE pk = ? AND sk = ?", self._key(key))
+
+    def query(
+        self,
+        index: Optional[str],
+        hash_value: Any,
+        range_condition: RangeCondition,
+        forward: bool,
+        start: Optional[Dict[str, Any]],
+        limit: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """Items of one (index) partition matching `range_condition`, in key order after `start`."""
+        if index is None:
+            hash_column, range_column = "pk", "sk"
+            order = ["sk"]
+            start_values = [start[self.key_schema[1]]] if start else []
+        else:
+            hash_column, range_column = self._columns[index]
+            order = [range_column, "pk", "sk"]
+            start_values = [start[self.indexes[index][1]], *self._key(start)] if start else []
+
+        if not isinstance(hash_value, str):
+            return []
+        where = [f"{hash_column} = ?"]
+        params: List[Any] = [hash_value]
+
+        if range_condition is not None:
+            op, operands = range_condition
+            if any(not isinstance(operand, str) for operand in operands):
+                return []
+            if op == "between":
+                where.append(f"{range_column} BETWEEN ? AND ?")
+                params.extend(operands)
+            elif op == "begins_with":
+                where.append(f"{range_column} >= ?")
+                params.append(operands[0])
+                end = _prefix_end(operands[0])
+                if end is not None:
+                    where.append(f"{range_column} < ?")
+                    params.append(end)
+            else:
+                where.append(f"{range_column} {_SQL_OPERATORS[op]} ?")
+                params.append(operands[0])
+
+        if start_values:
+            where.append(f"({', '.join(order)}) {'>' if forward else '<'} ({', '.join('?' for _ in order)})")
+            params.extend(start_values)
+
+        direction = "ASC" if forward else "DESC"
+        sql = (
+            f"SELECT data FROM {self.table} WHERE {' AND '.join(where)} "
+            f"ORDER BY {', '.join(f'{column} {direction}' for column in order)}"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._decode(row[0]) for row in rows]
+
+    def scan(self, start: Optional[Dict[str, Any]], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Every item of the table, in (pk, sk) order after `start`."""
+        sql = f"SELECT data FROM {self.table}"
+        params: List[Any] = []
+        if start is not None:
+            sql += " WHERE (pk, sk) > (?, ?)"
+            params.extend(self._key(start))
+        sql += " ORDER BY pk, sk"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._decode(row[0]) for row in rows]
+
+    def sweep(self, now: int) -> int:
+        """Delete the items whose TTL is past. Returns how many."""
+        with self._lock:
+            cursor = self._connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (now,),
+            )
+        return cursor.rowcount
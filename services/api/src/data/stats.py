@@ -0,0 +1,249 @@
+"""Per-user application stats, kept in one summary item.
+
+The funnel (how many applications per status, closed ones per reason,
+median time-to-close) lives in the `STATS` item of the user's partition, so
+GET /applications/stats is a single GetItem whatever the partition size.
+
+Single-item writes (create, status/closedReason PATCH, delete) put the stats
+update in the same TransactWriteItems as the application itself: see
+stats_delta() and stats_update(). Bulk paths apply their delta afterwards
+(batch create, import) or mark the item stale (batch delete, whose deletes
+do not return the old items); a stale or missing item is rebuilt from the
+partition on the next read.
+
+Counters are top-level numbers so that ADD works on an item that does not
+exist yet:
+- total, status_{STATUS}, reason_{CLOSED_REASON} (closed applications only)
+- ttc_{days}: histogram of days from creation to closing (capped at
+  TTC_MAX_DAYS), from which the median is computed
+- revision: incremented by every update, guards rebuilds against racing writes
+
+The item's timestamp is `refreshedAt`, not updatedAt, and it has no
+GSI1PK: it stays out of StatusIndex and the views merged from it.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from data.dynamo import get_table, iter_query
+
+logger = logging.getLogger(__name__)
+
+STATS_SK = "STATS"
+
+TTC_MAX_DAYS = 365
+
+# Attributes of an application that the stats depend on
+STATS_SOURCE_FIELDS = ("status", "closedReason", "createdAt", "closedAt", "lastTransition", "history", "version")
+
+
+def stats_projection() -> Dict[str, Any]:
+    """Projection kwargs reading only STATS_SOURCE_FIELDS of an application."""
+    names = {f"#s{i}": field for i, field in enumerate(STATS_SOURCE_FIELDS)}
+    return {
+        "ProjectionExpression": ", ".join(names.keys()),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_iso(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _closed_at(item: Dict[str, Any]) -> Optional[str]:
+    """When the application was closed: closedAt, or its last transition to CLOSED.
+
+    Cards written before closedAt existed still carry their history list.
+    """
+    if item.get("closedAt"):
+        return item["closedAt"]
+    transition = item.get("lastTransition")
+    if isinstance(transition, dict) and transition.get("to") == "CLOSED":
+        return transition.get("at")
+    for event in reversed(item.get("history") or []):
+        if isinstance(event, dict) and event.get("to") == "CLOSED":
+            return event.get("at")
+    return None
+
+
+def _contribution(item: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Counters an application adds to the stats item."""
+    if not item:
+        return {}
+
+    status = item.get("status") or "IN_PROGRESS"
+    counters = {"total": 1, f"status_{status}": 1}
+    if status != "CLOSED":
+        return counters
+
+    if item.get("closedReason"):
+        counters[f"reason_{item['closedReason']}"] = 1
+
+    created = _parse_iso(item.get("createdAt"))
+    closed = _parse_iso(_closed_at(item))
+    if created and closed:
+        days = max(0, min(TTC_MAX_DAYS, (closed - created).days))
+        counters[f"ttc_{days}"] = 1
+    return counters
+
+
+def stats_delta(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Counter changes when an application goes from `old` to `new` (None: absent)."""
+    delta = dict(_contribution(new))
+    for name, value in _contribution(old).items():
+        delta[name] = delta.get(name, 0) - value
+    return {name: value for name, value in delta.items() if value}
+
+
+def created_delta(count: int) -> Dict[str, int]:
+    """Counter changes for `count` new applications (they all start IN_PROGRESS)."""
+    return {"total": count, "status_IN_PROGRESS": count} if count else {}
+
+
+def _update_kwargs(delta: Dict[str, int], now: str) -> Dict[str, Any]:
+    names = {f"#c{i}": name for i, name in enumerate(delta)}
+    values: Dict[str, Any] = {f":c{i}": value for i, value in enumerate(delta.values())}
+    values.update({":one": 1, ":now": now})
+
+    adds = [f"#c{i} :c{i}" for i in range(len(delta))] + ["revision :one"]
+    kwargs: Dict[str, Any] = {
+        "UpdateExpression": "ADD " + ", ".join(adds) + " SET refreshedAt = :now",
+        "ExpressionAttributeValues": values,
+    }
+    if names:
+        kwargs["ExpressionAttributeNames"] = names
+    return kwargs
+
+
+def stats_update(pk: str, delta: Dict[str, int], now: str) -> Dict[str, Any]:
+    """TransactWriteItems entry applying `delta` to the stats item of `pk`."""
+    return {"Update": {"Key": {"PK": pk, "SK": STATS_SK}, **_update_kwargs(delta, now)}}
+
+
+def apply_stats_delta(pk: str, delta: Dict[str, int]) -> None:
+    """Apply `delta` outside a transaction (bulk writes). Failures mark the item stale."""
+    if not delta:
+        return
+    try:
+        get_table().update_item(Key={"PK": pk, "SK": STATS_SK}, **_update_kwargs(delta, _now_iso()))
+    except Exception:
+        logger.exception("Failed to update stats for %s", pk)
+        mark_stats_stale(pk)
+
+
+def mark_stats_stale(pk: str) -> None:
+    """Have the next read rebuild the stats of `pk` from the partition."""
+    try:
+        get_table().update_item(
+            Key={"PK": pk, "SK": STATS_SK},
+            UpdateExpression="SET stale = :true ADD revision :one",
+            ExpressionAttributeValues={":true": True, ":one": 1},
+        )
+    except Exception:
+        logger.exception("Failed to mark stats stale for %s", pk)
+
+
+def _median_days(histogram: Dict[int, int]) -> Optional[float]:
+    count = sum(histogram.values())
+    if not count:
+        return None
+
+    # Positions (0-based) of the middle value(s) in the sorted durations
+    wanted = sorted({(count - 1) // 2, count // 2})
+    found: List[int] = []
+    seen = 0
+    for days in sorted(histogram):
+        seen += histogram[days]
+        while wanted and wanted[0] < seen:
+            found.append(days)
+            wanted.pop(0)
+    if len(found) == 1:
+        found.append(found[0])
+    return sum(found) / 2
+
+
+def summarize(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Response body of GET /applications/stats for a stats item."""
+    by_status: Dict[str, int] = {}
+    by_reason: Dict[str, int] = {}
+    histogram: Dict[int, int] = {}
+    for name, value in item.items():
+        if name.startswith("status_"):
+            by_status[name[len("status_"):]] = int(value)
+        elif name.startswith("reason_"):
+            by_reason[name[len("reason_"):]] = int(value)
+        elif name.startswith("ttc_") and value:
+            histogram[int(name[len("ttc_"):])] = int(value)
+
+    return {
+        "total": int(item.get("total") or 0),
+        "byStatus": by_status,
+        "closedByReason": by_reason,
+        "medianDaysToClose": _median_days(histogram),
+        "closedWithDuration": sum(histogram.values()),
+        "updatedAt": item.get("refreshedAt"),
+    }
+
+
+def rebuild_stats(pk: str, seen_revision: Optional[int]) -> Dict[str, Any]:
+    """Recompute the stats item from the partition and store it.
+
+    The write is conditioned on `revision` still being `seen_revision`: if an
+    application was written meanwhile, the recomputed item is returned but not
+    stored, and the next read rebuilds again.
+    """
+    counters: Dict[str, int] = {}
+    for application in iter_query(
+        KeyConditionExpression="PK = :pk AND begins_with(SK, :app_prefix)",
+        ExpressionAttributeValues={":pk": pk, ":app_prefix": "APP#"},
+        ConsistentRead=True,
+        **stats_projection(),
+    ):
+        for name, value in _contribution(application).items():
+            counters[name] = counters.get(name, 0) + value
+
+    now = _now_iso()
+    item: Dict[str, Any] = {
+        "PK": pk,
+        "SK": STATS_SK,
+        **counters,
+        "revision": (seen_revision or 0) + 1,
+        "builtAt": now,
+        "refreshedAt": now,
+    }
+    if seen_revision is None:
+        condition = {"ConditionExpression": "attribute_not_exists(revision)"}
+    else:
+        condition = {
+            "ConditionExpression": "revision = :seen",
+            "ExpressionAttributeValues": {":seen": seen_revision},
+        }
+    try:
+        get_table().put_item(Item=item, **condition)
+    except Exception:
+        logger.info("Stats of %s changed during rebuild, not stored", pk)
+    return item
+
+
+def load_stats(pk: str) -> Dict[str, Any]:
+    """Stats item of `pk`, rebuilt first when missing, stale, or never built.
+
+    An item created by a transaction before the first rebuild (no builtAt)
+    only holds the counters of the writes since, so it is rebuilt too.
+    """
+    item = get_table().get_item(Key={"PK": pk, "SK": STATS_SK}, ConsistentRead=True).get("Item")
+    if item and item.get("builtAt") and not item.get("stale"):
+        return item
+    return rebuild_stats(pk, (item or {}).get("revision"))
@@ -0,0 +1,72 @@
+"""DynamoDB Streams consumer for the work derived from application changes.
+
+- search index entries (see data.search)
+- history items of deleted applications (SK range HISTORY_PREFIX), so that
+  DELETE and batch delete stay one write per card
+
+Wired in infra/stacks/backend_stack.py with NEW_AND_OLD_IMAGES and a filter
+keeping only application items (SK begins with APP#), so its own writes do
+not come back through the stream.
+
+Each record is turned into the entries to delete and to put, and the whole
+batch is written with BatchWriteItem. These writes are idempotent: when some
+cannot be written the invocation fails and Lambda retries the batch
+(bisecting it on repeated errors).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List
+
+from data.dynamo import batch_write, history_prefix, iter_query
+from data.dynamo_types import deserialize_map
+from data.search import index_requests
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _record_requests(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    change = record.get("dynamodb") or {}
+    keys = deserialize_map(change.get("Keys")) or {}
+    sk = keys.get("SK") or ""
+    if not sk.startswith("APP#"):
+        return []
+
+    pk = keys["PK"]
+    app_id = sk[len("APP#"):]
+    old = deserialize_map(change.get("OldImage"))
+    new = deserialize_map(change.get("NewImage"))
+
+    requests = index_requests(pk, app_id, old, new)
+    if record.get("eventName") == "REMOVE":
+        requests.extend(
+            {"DeleteRequest": {"Key": {"PK": pk, "SK": entry["SK"]}}}
+            for entry in iter_query(
+                KeyConditionExpression="PK = :pk AND begins_with(SK, :history_prefix)",
+                ExpressionAttributeValues={":pk": pk, ":history_prefix": history_prefix(app_id)},
+                ProjectionExpression="SK",
+            )
+        )
+    return requests
+
+
+def handler(event, context):
+    requests: List[Dict[str, Any]] = []
+    for record in event.get("Records") or []:
+        requests.extend(_record_requests(record))
+
+    # Within one batch the last change of an entry wins (BatchWriteItem
+    # also rejects two requests on the same key)
+    latest: Dict[tuple, Dict[str, Any]] = {}
+    for request in requests:
+        key = request["PutRequest"]["Item"] if "PutRequest" in request else request["DeleteRequest"]["Key"]
+        latest.pop((key["PK"], key["SK"]), None)
+        latest[(key["PK"], key["SK"])] = request
+
+    failed = batch_write(list(latest.values()))
+    logger.info("Processed %d records: %d entry writes, %d failed", len(event.get("Records") or []), len(latest), len(failed))
+    if failed:
+        raise RuntimeError(f"{len(failed)} derived writes failed")
+    return {"written": len(latest) - len(failed)}
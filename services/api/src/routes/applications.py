@@ -1,21 +1,75 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import uuid
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
-from core.auth import get_sub
-from core.response import bad_request, json_response, server_error, unauthorized, not_found
-from data.dynamo import get_table
+from core.cursor import InvalidCursor, decode_cursor, encode_cursor
+from core.params import MAX_PAGE_SIZE, parse_fields, parse_limit, projection
+from core.request import get_header, matched_etag
+from core.router import Request
+from core.response import (
+    bad_request,
+    conflict,
+    gone,
+    json_response,
+    json_dumps,
+    make_etag,
+    not_found,
+    not_modified,
+    server_error,
+    unprocessable,
+)
+from data.cache import MISS, cache, invalidate_partition
+from data.dynamo import (
+    IDEMPOTENCY_PREFIX,
+    IDEMPOTENCY_TTL_SECONDS,
+    STATUS_INDEX,
+    TOMBSTONE_PREFIX,
+    TOMBSTONE_STATUS,
+    TOMBSTONE_TTL_SECONDS,
+    TRANSACT_WRITE_SIZE,
+    TTL_ATTRIBUTE,
+    batch_get,
+    batch_put_items,
+    batch_write,
+    cancellation_reasons,
+    get_table,
+    history_prefix,
+    status_index_pk,
+)
+from data.recent import CARD_STATUSES, iter_merged, query_merged, start_cursor
+from data.search import search_ids, tokenize
+from data.stats import (
+    STATS_SOURCE_FIELDS,
+    apply_stats_delta,
+    created_delta,
+    load_stats,
+    mark_stats_stale,
+    stats_delta,
+    stats_update,
+    summarize,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+STATUSES = {"IN_PROGRESS", "ACCEPTED", "CLOSED"}
+CLOSED_REASONS = {"REFUSED", "ABANDONED"}
+
+# Status transitions: how many one GET /applications/{id}/history page returns
+DEFAULT_HISTORY_PAGE_SIZE = 50
+
+
+# Delta sync reads this far before `since`: a write whose updatedAt was taken
+# just before the client's watermark may commit just after it. Clients apply
+# changes by applicationId/version, so the overlap is harmless.
+SYNC_OVERLAP_SECONDS = 5
 
 
 def _now_iso() -> str:
@@ -23,44 +77,224 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def list_applications(event: Dict[str, Any]):
-    """GET /applications - List all applications for the authenticated user."""
-    sub = get_sub(event)
-    if not sub:
-        return unauthorized()
+def _parse_since(raw: str) -> Optional[datetime]:
+    """Parse the `since` watermark (ISO-8601, as returned in updatedAt). None if invalid."""
+    try:
+        since = datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since.astimezone(timezone.utc)
 
-    pk = f"USER#{sub}"
 
-    table = get_table()
-    try:
-        response = table.query(
-            KeyConditionExpression=Key("PK").eq(pk),
-        )
-    except Exception:
-        return server_error("Failed to query applications")
+def item_etag(item: Dict[str, Any]) -> str:
+    """ETag of a single application: its key plus its version counter.
 
-    items = response.get("Items", [])
-    return json_response({"items": items})
+    Items written before versioning fall back to updatedAt.
+    """
+    return make_etag(item.get("SK"), item.get("version") or item.get("updatedAt"))
+
+
+def _page_etag(page: Dict[str, Any]) -> str:
+    """ETag of a list page, derived from the page itself so it cannot go stale."""
+    return make_etag("list", json_dumps(page))
+
+
+def _parse_order(raw: Optional[str]) -> Optional[bool]:
+    """Parse `order` into a ScanIndexForward value. Returns None if invalid."""
+    if raw is None or raw == "" or raw == "desc":
+        return False
+    if raw == "asc":
+        return True
+    return None
+
+
+def list_applications(request: Request):
+    """GET /applications - List applications for the authenticated user, one page at a time.
+
+    Query parameters:
+    - limit: page size (1..MAX_PAGE_SIZE, default DEFAULT_PAGE_SIZE)
+    - cursor: opaque token returned as `nextCursor` by the previous page
+    - fields: "card" (default), "all", or a comma-separated attribute list
+    - status: only return applications with this status (served by STATUS_INDEX)
+    - sort: "updatedAt" (served by STATUS_INDEX with status, by a merge of its
+      status partitions without, see data.recent)
+    - order: "desc" (default, most recent first) or "asc"
+    - ids: comma-separated application ids; returns those cards instead of a
+      page (see get_applications_by_id)
+    - since: delta sync, see below
+
+    `nextCursor` is null once the partition has been fully read.
+
+    Delta sync: with since=<updatedAt watermark>, the merge of the status and
+    tombstone partitions of STATUS_INDEX returns only what changed after it
+    (minus SYNC_OVERLAP_SECONDS), oldest first:
+    `items` (cards written) and `deleted` (tombstones of deleted cards), plus
+    `watermark` to pass as `since` next time once `nextCursor` is null.
+    Tombstones expire after TOMBSTONE_TTL_SECONDS; an older watermark gets a
+    410 SYNC_EXPIRED and the client reloads everything.
+
+    The response carries an ETag derived from the page content; a matching
+    If-None-Match gets an empty 304, so an unchanged page is not sent again.
+    """
+    pk = request.pk
+    params = request.params
+
+    if params.get("ids") is not None:
+        if any(params.get(name) for name in ("cursor", "status", "sort", "limit", "since")):
+            return bad_request("ids cannot be combined with cursor, status, sort, limit or since")
+        ids, ids_error = _parse_id_list({"ids": [i for i in params["ids"].split(",") if i.strip()]})
+        if ids_error:
+            return bad_request(ids_error)
+        return get_applications_by_id(pk, ids, params.get("fields"))
+
+    limit = parse_limit(params.get("limit"))
+    if limit is None:
+        return bad_request(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+
+    fields, fields_error = parse_fields(params.get("fields"))
+    if fields_error:
+        return bad_request(fields_error)
+
+    status = params.get("status") or None
+    if status is not None and status not in STATUSES:
+        return bad_request("status must be IN_PROGRESS, ACCEPTED, or CLOSED")
+
+    sort = params.get("sort") or None
+    if sort is not None and sort != "updatedAt":
+        return bad_request("sort must be updatedAt")
+
+    scan_forward = _parse_order(params.get("order"))
+    if scan_forward is None:
+        return bad_request("order must be asc or desc")
+
+    since: Optional[datetime] = None
+    if params.get("since"):
+        since = _parse_since(params["since"])
+        if since is None:
+            return bad_request("since must be an ISO-8601 timestamp")
+        if status is not None or sort is not None:
+            return bad_request("since cannot be combined with status or sort")
+        if since < datetime.now(timezone.utc) - timedelta(seconds=TOMBSTONE_TTL_SECONDS):
+            return gone("since is older than the deletion history, reload everything", code="SYNC_EXPIRED")
+
+    # Views by updatedAt across statuses: (statuses, forward, since) of the merge
+    merge: Optional[Tuple[Tuple[str, ...], bool, Optional[str]]] = None
+    query_kwargs: Dict[str, Any] = {}
+    if since is not None:
+        # Cards and tombstones written after the watermark, oldest first
+        since_value = (since - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+        cursor_scope = f"sync:{since_value}"
+        merge = (CARD_STATUSES + (TOMBSTONE_STATUS,), True, since_value)
+        if fields is not None:
+            fields = tuple(dict.fromkeys(fields + ("updatedAt", "deleted")))
+    elif status is not None:
+        # Only the matching items are read, newest first unless order=asc
+        cursor_scope = f"{STATUS_INDEX}:{status}"
+        query_kwargs = {
+            "IndexName": STATUS_INDEX,
+            "KeyConditionExpression": "GSI1PK = :gsi1pk",
+            "ExpressionAttributeValues": {":gsi1pk": status_index_pk(pk, status)},
+            "ScanIndexForward": scan_forward,
+            "Limit": limit,
+        }
+    elif sort is not None:
+        # Every card, most recently updated first unless order=asc
+        cursor_scope = "updatedAt"
+        merge = (CARD_STATUSES, scan_forward, None)
+    else:
+        cursor_scope = ""
+        query_kwargs = {
+            "KeyConditionExpression": "PK = :pk AND begins_with(SK, :app_prefix)",
+            "ExpressionAttributeValues": {":pk": pk, ":app_prefix": "APP#"},
+            "Limit": limit,
+        }
+    if fields is not None and merge is None:
+        query_kwargs.update(projection(fields))
+
+    start_key: Optional[Dict[str, Any]] = None
+    cursor = params.get("cursor")
+    if cursor:
+        try:
+            start_key = decode_cursor(cursor, pk, scope=cursor_scope)
+        except InvalidCursor:
+            return bad_request("Invalid cursor", code="INVALID_CURSOR")
+
+    cache_key = ("query", pk, tuple(sorted(params.items())))
+    cached = cache.get(cache_key)
+    if cached is MISS:
+        try:
+            if merge is not None:
+                statuses, forward, since_value = merge
+                items, last_key = query_merged(
+                    start_key or start_cursor(pk, statuses),
+                    forward=forward,
+                    limit=limit,
+                    since=since_value,
+                    fields=fields,
+                )
+            else:
+                if start_key:
+                    query_kwargs["ExclusiveStartKey"] = start_key
+                response = get_table().query(**query_kwargs)
+                items, last_key = response.get("Items", []), response.get("LastEvaluatedKey")
+        except Exception:
+            return server_error("Failed to query applications")
+
+        page = {
+            "items": items,
+            "nextCursor": encode_cursor(last_key, pk, scope=cursor_scope) if last_key else None,
+        }
+        if since is not None:
+            page["items"] = [item for item in items if not item.get("deleted")]
+            page["deleted"] = [
+                {"applicationId": item["applicationId"], "deletedAt": item["updatedAt"]}
+                for item in items
+                if item.get("deleted")
+            ]
+            page["watermark"] = max([item["updatedAt"] for item in items] + [since.isoformat()])
+        cached = (page, _page_etag(page))
+        cache.set(cache_key, cached)
 
+    page, etag = cached
+    cached_etag = matched_etag(request.event, etag)
+    if cached_etag:
+        return not_modified(cached_etag)
+    return json_response(page, etag=etag)
 
-def create_application(event: Dict[str, Any]):
-    """POST /applications - Create a new application card."""
-    sub = get_sub(event)
-    if not sub:
-        return unauthorized()
 
-    raw_body = event.get("body") or "{}"
-    try:
-        body = json.loads(raw_body)
-    except json.JSONDecodeError:
-        return bad_request("Invalid JSON body")
+CREATE_TEXT_FIELDS = ("location", "appliedDate", "jobUrl", "mission", "notes", "contact")
+
+MAX_BATCH_ITEMS = 500
+
+# Transaction attempts of POST /applications (conflicts on the stats or
+# idempotency record are retried)
+CREATE_MAX_ATTEMPTS = 3
+
+# Idempotency-Key: at most this long, printable ASCII
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def build_application_item(pk: str, body: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate a create payload and build the item to store.
+
+    Shared by POST /applications and POST /applications/batch so both paths
+    apply the same rules. Returns (item, error).
+    """
+    if not isinstance(body, dict):
+        return None, "Body must be a JSON object"
+
+    for field in ("title", "company") + CREATE_TEXT_FIELDS:
+        value = body.get(field)
+        if value is not None and not isinstance(value, str):
+            return None, f"{field} must be a string"
 
     title = (body.get("title") or "").strip()
     company = (body.get("company") or "").strip()
     if not title or not company:
-        return bad_request("title and company are required")
+        return None, "title and company are required"
 
-    pk = f"USER#{sub}"
     app_id = str(uuid.uuid4())
     sk = f"APP#{app_id}"
 
@@ -72,75 +306,811 @@ def create_application(event: Dict[str, Any]):
         "applicationId": app_id,
         "title": title,
         "company": company,
-        "location": (body.get("location") or "").strip(),
-        "appliedDate": (body.get("appliedDate") or "").strip(),
-        "jobUrl": (body.get("jobUrl") or "").strip(),
-        "mission": (body.get("mission") or "").strip(),
-        "notes": (body.get("notes") or "").strip(),
-        "contact": (body.get("contact") or "").strip(),
-        "status": "IN_PROGRESS",
-        "history": [
-            {
+    }
+    for field in CREATE_TEXT_FIELDS:
+        item[field] = (body.get(field) or "").strip()
+
+    item.update(
+        {
+            "status": "IN_PROGRESS",
+            "GSI1PK": status_index_pk(pk, "IN_PROGRESS"),
+            # Transitions are separate history items (see creation_history_item),
+            # the card only summarizes the last one
+            "lastTransition": {
                 "at": now,
                 "from": None,
                 "to": "IN_PROGRESS",
-            }
-        ],
-        "createdAt": now,
-        "updatedAt": now,
+            },
+            "createdAt": now,
+            "updatedAt": now,
+            "version": 1,
+        }
+    )
+    return item, None
+
+
+def _parse_idempotency_key(request: Request) -> Tuple[Optional[str], Optional[str]]:
+    """Read the Idempotency-Key header. Returns (key or None, error)."""
+    raw = get_header(request.event, "Idempotency-Key")
+    if raw is None:
+        return None, None
+    key = raw.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH or not all(33 <= ord(char) <= 126 for char in key):
+        return None, f"Idempotency-Key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} printable ASCII characters"
+    return key, None
+
+
+def _request_hash(body: Any) -> str:
+    """Fingerprint of a create payload, to tell a replay from a reused key."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def idempotency_put(pk: str, key: str, request_hash: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    """TransactWriteItems entry storing the response of a keyed create.
+
+    It only succeeds if the key is unused (or its record expired but was not
+    swept by TTL yet); otherwise the stored record comes back in the
+    cancellation reason.
+    """
+    created = int(datetime.fromisoformat(item["createdAt"]).timestamp())
+    record = {
+        "PK": pk,
+        "SK": f"{IDEMPOTENCY_PREFIX}{key}",
+        "requestHash": request_hash,
+        "applicationId": item["applicationId"],
+        "response": item,
+        "createdAt": item["createdAt"],
+        TTL_ATTRIBUTE: created + IDEMPOTENCY_TTL_SECONDS,
+    }
+    return {
+        "Put": {
+            "Item": record,
+            "ConditionExpression": "attribute_not_exists(PK) OR #expires < :now",
+            "ExpressionAttributeNames": {"#expires": TTL_ATTRIBUTE},
+            "ExpressionAttributeValues": {":now": created},
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+        }
     }
 
+
+def _replay(record: Dict[str, Any], request_hash: str) -> Dict[str, Any]:
+    """Response of a create whose Idempotency-Key already has a record."""
+    if record.get("requestHash") != request_hash:
+        return unprocessable(
+            "Idempotency-Key was already used with a different request",
+            code="IDEMPOTENCY_KEY_REUSED",
+        )
+    item = record["response"]
+    return json_response(item, status=201, headers={"Idempotent-Replayed": "true"}, etag=item_etag(item))
+
+
+def create_application(request: Request):
+    """POST /applications - Create a new application card.
+
+    With an Idempotency-Key header, the response is recorded (for
+    IDEMPOTENCY_TTL_SECONDS) in the same transaction as the card: a retried
+    or hedged request with the same key and body gets the original 201 back
+    (with Idempotent-Replayed: true) and nothing is written again. The same
+    key with another body is a 422.
+    """
+    pk = request.pk
+    key, key_error = _parse_idempotency_key(request)
+    if key_error:
+        return bad_request(key_error, code="INVALID_IDEMPOTENCY_KEY")
+
+    item, error = build_application_item(pk, request.body)
+    if error:
+        return bad_request(error)
+
+    # The card, its creation history item, its idempotency record and the
+    # stats counters are written together
+    writes = [
+        {"Put": {"Item": item, "ConditionExpression": "attribute_not_exists(PK)"}},
+        {"Put": {"Item": creation_history_item(item)}},
+        stats_update(pk, stats_delta(None, item), item["createdAt"]),
+    ]
+    request_hash = ""
+    if key is not None:
+        request_hash = _request_hash(request.body)
+        writes.append(idempotency_put(pk, key, request_hash, item))
+
+    table = get_table()
+    for _ in range(CREATE_MAX_ATTEMPTS):
+        try:
+            table.transact_write_items(writes)
+        except ClientError as e:
+            reasons = cancellation_reasons(e)
+            if key is not None and len(reasons) == len(writes):
+                if reasons[-1].get("Code") == "ConditionalCheckFailed" and reasons[-1].get("Item"):
+                    return _replay(reasons[-1]["Item"], request_hash)
+            # Nothing was written; with the same key, a concurrent request
+            # holding the record is seen by the next attempt
+            if any(reason.get("Code") == "TransactionConflict" for reason in reasons):
+                continue
+            logger.exception("Failed to create application")
+            return server_error("Failed to create application")
+        except Exception:
+            logger.exception("Failed to create application")
+            return server_error("Failed to create application")
+
+        invalidate_partition(pk)
+        return json_response(item, status=201, etag=item_etag(item))
+
+    logger.warning("Create kept racing other writers for %s", pk)
+    return conflict("Too many concurrent writes, please retry")
+
+
+def batch_create_applications(request: Request):
+    """POST /applications/batch - Create many application cards in one call.
+
+    Body: a JSON array of create payloads (or {"items": [...]}).
+    Each element goes through the same validation as POST /applications, valid
+    ones are written with BatchWriteItem (25 per call, unprocessed items retried
+    with backoff) along with their creation history items. The response reports the outcome of every element, in order.
+
+    Status: 201 when everything was created, 207 when some elements failed.
+    """
+    body = request.body
+    if isinstance(body, dict):
+        body = body.get("items")
+    if not isinstance(body, list):
+        return bad_request("Body must be a JSON array of applications")
+    if not body:
+        return bad_request("No applications provided")
+    if len(body) > MAX_BATCH_ITEMS:
+        return bad_request(f"At most {MAX_BATCH_ITEMS} applications per batch")
+
+    pk = request.pk
+
+    results: List[Dict[str, Any]] = []
+    to_write: List[Dict[str, Any]] = []
+    for index, element in enumerate(body):
+        item, error = build_application_item(pk, element)
+        if error:
+            results.append({"index": index, "ok": False, "error": error})
+            continue
+        results.append({"index": index, "ok": True, "applicationId": item["applicationId"]})
+        to_write.append(item)
+
+    history = [creation_history_item(item) for item in to_write]
+    failed_keys = {(it["PK"], it["SK"]) for it in batch_put_items(to_write + history)}
+    failed_history = sum(1 for _, sk in failed_keys if not sk.startswith("APP#"))
+    if failed_history:
+        logger.warning("%d creation history items not written for %s", failed_history, pk)
+    for result in results:
+        if result["ok"] and (pk, f"APP#{result['applicationId']}") in failed_keys:
+            result.update({"ok": False, "error": "Write failed"})
+
+    created = sum(1 for r in results if r["ok"])
+    failed = len(results) - created
+    if created:
+        apply_stats_delta(pk, created_delta(created))
+        invalidate_partition(pk)
+    return json_response(
+        {"created": created, "failed": failed, "results": results},
+        status=201 if failed == 0 else 207,
+    )
+
+
+def get_application(request: Request):
+    """GET /applications/{id} - Return one application."""
+    app_id = request.path_params["id"]
+    pk = request.pk
+    sk = f"APP#{app_id}"
+
+    cache_key = ("item", pk, sk)
+    item = cache.get(cache_key)
+    if item is MISS:
+        table = get_table()
+        try:
+            response = table.get_item(Key={"PK": pk, "SK": sk})
+        except Exception:
+            return server_error("Failed to get application")
+
+        item = response.get("Item")
+        cache.set(cache_key, item)
+
+    if not item:
+        return not_found("Application not found")
+
+    etag = item_etag(item)
+    cached_etag = matched_etag(request.event, etag)
+    if cached_etag:
+        return not_modified(cached_etag)
+
+    return json_response(item, etag=etag)
+
+
+HISTORY_FIELDS = ("applicationId", "at", "from", "to", "closedReason")
+
+
+def get_application_history(request: Request):
+    """GET /applications/{id}/history - Status transitions of one application, a page at a time.
+
+    Query parameters:
+    - limit: page size (1..MAX_PAGE_SIZE, default DEFAULT_PAGE_SIZE)
+    - cursor: `nextCursor` of the previous page
+    - order: "desc" (default, most recent first) or "asc"
+
+    Transitions are history items (see history_item), read with one Query on
+    their SK range. The card itself is only read when that range is empty: to
+    tell an unknown application (404), and to serve the `history` list still
+    embedded in cards written before history items (see _legacy_history_page).
+    """
+    app_id = request.path_params["id"]
+    pk = request.pk
+    params = request.params
+
+    limit = parse_limit(params.get("limit"))
+    if limit is None:
+        return bad_request(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+
+    scan_forward = _parse_order(params.get("order"))
+    if scan_forward is None:
+        return bad_request("order must be asc or desc")
+
+    cursor_scope = f"history:{app_id}"
+    query_kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "PK = :pk AND begins_with(SK, :history_prefix)",
+        "ExpressionAttributeValues": {":pk": pk, ":history_prefix": history_prefix(app_id)},
+        "ScanIndexForward": scan_forward,
+        "Limit": limit,
+        **projection(HISTORY_FIELDS),
+    }
+
+    cursor = params.get("cursor")
+    if cursor:
+        try:
+            query_kwargs["ExclusiveStartKey"] = decode_cursor(cursor, pk, scope=cursor_scope)
+        except InvalidCursor:
+            return bad_request("Invalid cursor", code="INVALID_CURSOR")
+
     table = get_table()
     try:
-        table.put_item(Item=item)
+        response = table.query(**query_kwargs)
+        items = response.get("Items", [])
+        card = None
+        if not items:
+            card = table.get_item(
+                Key={"PK": pk, "SK": f"APP#{app_id}"},
+                ProjectionExpression="SK, #history",
+                ExpressionAttributeNames={"#history": "history"},
+            ).get("Item")
     except Exception:
-        return server_error("Failed to create application")
+        logger.exception("Failed to query history")
+        return server_error("Failed to get application history")
 
-    return json_response(item, status=201)
+    if not items:
+        if not card and not cursor:
+            return not_found("Application not found")
+        if card and card.get("history"):
+            return _legacy_history_page(pk, app_id, card, query_kwargs, cursor_scope)
 
+    last_key = response.get("LastEvaluatedKey")
+    return json_response(
+        {
+            "items": items,
+            "nextCursor": encode_cursor(last_key, pk, scope=cursor_scope) if last_key else None,
+        }
+    )
 
-def get_application(event: Dict[str, Any], app_id: str):
-    sub = get_sub(event)
-    if not sub:
-        return unauthorized()
 
-    pk = f"USER#{sub}"
-    sk = f"APP#{app_id}"
+def _legacy_history_page(
+    pk: str,
+    app_id: str,
+    card: Dict[str, Any],
+    query_kwargs: Dict[str, Any],
+    cursor_scope: str,
+):
+    """History page served from the list embedded in a card not migrated yet.
 
-    table = get_table()
+    Entries are shaped and paged like history items, cursors included, so
+    clients cannot tell the difference.
+    """
+    entries = sorted(_legacy_history_items(pk, app_id, card), key=lambda item: item["SK"])
+    if not query_kwargs["ScanIndexForward"]:
+        entries.reverse()
+
+    start = query_kwargs.get("ExclusiveStartKey")
+    if start:
+        after = start["SK"]
+        entries = [e for e in entries if (e["SK"] > after if query_kwargs["ScanIndexForward"] else e["SK"] < after)]
+
+    page = entries[: query_kwargs["Limit"]]
+    next_cursor = None
+    if len(entries) > len(page):
+        next_cursor = encode_cursor({"PK": pk, "SK": page[-1]["SK"]}, pk, scope=cursor_scope)
+    return json_response(
+        {
+            "items": [{field: entry[field] for field in HISTORY_FIELDS if field in entry} for entry in page],
+            "nextCursor": next_cursor,
+        }
+    )
+
+
+def get_application_stats(request: Request):
+    """GET /applications/stats - Funnel of the user's applications.
+
+    Served from the user's stats item (one GetItem), maintained by the write
+    paths; see data.stats.
+    """
     try:
-        response = table.get_item(Key={"PK": pk, "SK": sk})
+        item = load_stats(request.pk)
     except Exception:
-        return server_error("Failed to get application")
+        logger.exception("Failed to load stats")
+        return server_error("Failed to load stats")
+    return json_response(summarize(item))
 
-    item = response.get("Item")
-    if not item:
-        return not_found("Application not found")
 
-    return json_response(item)
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_MAX_TOKENS = 8
 
+# Matches ranked by reading their updatedAt (BatchGetItem, BATCH_GET_SIZE per call)
+SEARCH_MAX_RANKED = 500
 
-def patch_application(event: Dict[str, Any], app_id: str):
-    """PATCH /applications/{id} - Partially update an application.
+# Beyond, the user's cards are walked most recent first instead; the walk
+# stops after this many cards (the result is then `truncated`)
+SEARCH_MAX_WALKED = 2000
 
-    V1 rules:
-    - Allowed fields: title, company, location, appliedDate, jobUrl, mission, notes, contact, status, closedReason
-    - status must be one of: IN_PROGRESS, ACCEPTED, CLOSED
-    - If status == CLOSED, closedReason must be one of: REFUSED, ABANDONED
-    - When status changes, we append an entry to history and update updatedAt.
+
+def _rank_matches(pk: str, ids: Set[str], limit: int) -> Tuple[List[str], bool]:
+    """The `limit` most recently updated of the matching `ids`, and whether the ranking was cut short.
+
+    Up to SEARCH_MAX_RANKED matches, their updatedAt is read and sorted.
+    A broader query walks the cards by recency instead, until `limit` of
+    them matched or SEARCH_MAX_WALKED were read.
     """
-    sub = get_sub(event)
-    if not sub:
-        return unauthorized()
+    if len(ids) <= SEARCH_MAX_RANKED:
+        keys = [{"PK": pk, "SK": f"APP#{app_id}"} for app_id in ids]
+        items, failed = batch_get(keys, ProjectionExpression="applicationId, updatedAt")
+        if failed:
+            logger.warning("Search could not rank %d of %d matches", len(failed), len(ids))
+        items.sort(key=lambda item: item.get("updatedAt") or "", reverse=True)
+        return [item["applicationId"] for item in items[:limit]], False
+
+    ranked: List[str] = []
+    recent_cards = iter_merged(pk, CARD_STATUSES, forward=False, page_size=MAX_PAGE_SIZE, fields=("applicationId",))
+    for walked, card in enumerate(recent_cards, start=1):
+        if card.get("applicationId") in ids:
+            ranked.append(card["applicationId"])
+            if len(ranked) == limit:
+                return ranked, False
+        if walked >= SEARCH_MAX_WALKED:
+            return ranked, True
+    return ranked, False
+
+
+def search_applications(request: Request):
+    """GET /applications/search - Full-text search over the user's applications.
+
+    Query parameters:
+    - q: words to look for in title, company, location, notes and mission;
+      every word must match, the last one also as a prefix
+    - limit: maximum number of results (1..SEARCH_MAX_LIMIT, default SEARCH_DEFAULT_LIMIT)
+    - fields: same as GET /applications
+
+    Answered from the inverted index (one Query per word, see data.search),
+    most recently updated first (see _rank_matches), then a BatchGetItem of
+    the page. `total` counts every match; `truncated` tells that the query
+    was too broad for the ranking to cover them all, so more recent matches
+    may be missing. The index is maintained from the table stream, so very
+    recent writes may not be found yet.
+    """
+    params = request.params
+    pk = request.pk
+
+    tokens = tokenize(params.get("q") or "")
+    if not tokens:
+        return bad_request("q must contain at least one word")
+    if len(tokens) > SEARCH_MAX_TOKENS:
+        return bad_request(f"q must contain at most {SEARCH_MAX_TOKENS} words")
+
+    raw_limit = params.get("limit")
+    try:
+        limit = int(raw_limit) if raw_limit else SEARCH_DEFAULT_LIMIT
+    except ValueError:
+        limit = 0
+    if limit < 1 or limit > SEARCH_MAX_LIMIT:
+        return bad_request(f"limit must be an integer between 1 and {SEARCH_MAX_LIMIT}")
+
+    fields, fields_error = parse_fields(params.get("fields"))
+    if fields_error:
+        return bad_request(fields_error)
+
+    try:
+        ids = search_ids(pk, tokens)
+    except Exception:
+        logger.exception("Search index query failed")
+        return server_error("Failed to search applications")
 
-    raw_body = event.get("body") or "{}"
+    truncated = False
     try:
-        body = json.loads(raw_body)
-    except json.JSONDecodeError:
-        return bad_request("Invalid JSON body")
+        if len(ids) > limit:
+            page_ids, truncated = _rank_matches(pk, ids, limit)
+        else:
+            page_ids = list(ids)
+
+        projection_kwargs: Dict[str, Any] = {}
+        if fields is not None:
+            # updatedAt orders the page
+            projection_kwargs = projection(tuple(dict.fromkeys(fields + ("updatedAt",))))
+        items, failed = batch_get([{"PK": pk, "SK": f"APP#{app_id}"} for app_id in page_ids], **projection_kwargs)
+    except Exception:
+        logger.exception("Search ranking or BatchGetItem failed")
+        return server_error("Failed to search applications")
+    if failed:
+        logger.warning("Search could not read %d of %d matches", len(failed), len(page_ids))
+
+    items.sort(key=lambda item: item.get("updatedAt") or "", reverse=True)
+    return json_response(
+        {
+            "items": items,
+            "total": len(ids),
+            "truncated": truncated,
+            "tokens": tokens,
+        }
+    )
+
+
+PATCH_MAX_ATTEMPTS = 3
+
+# Safe attribute name placeholders for UpdateExpression
+PATCH_NAME_MAP = {
+    "title": "#title",
+    "company": "#company",
+    "location": "#location",
+    "appliedDate": "#appliedDate",
+    "jobUrl": "#jobUrl",
+    "mission": "#mission",
+    "notes": "#notes",
+    "contact": "#contact",
+    "status": "#status",
+    "closedReason": "#closedReason",
+    "closedAt": "#closedAt",
+    "history": "#history",
+    "lastTransition": "#lastTransition",
+    "GSI1PK": "#GSI1PK",
+    "version": "#version",
+}
+
+
+def _version_condition(item: Dict[str, Any], names: Dict[str, str], values: Dict[str, Any]) -> str:
+    """Condition holding only while the card still has the version `item` was read with."""
+    names["#version"] = "version"
+    if item.get("version") is None:
+        return "attribute_not_exists(#version)"
+    values[":expected_version"] = item["version"]
+    return "#version = :expected_version"
+
+
+def _transaction_retry(error: ClientError, current: Optional[Dict[str, Any]]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """After a cancelled card + stats transaction: (retry?, card to retry from).
+
+    The card is always the first item of the transaction. A failed condition
+    comes back with the card as currently stored (None once it is gone).
+    """
+    reasons = cancellation_reasons(error)
+    if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+        return True, reasons[0].get("Item")
+    if any(reason.get("Code") == "TransactionConflict" for reason in reasons):
+        return True, current
+    return False, current
+
+
+def _patch_update_kwargs(
+    pk: str,
+    normalized: Dict[str, Any],
+    now: str,
+    expected_status: Optional[str],
+    current: Optional[Dict[str, Any]] = None,
+    guessed: bool = False,
+) -> Dict[str, Any]:
+    """Build UpdateExpression / ConditionExpression for a PATCH.
+
+    When `normalized` changes the status, the update is conditioned on the
+    current status being `expected_status` and sets the `lastTransition`
+    summary (the transition itself is a history item, see history_item).
+    With `current` (the card as read), the update also requires the card to
+    be unchanged since that read, and drops its legacy `history` list.
+    With `guessed`, `current` was not read (see _guessed_card): the update
+    instead requires the status and closedReason it assumes, and no legacy
+    `history` list.
+    """
+    expr_names: Dict[str, str] = {}
+    expr_values: Dict[str, Any] = {":now": now}
+    set_parts = ["updatedAt = :now"]
+    remove_parts: List[str] = []
+
+    def _use_name(field: str) -> str:
+        placeholder = PATCH_NAME_MAP[field]
+        # Register only the placeholders that are actually referenced
+        expr_names[placeholder] = field
+        return placeholder
+
+    # Regular field updates
+    for field, value in normalized.items():
+        placeholder = f":{field}"
+        expr_values[placeholder] = value
+        set_parts.append(f"{_use_name(field)} = {placeholder}")
+
+    # Ensure the item exists
+    condition_expression = "attribute_exists(PK) AND attribute_exists(SK)"
+
+    new_status = normalized.get("status")
+    if new_status is not None:
+        # Keep the item in the right StatusIndex partition
+        expr_values[":gsi1pk"] = status_index_pk(pk, new_status)
+        set_parts.append(f"{_use_name('GSI1PK')} = :gsi1pk")
+
+        status_name = _use_name("status")
+        if expected_status is None:
+            condition_expression += f" AND attribute_not_exists({status_name})"
+        else:
+            expr_values[":expected_status"] = expected_status
+            condition_expression += f" AND {status_name} = :expected_status"
+
+        # Transition summary only if status changes
+        if new_status != expected_status:
+            expr_values[":transition"] = _transition(now, expected_status, new_status)
+            set_parts.append(f"{_use_name('lastTransition')} = :transition")
+
+    if current is not None and guessed:
+        if new_status is None:
+            expr_values[":expected_status"] = current["status"]
+            condition_expression += f" AND {_use_name('status')} = :expected_status"
+        if current["status"] == "CLOSED":
+            expr_values[":expected_reason"] = current["closedReason"]
+            condition_expression += f" AND {_use_name('closedReason')} = :expected_reason"
+        condition_expression += f" AND attribute_not_exists({_use_name('history')})"
+    elif current is not None:
+        condition_expression += " AND " + _version_condition(current, expr_names, expr_values)
+        if "history" in current:
+            remove_parts.append(_use_name("history"))
+
+    # Every write moves the item to a new version (ETag)
+    expr_values[":one"] = 1
+    update_expression = "SET " + ", ".join(set_parts)
+    if remove_parts:
+        update_expression += " REMOVE " + ", ".join(remove_parts)
+    update_expression += f" ADD {_use_name('version')} :one"
+
+    return {
+        "UpdateExpression": update_expression,
+        "ConditionExpression": condition_expression,
+        "ExpressionAttributeNames": expr_names,
+        "ExpressionAttributeValues": expr_values,
+    }
+
+
+def _transition(at: str, previous: Optional[str], status: str) -> Dict[str, Any]:
+    return {"at": at, "from": previous, "to": status}
+
+
+def history_item(pk: str, app_id: str, transition: Dict[str, Any], closed_reason: Optional[str] = None) -> Dict[str, Any]:
+    """History item recording one status transition of application `app_id`."""
+    item = {
+        "PK": pk,
+        "SK": f"{history_prefix(app_id)}{transition['at']}",
+        "applicationId": app_id,
+        **transition,
+    }
+    if transition["to"] == "CLOSED" and closed_reason:
+        item["closedReason"] = closed_reason
+    return item
+
+
+def creation_history_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """History item of the creation of card `item` (its first transition)."""
+    return history_item(item["PK"], item["applicationId"], item["lastTransition"])
+
+
+def tombstone_item(pk: str, app_id: str, now: str) -> Dict[str, Any]:
+    """Tombstone of deleted application `app_id`, for delta sync (expires through TTL)."""
+    return {
+        "PK": pk,
+        "SK": f"{TOMBSTONE_PREFIX}{app_id}",
+        "applicationId": app_id,
+        "deleted": True,
+        "GSI1PK": status_index_pk(pk, TOMBSTONE_STATUS),
+        "updatedAt": now,
+        TTL_ATTRIBUTE: int(datetime.fromisoformat(now).timestamp()) + TOMBSTONE_TTL_SECONDS,
+    }
+
+
+def _legacy_history_items(pk: str, app_id: str, current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """History items for the `history` list embedded in cards written before history items."""
+    entries = [e for e in current.get("history") or [] if isinstance(e, dict) and e.get("at") and e.get("to")]
+    items = {}
+    for entry in entries:
+        item = history_item(pk, app_id, _transition(entry["at"], entry.get("from"), entry["to"]), entry.get("closedReason"))
+        items[item["SK"]] = item
+    return list(items.values())
+
+
+def _migrate_legacy_history(pk: str, cards: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Write the embedded history of `cards` (id -> card as read) as history items.
+
+    Runs before the status change that drops the embedded list, with
+    BatchWriteItem since a list may not fit in the transaction. The puts are
+    idempotent, so a retried change writes them again harmlessly. Returns the
+    ids whose history could not be fully written: their change must not run.
+    """
+    requests = [
+        {"PutRequest": {"Item": item}}
+        for app_id, current in cards.items()
+        for item in _legacy_history_items(pk, app_id, current)
+    ]
+    failed = batch_write(requests) if requests else []
+    return list(dict.fromkeys(request["PutRequest"]["Item"]["applicationId"] for request in failed))
+
+
+def _patched_item(pk: str, current: Dict[str, Any], changes: Dict[str, Any], now: str) -> Dict[str, Any]:
+    """The card as the update built by _patch_update_kwargs leaves it."""
+    updated = dict(current, **changes, updatedAt=now)
+    updated["version"] = int(current.get("version") or 0) + 1
+    updated.pop("history", None)
+
+    new_status = changes.get("status")
+    if new_status is not None:
+        updated["GSI1PK"] = status_index_pk(pk, new_status)
+        if new_status != current.get("status"):
+            updated["lastTransition"] = _transition(now, current.get("status"), new_status)
+    return updated
+
+
+def _patch_writes(
+    pk: str,
+    app_id: str,
+    current: Dict[str, Any],
+    normalized: Dict[str, Any],
+    now: str,
+    guessed: bool = False,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, int]]:
+    """Writes of a status/closedReason PATCH of the card `current`.
+
+    Returns (updated card, transaction entries, stats delta). The card update
+    comes first in the entries, followed by its history item. An embedded
+    legacy history list is dropped by the update: it must have been written
+    out first (see _migrate_legacy_history). With `guessed`, `current` is
+    the assumption of _guessed_card and the update is conditioned on it.
+    """
+    changes = dict(normalized)
+    if changes.get("status") == "CLOSED" and current.get("status") != "CLOSED":
+        changes["closedAt"] = now
+    updated = _patched_item(pk, current, changes, now)
+
+    update_kwargs = _patch_update_kwargs(pk, changes, now, current.get("status"), current=current, guessed=guessed)
+    entries: List[Dict[str, Any]] = [
+        {
+            "Update": {
+                "Key": {"PK": pk, "SK": f"APP#{app_id}"},
+                "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+                **update_kwargs,
+            }
+        }
+    ]
+
+    if changes.get("status") not in (None, current.get("status")):
+        item = history_item(pk, app_id, updated["lastTransition"], updated.get("closedReason"))
+        entries.append({"Put": {"Item": item}})
+
+    return updated, entries, stats_delta(current, updated)
+
+
+# Attributes a status/closedReason PATCH answers with when the card it wrote
+# cannot be read back (see _patch_with_stats)
+PATCH_RESPONSE_FIELDS = ("status", "closedReason", "closedAt", "lastTransition", "updatedAt")
+
+
+def _guessed_card(pk: str, app_id: str, normalized: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """What a status/closedReason PATCH assumes the card holds, without reading it.
 
+    - a status change: the most likely previous status (cards start
+      IN_PROGRESS, and are mostly accepted or closed from there)
+    - a closedReason change alone: a card closed for the other reason
+
+    Closing needs createdAt for the time-to-close histogram (data.stats). It
+    never changes, so it is the one attribute read, without ConsistentRead.
+    Returns None when that read finds no card.
+    """
+    new_status = normalized.get("status")
+    if new_status is None:
+        other_reason = next(reason for reason in sorted(CLOSED_REASONS) if reason != normalized["closedReason"])
+        return {"status": "CLOSED", "closedReason": other_reason}
+
+    card: Dict[str, Any] = {"status": "ACCEPTED" if new_status == "IN_PROGRESS" else "IN_PROGRESS"}
+    if new_status == "CLOSED":
+        item = get_table().get_item(
+            Key={"PK": pk, "SK": f"APP#{app_id}"},
+            ProjectionExpression="createdAt",
+        ).get("Item")
+        if item is None:
+            return None
+        if item.get("createdAt"):
+            card["createdAt"] = item["createdAt"]
+    return card
+
+
+def _patch_with_stats(pk: str, app_id: str, normalized: Dict[str, Any]):
+    """PATCH touching status/closedReason: one transaction for the card, its
+    history item (on a status change) and the stats item.
+
+    The stats delta depends on what is stored (status, closedReason, dates).
+    Rather than reading the card first, the first attempt assumes its most
+    likely state (_guessed_card) and conditions the transaction on it. When
+    the guess is wrong or another writer got there first, the cancellation
+    carries the card as stored and the transaction is rebuilt from it,
+    conditioned on its version.
+
+    The response is the updated card with its ETag, as for a field PATCH.
+    A rebuilt transaction knows the whole card (from the cancellation); a
+    guess that held does not, and a transaction returns no attributes, so
+    the card is then read back (strongly consistent) after the write. If
+    that read fails, the write stands and the response holds the attributes
+    the PATCH set (PATCH_RESPONSE_FIELDS), without ETag.
+    """
+    sk = f"APP#{app_id}"
+    table = get_table()
+    try:
+        current = _guessed_card(pk, app_id, normalized)
+    except Exception:
+        logger.exception("Unexpected error during get_item")
+        return server_error("Failed to update application")
+    guessed = True
+
+    for _ in range(PATCH_MAX_ATTEMPTS):
+        if not current:
+            return not_found("Application not found")
+        if "history" in current and _migrate_legacy_history(pk, {app_id: current}):
+            return server_error("Failed to update application")
+
+        now = _now_iso()
+        updated, transaction, delta = _patch_writes(pk, app_id, current, normalized, now, guessed=guessed)
+        if delta:
+            transaction.append(stats_update(pk, delta, now))
+
+        try:
+            table.transact_write_items(transaction)
+        except ClientError as e:
+            retry, stored = _transaction_retry(e, current)
+            if retry:
+                # A failed condition returns the card as stored: exact from now on
+                guessed = guessed and stored is current
+                current = stored
+                continue
+            code = e.response.get("Error", {}).get("Code") or "ClientError"
+            logger.exception("DynamoDB transact_write_items failed: %s", code)
+            return server_error(f"DynamoDB update failed: {code}")
+        except Exception:
+            logger.exception("Unexpected error during transact_write_items")
+            return server_error("Failed to update application")
+
+        invalidate_partition(pk)
+        if guessed:
+            try:
+                stored = table.get_item(Key={"PK": pk, "SK": sk}, ConsistentRead=True).get("Item")
+            except Exception:
+                logger.exception("Unexpected error reading back %s", sk)
+                stored = None
+            if stored is None:
+                return json_response({"applicationId": app_id, **{field: updated[field] for field in PATCH_RESPONSE_FIELDS if field in updated}})
+            updated = stored
+        return json_response(updated, etag=item_etag(updated))
+
+    logger.warning("Status update for %s kept racing other writers", sk)
+    return conflict("Application was modified concurrently, please retry")
+
+
+def _normalize_patch(body: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate a PATCH payload and return the normalized changes.
+
+    Shared by PATCH /applications/{id} and POST /applications/batch-status.
+    Returns (normalized, error).
+    """
     if not isinstance(body, dict):
-        return bad_request("Body must be a JSON object")
+        return None, "Body must be a JSON object"
 
     allowed_fields = {
         "title",
@@ -157,27 +1127,27 @@ def patch_application(event: Dict[str, Any], app_id: str):
 
     unknown_fields = set(body.keys()) - allowed_fields
     if unknown_fields:
-        return bad_request(f"Unknown fields: {', '.join(sorted(unknown_fields))}")
+        return None, f"Unknown fields: {', '.join(sorted(unknown_fields))}"
 
     # Validate status / closedReason
     status = body.get("status")
     if status is not None:
         if not isinstance(status, str):
-            return bad_request("status must be a string")
+            return None, "status must be a string"
         status = status.strip()
-        if status not in {"IN_PROGRESS", "ACCEPTED", "CLOSED"}:
-            return bad_request("status must be IN_PROGRESS, ACCEPTED, or CLOSED")
+        if status not in STATUSES:
+            return None, "status must be IN_PROGRESS, ACCEPTED, or CLOSED"
 
     closed_reason = body.get("closedReason")
     if closed_reason is not None:
         if not isinstance(closed_reason, str):
-            return bad_request("closedReason must be a string")
+            return None, "closedReason must be a string"
         closed_reason = closed_reason.strip()
-        if closed_reason not in {"REFUSED", "ABANDONED"}:
-            return bad_request("closedReason must be REFUSED or ABANDONED")
+        if closed_reason not in CLOSED_REASONS:
+            return None, "closedReason must be REFUSED or ABANDONED"
 
     if status == "CLOSED" and not closed_reason:
-        return bad_request("closedReason is required when status is CLOSED")
+        return None, "closedReason is required when status is CLOSED"
 
     # Normalize simple string fields (strip)
     normalized: Dict[str, Any] = {}
@@ -189,7 +1159,7 @@ def patch_application(event: Dict[str, Any], app_id: str):
             elif isinstance(value, str):
                 normalized[field] = value.strip()
             else:
-                return bad_request(f"{field} must be a string")
+                return None, f"{field} must be a string"
 
     if status is not None:
         normalized["status"] = status
@@ -199,98 +1169,46 @@ def patch_application(event: Dict[str, Any], app_id: str):
 
     # Ensure we actually have something to update
     if not normalized:
-        return bad_request("No updatable fields provided")
-
-    pk = f"USER#{sub}"
-    sk = f"APP#{app_id}"
-
-    table = get_table()
-
-    # Load current item to detect status changes (simple and explicit for V1)
-    try:
-        current = table.get_item(Key={"PK": pk, "SK": sk}).get("Item")
-    except ClientError as e:
-        err = e.response.get("Error", {})
-        code = err.get("Code") or "ClientError"
-        msg = err.get("Message") or code
-        logger.exception("DynamoDB get_item failed: %s - %s", code, msg)
-        return server_error(f"DynamoDB read failed: {code}")
-    except Exception:
-        logger.exception("Unexpected error during get_item")
-        return server_error("Failed to read current application")
-
-    if not current:
-        return not_found("Application not found")
+        return None, "No updatable fields provided"
 
-    now = _now_iso()
+    return normalized, None
 
-    # Build UpdateExpression dynamically
-    expr_names: Dict[str, str] = {}
-    expr_values: Dict[str, Any] = {":now": now}
-    set_parts = ["updatedAt = :now"]
 
-    # Map safe attribute names
-    name_map = {
-        "title": "#title",
-        "company": "#company",
-        "location": "#location",
-        "appliedDate": "#appliedDate",
-        "jobUrl": "#jobUrl",
-        "mission": "#mission",
-        "notes": "#notes",
-        "contact": "#contact",
-        "status": "#status",
-        "closedReason": "#closedReason",
-        "history": "#history",
-    }
-
-    def _use_name(field: str) -> str:
-        placeholder = name_map[field]
-        # Register only the placeholders that are actually referenced
-        expr_names[placeholder] = field
-        return placeholder
+def patch_application(request: Request):
+    """PATCH /applications/{id} - Partially update an application.
 
-    # Regular field updates
-    for field, value in normalized.items():
-        placeholder = f":{field}"
-        expr_values[placeholder] = value
-        set_parts.append(f"{_use_name(field)} = {placeholder}")
+    V1 rules:
+    - Allowed fields: title, company, location, appliedDate, jobUrl, mission, notes, contact, status, closedReason
+    - status must be one of: IN_PROGRESS, ACCEPTED, CLOSED
+    - If status == CLOSED, closedReason must be one of: REFUSED, ABANDONED
+    - When status changes, a history item is written and lastTransition updated.
 
-    # History append only if status changes
-    new_status = normalized.get("status")
-    old_status = current.get("status")
-    if new_status is not None and new_status != old_status:
-        expr_values[":empty_list"] = []
-        expr_values[":history_event"] = [
-            {
-                "at": now,
-                "from": old_status,
-                "to": new_status,
-            }
-        ]
-        history_name = _use_name("history")
-        set_parts.append(
-            f"{history_name} = list_append(if_not_exists({history_name}, :empty_list), :history_event)"
-        )
+    Field edits are a single conditional UpdateItem. Changes to status or
+    closedReason also move the stats counters (see data.stats) and go
+    through _patch_with_stats.
+    """
+    app_id = request.path_params["id"]
+    normalized, error = _normalize_patch(request.body)
+    if error:
+        return bad_request(error)
 
-    update_expression = "SET " + ", ".join(set_parts)
+    pk = request.pk
+    sk = f"APP#{app_id}"
 
-    # Ensure the item exists (defensive)
-    # Use a plain string condition to avoid extra ExpressionAttributeNames placeholders.
-    condition_expression = "attribute_exists(PK) AND attribute_exists(SK)"
+    if "status" in normalized or "closedReason" in normalized:
+        return _patch_with_stats(pk, app_id, normalized)
 
     try:
-        response = table.update_item(
+        response = get_table().update_item(
             Key={"PK": pk, "SK": sk},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_values,
-            ConditionExpression=condition_expression,
             ReturnValues="ALL_NEW",
+            **_patch_update_kwargs(pk, normalized, _now_iso(), None),
         )
     except ClientError as e:
         err = e.response.get("Error", {})
         code = err.get("Code") or "ClientError"
+        if code == "ConditionalCheckFailedException":
+            return not_found("Application not found")
         msg = err.get("Message") or code
         logger.exception("DynamoDB update_item failed: %s - %s", code, msg)
         # Return only the code to the client (message stays in logs)
@@ -300,38 +1218,398 @@ def patch_application(event: Dict[str, Any], app_id: str):
         return server_error("Failed to update application")
 
     updated = response.get("Attributes") or {}
-    return json_response(updated)
+    invalidate_partition(pk)
+    return json_response(updated, etag=item_etag(updated))
+
+
+def _transition_chunks(
+    pk: str,
+    cards: Dict[str, Dict[str, Any]],
+    normalized: Dict[str, Any],
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Split `cards` (id -> card as read) into chunks whose writes fit one transaction.
+
+    Greedy, in order, with one slot of each transaction kept for the stats
+    update. A card takes one or two writes (its update, and a history item
+    when its status changes).
+    """
+    now = _now_iso()
+    chunks: List[Dict[str, Dict[str, Any]]] = [{}]
+    chunk_size = 0
+    for app_id, current in cards.items():
+        size = len(_patch_writes(pk, app_id, current, normalized, now)[1])
+        if chunks[-1] and chunk_size + size > TRANSACT_WRITE_SIZE - 1:
+            chunks.append({})
+            chunk_size = 0
+        chunks[-1][app_id] = current
+        chunk_size += size
+    return chunks
+
+
+def _transition_chunk(
+    pk: str,
+    cards: Dict[str, Dict[str, Any]],
+    normalized: Dict[str, Any],
+    results: Dict[str, Dict[str, Any]],
+) -> None:
+    """Apply `normalized` to `cards` (id -> card as read) in one TransactWriteItems.
+
+    The stats deltas of the cards are summed into a single stats update. A
+    transaction is all or nothing: when a card changed since it was read, its
+    current version comes back with the cancellation (or nothing, if it was
+    deleted) and the transaction is retried for the remaining cards. A
+    refreshed card can need a history item it did not before, so the retry
+    is split again when it no longer fits one transaction.
+    Per-card outcomes go into `results`.
+    """
+    table = get_table()
+
+    for attempt in range(PATCH_MAX_ATTEMPTS):
+        legacy = {app_id: current for app_id, current in cards.items() if "history" in current}
+        for app_id in _migrate_legacy_history(pk, legacy):
+            cards.pop(app_id)
+            results[app_id] = {"applicationId": app_id, "ok": False, "error": "Update failed"}
+        if not cards:
+            return
+        if attempt:
+            chunks = _transition_chunks(pk, cards, normalized)
+            if len(chunks) > 1:
+                for chunk in chunks:
+                    _transition_chunk(pk, chunk, normalized, results)
+                return
+
+        now = _now_iso()
+        transaction: List[Dict[str, Any]] = []
+        owners: List[Optional[str]] = []
+        delta: Dict[str, int] = {}
+        updated_cards: Dict[str, Dict[str, Any]] = {}
+        for app_id, current in cards.items():
+            updated, entries, card_delta = _patch_writes(pk, app_id, current, normalized, now)
+            transaction.extend(entries)
+            owners.extend([app_id] * len(entries))
+            for name, value in card_delta.items():
+                delta[name] = delta.get(name, 0) + value
+            updated_cards[app_id] = updated
+
+        delta = {name: value for name, value in delta.items() if value}
+        if delta:
+            transaction.append(stats_update(pk, delta, now))
+            owners.append(None)
+
+        try:
+            table.transact_write_items(transaction)
+        except ClientError as e:
+            reasons = cancellation_reasons(e)
+            if not reasons:
+                logger.exception("DynamoDB transact_write_items failed")
+                break
+            for owner, reason in zip(owners, reasons):
+                if owner is None or reason.get("Code") != "ConditionalCheckFailed":
+                    continue
+                if reason.get("Item"):
+                    cards[owner] = reason["Item"]
+                else:
+                    cards.pop(owner, None)
+                    results[owner] = {"applicationId": owner, "ok": False, "error": "Application not found"}
+            continue
+        except Exception:
+            logger.exception("Unexpected error during transact_write_items")
+            break
+
+        for app_id, updated in updated_cards.items():
+            results[app_id] = {
+                "applicationId": app_id,
+                "ok": True,
+                "status": updated.get("status"),
+                "version": updated.get("version"),
+            }
+        return
+
+    for app_id in cards:
+        results[app_id] = {"applicationId": app_id, "ok": False, "error": "Update failed"}
 
 
+def batch_transition_applications(request: Request):
+    """POST /applications/batch-status - Move many applications to one status.
 
-def delete_application(event: Dict[str, Any], app_id: str):
-    """DELETE /applications/{id} - Delete an application for the authenticated user."""
-    sub = get_sub(event)
-    if not sub:
-        return unauthorized()
+    Body: {"ids": ["...", ...], "status": "CLOSED", "closedReason": "ABANDONED"}
+    Same rules as PATCH /applications/{id} for status and closedReason, and
+    the same writes per card (history item, lastTransition, stats), applied
+    with TransactWriteItems in chunks of up to TRANSACT_WRITE_SIZE items.
+    The cards are read first with one BatchGetItem per 100 ids.
 
-    pk = f"USER#{sub}"
+    The response reports the outcome of every id, in request order.
+    Status: 200 when every card was updated, 207 otherwise.
+    """
+    body = request.body
+    ids, error = _parse_id_list(body)
+    if error:
+        return bad_request(error)
+
+    changes = {field: value for field, value in body.items() if field != "ids"}
+    if set(changes) - {"status", "closedReason"}:
+        return bad_request("Only status and closedReason can be changed in bulk")
+    normalized, error = _normalize_patch(changes)
+    if error:
+        return bad_request(error)
+
+    pk = request.pk
+    try:
+        cards, unread = batch_get(
+            [{"PK": pk, "SK": f"APP#{app_id}"} for app_id in ids],
+            ConsistentRead=True,
+            **projection(("applicationId",) + STATS_SOURCE_FIELDS),
+        )
+    except Exception:
+        logger.exception("BatchGetItem failed")
+        return server_error("Failed to update applications")
+
+    current_by_id = {card["applicationId"]: card for card in cards}
+    results: Dict[str, Dict[str, Any]] = {}
+    for key in unread:
+        app_id = key["SK"][len("APP#"):]
+        results[app_id] = {"applicationId": app_id, "ok": False, "error": "Read failed"}
+
+    found: Dict[str, Dict[str, Any]] = {}
+    for app_id in ids:
+        if app_id in current_by_id:
+            found[app_id] = current_by_id[app_id]
+        else:
+            results.setdefault(app_id, {"applicationId": app_id, "ok": False, "error": "Application not found"})
+    for chunk in _transition_chunks(pk, found, normalized):
+        _transition_chunk(pk, chunk, normalized, results)
+
+    updated = sum(1 for result in results.values() if result["ok"])
+    if updated:
+        invalidate_partition(pk)
+
+    failed = len(ids) - updated
+    return json_response(
+        {
+            "updated": updated,
+            "failed": failed,
+            "results": [results[app_id] for app_id in ids],
+        },
+        status=200 if failed == 0 else 207,
+    )
+
+
+DELETE_MAX_ATTEMPTS = 3
+
+
+def delete_application(request: Request):
+    """DELETE /applications/{id} - Delete an application for the authenticated user.
+
+    The card is deleted in the same transaction as the stats update it
+    implies and its delta sync tombstone. The card is not read: the first
+    attempt assumes it is IN_PROGRESS (the stats delta of any other card
+    differs) and is conditioned on that status. When it is not, or another
+    writer got there first, the cancellation carries the card as stored and
+    the delete is retried from it, conditioned on its version.
+    """
+    app_id = request.path_params["id"]
+    pk = request.pk
     sk = f"APP#{app_id}"
 
     table = get_table()
+    current: Optional[Dict[str, Any]] = {"status": "IN_PROGRESS"}
+    guessed = True
+
+    for _ in range(DELETE_MAX_ATTEMPTS):
+        if not current:
+            return not_found("Application not found")
+
+        names: Dict[str, str] = {}
+        values: Dict[str, Any] = {}
+        if guessed:
+            names["#status"] = "status"
+            values[":expected_status"] = current["status"]
+            condition = "#status = :expected_status"
+        else:
+            condition = _version_condition(current, names, values)
+        delete: Dict[str, Any] = {
+            "Key": {"PK": pk, "SK": sk},
+            "ConditionExpression": "attribute_exists(PK) AND " + condition,
+            "ExpressionAttributeNames": names,
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+        }
+        if values:
+            delete["ExpressionAttributeValues"] = values
+
+        now = _now_iso()
+        try:
+            table.transact_write_items(
+                [
+                    {"Delete": delete},
+                    {"Put": {"Item": tombstone_item(pk, app_id, now)}},
+                    stats_update(pk, stats_delta(current, None), now),
+                ]
+            )
+        except ClientError as e:
+            retry, stored = _transaction_retry(e, current)
+            if retry:
+                guessed = guessed and stored is current
+                current = stored
+                continue
+            code = e.response.get("Error", {}).get("Code") or "ClientError"
+            logger.exception("DynamoDB transact_write_items failed: %s", code)
+            return server_error("Failed to delete application")
+        except Exception:
+            logger.exception("Unexpected error during transact_write_items")
+            return server_error("Failed to delete application")
+
+        invalidate_partition(pk)
+        return json_response(
+            {
+                "deleted": True,
+                "applicationId": app_id,
+            }
+        )
+
+    logger.warning("Delete of %s kept racing other writers", sk)
+    return conflict("Application was modified concurrently, please retry")
+
+
+def _parse_id_list(body: Any) -> Tuple[Optional[List[str]], Optional[str]]:
+    """Validate {"ids": [...]} and return the de-duplicated ids in request order."""
+    if not isinstance(body, dict):
+        return None, "Body must be a JSON object"
+
+    ids = body.get("ids")
+    if not isinstance(ids, list) or not ids:
+        return None, "ids must be a non-empty array"
+    if not all(isinstance(app_id, str) and app_id.strip() for app_id in ids):
+        return None, "ids must be non-empty strings"
 
-    # Ensure the item exists before deleting (clearer error semantics)
+    unique = list(dict.fromkeys(app_id.strip() for app_id in ids))
+    if len(unique) > MAX_BATCH_ITEMS:
+        return None, f"At most {MAX_BATCH_ITEMS} ids per request"
+    return unique, None
+
+
+def get_applications_by_id(pk: str, ids: List[str], raw_fields: Optional[str]):
+    """Read the cards `ids` of `pk` with BatchGetItem (100 keys per call, retried).
+
+    Results follow the order of `ids`, one per id: {"applicationId", "found",
+    "item"}. Unknown ids have found=false; ids whose read still failed after
+    the retries carry an error and make the status 207.
+    """
+    fields, fields_error = parse_fields(raw_fields)
+    if fields_error:
+        return bad_request(fields_error)
+
+    projection_kwargs = projection(fields) if fields is not None else {}
     try:
-        current = table.get_item(Key={"PK": pk, "SK": sk}).get("Item")
+        items, failed = batch_get([{"PK": pk, "SK": f"APP#{app_id}"} for app_id in ids], **projection_kwargs)
     except Exception:
-        return server_error("Failed to read application before delete")
+        logger.exception("BatchGetItem failed")
+        return server_error("Failed to get applications")
 
-    if not current:
-        return not_found("Application not found")
+    by_id = {item["applicationId"]: item for item in items}
+    failed_ids = {key["SK"][len("APP#"):] for key in failed}
 
+    results: List[Dict[str, Any]] = []
+    for app_id in ids:
+        if app_id in by_id:
+            results.append({"applicationId": app_id, "found": True, "item": by_id[app_id]})
+        elif app_id in failed_ids:
+            results.append({"applicationId": app_id, "found": False, "error": "Read failed"})
+        else:
+            results.append({"applicationId": app_id, "found": False, "item": None})
+
+    return json_response(
+        {
+            "results": results,
+            "found": len(by_id),
+            "missing": len(ids) - len(by_id) - len(failed_ids),
+            "failed": len(failed_ids),
+        },
+        status=200 if not failed_ids else 207,
+    )
+
+
+def batch_get_applications(request: Request):
+    """POST /applications/batch-get - Same as GET /applications?ids=, for long id lists.
+
+    Body: {"ids": ["...", ...], "fields": "card" | "all" | "a,b,c"}
+    """
+    ids, error = _parse_id_list(request.body)
+    if error:
+        return bad_request(error)
+
+    fields = request.body.get("fields")
+    if fields is not None and not isinstance(fields, str):
+        return bad_request("fields must be a string")
+    return get_applications_by_id(request.pk, ids, fields)
+
+
+def batch_delete_applications(request: Request):
+    """POST /applications/batch-delete - Delete many applications in one call.
+
+    Body: {"ids": ["...", ...]}
+    BatchWriteItem deletes are unconditional, so the ids are first resolved
+    with a strongly consistent BatchGetItem (100 keys per call, keys only,
+    so a card created just before is found): unknown ids are reported
+    as not found and nothing is written for them. The others are deleted
+    through BatchWriteItem (25 per call, retried with backoff), along with
+    their delta sync tombstones.
+
+    Status: 200 unless some reads or deletes could not be applied (207).
+    """
+    ids, error = _parse_id_list(request.body)
+    if error:
+        return bad_request(error)
+
+    pk = request.pk
     try:
-        table.delete_item(Key={"PK": pk, "SK": sk})
+        found, unread = batch_get(
+            [{"PK": pk, "SK": f"APP#{app_id}"} for app_id in ids],
+            ConsistentRead=True,
+            ProjectionExpression="SK",
+        )
     except Exception:
-        return server_error("Failed to delete application")
+        logger.exception("BatchGetItem failed")
+        return server_error("Failed to delete applications")
+
+    existing = {item["SK"] for item in found}
+    unread_sks = {key["SK"] for key in unread}
 
+    now = _now_iso()
+    requests: List[Dict[str, Any]] = []
+    for app_id in ids:
+        if f"APP#{app_id}" in existing:
+            requests.append({"DeleteRequest": {"Key": {"PK": pk, "SK": f"APP#{app_id}"}}})
+            requests.append({"PutRequest": {"Item": tombstone_item(pk, app_id, now)}})
+    failed = batch_write(requests)
+    failed_sks = {request["DeleteRequest"]["Key"]["SK"] for request in failed if "DeleteRequest" in request}
+    if len(failed_sks) < len(failed):
+        logger.warning("%d tombstones not written for %s", len(failed) - len(failed_sks), pk)
+    if existing - failed_sks:
+        # The deleted cards were not read in full, so their counters are unknown
+        mark_stats_stale(pk)
+        invalidate_partition(pk)
+
+    results: List[Dict[str, Any]] = []
+    for app_id in ids:
+        sk = f"APP#{app_id}"
+        if sk in unread_sks:
+            results.append({"applicationId": app_id, "deleted": False, "error": "Read failed"})
+        elif sk not in existing:
+            results.append({"applicationId": app_id, "deleted": False, "error": "Application not found"})
+        elif sk in failed_sks:
+            results.append({"applicationId": app_id, "deleted": False, "error": "Delete failed"})
+        else:
+            results.append({"applicationId": app_id, "deleted": True})
+
+    deleted = sum(1 for result in results if result["deleted"])
+    not_found_count = len(ids) - len(existing) - len(unread_sks)
+    failed_count = len(ids) - deleted - not_found_count
     return json_response(
         {
-            "deleted": True,
-            "applicationId": app_id,
-        }
-    )
\ No newline at end of file
+            "deleted": deleted,
+            "notFound": not_found_count,
+            "failed": failed_count,
+            "results": results,
+        },
+        status=200 if not failed_count else 207,
+    )
@@ -0,0 +1,92 @@
+"""GET /dashboard: everything the board needs on load, in one request.
+
+The card list, the stats and the recent activity are independent reads, so
+they run concurrently (data.dynamo.fan_out) on the shared client: the route
+takes as long as the slowest of them, not their sum.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.cursor import encode_cursor
+from core.params import MAX_PAGE_SIZE, parse_fields, parse_limit, projection
+from core.response import bad_request, json_response, server_error
+from core.router import Request
+from data.dynamo import fan_out, get_table
+from data.recent import CARD_STATUSES, query_merged, start_cursor
+from data.stats import load_stats, summarize
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Most recently updated cards shown in the activity feed
+RECENT_ACTIVITY_LIMIT = 10
+
+RECENT_FIELDS = ("applicationId", "title", "company", "status", "lastTransition", "updatedAt")
+
+
+def _cards_page(pk: str, fields: Optional[Tuple[str, ...]], limit: int) -> Dict[str, Any]:
+    """First page of GET /applications; its cursor continues there."""
+    query_kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": "PK = :pk AND begins_with(SK, :app_prefix)",
+        "ExpressionAttributeValues": {":pk": pk, ":app_prefix": "APP#"},
+        "Limit": limit,
+    }
+    if fields is not None:
+        query_kwargs.update(projection(fields))
+
+    response = get_table().query(**query_kwargs)
+    last_key = response.get("LastEvaluatedKey")
+    return {
+        "items": response.get("Items", []),
+        "nextCursor": encode_cursor(last_key, pk, scope="") if last_key else None,
+    }
+
+
+def _recent_activity(pk: str) -> List[Dict[str, Any]]:
+    """Most recently updated cards, newest first (merged from StatusIndex, see data.recent)."""
+    items, _ = query_merged(
+        start_cursor(pk, CARD_STATUSES),
+        forward=False,
+        limit=RECENT_ACTIVITY_LIMIT,
+        fields=RECENT_FIELDS,
+    )
+    return items
+
+
+def get_dashboard(request: Request):
+    """GET /dashboard - Cards, stats and recent activity in one payload.
+
+    Query params:
+    - limit, fields: as GET /applications, for the first page of cards
+
+    Response: {"applications": {"items", "nextCursor"}, "stats", "recent"}.
+    Further card pages come from GET /applications?cursor= with the same
+    limit and fields.
+    """
+    pk = request.pk
+    params = request.params
+
+    limit = parse_limit(params.get("limit"))
+    if limit is None:
+        return bad_request(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+
+    fields, fields_error = parse_fields(params.get("fields"))
+    if fields_error:
+        return bad_request(fields_error)
+
+    try:
+        payload = fan_out(
+            {
+                "applications": lambda: _cards_page(pk, fields, limit),
+                "stats": lambda: summarize(load_stats(pk)),
+                "recent": lambda: _recent_activity(pk),
+            }
+        )
+    except Exception:
+        logger.exception("Failed to load dashboard")
+        return server_error("Failed to load dashboard")
+
+    return json_response(payload)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from core.params import LISTABLE_FIELDS, projection
+from core.response import json_response, server_error
+from core.router import Request
+from data.dynamo import HISTORY_PREFIX, iter_query
+from data.exports import ExportNotConfigured, export_items
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+HISTORY_FIELDS = ("at", "from", "to", "closedReason")
+
+
+def _with_history(cards: Iterator[Dict[str, Any]], history: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Attach its history items to each card, as a `history` list.
+
+    Both iterators come sorted by application id (APP#{id} and
+    HIST#{id}#{at} ranges), so this is a merge: one pass over each, holding
+    one card's history at a time.
+    """
+
+    def _app_id(entry: Optional[Dict[str, Any]]) -> Optional[str]:
+        return entry["applicationId"] if entry else None
+
+    pending = next(history, None)
+    for card in cards:
+        app_id = card["applicationId"]
+        # Cards written before history items still embed their list
+        transitions = list(card.get("history") or [])
+
+        # History left behind by a deleted card (cleaned up asynchronously)
+        while pending is not None and _app_id(pending) < app_id:
+            pending = next(history, None)
+        while pending is not None and _app_id(pending) == app_id:
+            transitions.append({field: pending[field] for field in HISTORY_FIELDS if field in pending})
+            pending = next(history, None)
+
+        card["history"] = transitions
+        yield card
+
+
+def export_applications(request: Request):
+    """POST /applications/export - Export every application (history included).
+
+    The cards and the history items are read page by page and merged into a
+    gzip NDJSON archive (see _with_history), so memory use does not grow with
+    the number of applications. The response only carries a download URL,
+    never the archive itself.
+
+    Cards are read with the fields a client can list (LISTABLE_FIELDS): the
+    table keys (PK, SK, GSI1PK) stay out of the file.
+    """
+    sub = request.sub
+    pk = request.pk
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    key = f"exports/{sub}/applications-{stamp}-{uuid.uuid4().hex[:8]}.ndjson.gz"
+
+    cards = iter_query(
+        KeyConditionExpression="PK = :pk AND begins_with(SK, :app_prefix)",
+        ExpressionAttributeValues={":pk": pk, ":app_prefix": "APP#"},
+        **projection(LISTABLE_FIELDS),
+    )
+    history = iter_query(
+        KeyConditionExpression="PK = :pk AND begins_with(SK, :history_prefix)",
+        ExpressionAttributeValues={":pk": pk, ":history_prefix": HISTORY_PREFIX},
+        **projection(("applicationId",) + HISTORY_FIELDS),
+    )
+    items = _with_history(cards, history)
+
+    try:
+        url, count, expires_in = export_items(key, items)
+    except ExportNotConfigured:
+        logger.error("Export requested but no export sink is configured")
+        return server_error("Export is not configured", code="EXPORT_NOT_CONFIGURED")
+    except Exception:
+        logger.exception("Export failed")
+        return server_error("Failed to export applications")
+
+    return json_response(
+        {
+            "url": url,
+            "count": count,
+            "format": "ndjson+gzip",
+            "expiresIn": expires_in,
+        },
+        status=201,
+    )
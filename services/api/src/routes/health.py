@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from core.response import json_response
+from core.router import Request
+from data.cache import cache_stats
+
+
+def health(request: Request):
+    """GET /health - Liveness probe (no DynamoDB call)."""
+    return json_response({"ok": True, "message": "Backend alive", "cache": cache_stats()})
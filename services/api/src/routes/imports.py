@@ -0,0 +1,227 @@
+"""Bulk import of applications from CSV or NDJSON.
+
+POST /applications/import
+
+The body is parsed lazily: rows are yielded one at a time by a generator and
+fed straight into a BufferedBatchWriter, so the parsed file never exists as a
+list and memory stays flat whatever the number of rows. Throughput is bounded
+by DynamoDB write capacity (25 items per BatchWriteItem), not by per-request
+overhead.
+
+Rows are written as they are parsed, so a body that cannot be read to the
+end (malformed CSV, invalid UTF-8) stops the import at the failing line with
+the rows before it already imported: the response reports both.
+"""
+
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from core.middleware import raw_body
+from core.request import get_header
+from core.response import bad_request, json_loads, json_response, server_error
+from core.router import Request
+from data.cache import invalidate_partition
+from data.dynamo import BufferedBatchWriter
+from data.stats import apply_stats_delta, created_delta, mark_stats_stale
+from routes.applications import build_application_item, creation_history_item
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Only the first errors are echoed back, the counters stay exact
+MAX_REPORTED_ERRORS = 100
+
+# Spreadsheet column name (normalized) -> create payload field
+CSV_COLUMNS = {
+    "title": "title",
+    "jobtitle": "title",
+    "poste": "title",
+    "company": "company",
+    "entreprise": "company",
+    "location": "location",
+    "lieu": "location",
+    "applieddate": "appliedDate",
+    "date": "appliedDate",
+    "joburl": "jobUrl",
+    "url": "jobUrl",
+    "lien": "jobUrl",
+    "mission": "mission",
+    "notes": "notes",
+    "contact": "contact",
+}
+
+
+class UnreadableBody(ValueError):
+    """Raised by the record iterators when the body cannot be parsed from `line` on."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(message)
+        self.line = line
+
+
+def _normalize_column(name: str) -> str:
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+def iter_csv_records(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    """Yield (line_number, payload) for each CSV data row.
+
+    The header row maps columns onto create payload fields; unknown columns
+    are ignored.
+    """
+    reader = csv.reader(stream)
+    try:
+        header = next(reader, None)
+        if header is None:
+            return
+
+        columns = [CSV_COLUMNS.get(_normalize_column(name)) for name in header]
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            payload = {field: value for field, value in zip(columns, row) if field}
+            yield reader.line_num, payload
+    except csv.Error as e:
+        # line_num already counts the line being parsed
+        raise UnreadableBody(max(reader.line_num, 1), str(e)) from e
+    except UnicodeDecodeError as e:
+        raise UnreadableBody(reader.line_num + 1, str(e)) from e
+
+
+def iter_ndjson_records(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    """Yield (line_number, payload) for each non-empty NDJSON line.
+
+    Lines that are not valid JSON are yielded as None so the caller can report them.
+    """
+    line_number = 0
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json_loads(line)
+            except json.JSONDecodeError:
+                yield line_number, None
+    except UnicodeDecodeError as e:
+        raise UnreadableBody(line_number + 1, str(e)) from e
+
+
+def _detect_format(request: Request) -> Optional[str]:
+    fmt = (request.params.get("format") or "").lower()
+    if fmt in {"csv", "ndjson"}:
+        return fmt
+    if fmt:
+        return None
+
+    content_type = (get_header(request.event, "content-type") or "").lower()
+    if "csv" in content_type:
+        return "csv"
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    return None
+
+
+def _body_stream(request: Request) -> TextIO:
+    event = request.event
+    if event.get("isBase64Encoded"):
+        return io.TextIOWrapper(io.BytesIO(base64.b64decode(event.get("body") or "")), encoding="utf-8-sig", newline="")
+    return io.StringIO(raw_body(request).lstrip("\ufeff"), newline="")
+
+
+def _account_imported(pk: str, imported: int, exact: bool) -> None:
+    """Bring the stats and the cache in line with the cards written."""
+    if not exact:
+        mark_stats_stale(pk)
+    elif imported:
+        apply_stats_delta(pk, created_delta(imported))
+    invalidate_partition(pk)
+
+
+def import_applications(request: Request):
+    """POST /applications/import - Import applications from a CSV or NDJSON body.
+
+    The format comes from `?format=csv|ndjson` or the Content-Type header.
+    Every record goes through the same validation as POST /applications.
+
+    Status: 201 when every record was imported, 207 when some failed or the
+    body could not be read to the end (`stoppedAtLine`, the rows before it
+    are imported). A body that fails before any row was written gets a 400
+    (unreadable) or 500.
+    """
+    fmt = _detect_format(request)
+    if fmt is None:
+        return bad_request("format must be csv or ndjson (query parameter or Content-Type)")
+
+    try:
+        stream = _body_stream(request)
+    except ValueError:
+        return bad_request("Invalid base64 body")
+
+    records = iter_csv_records(stream) if fmt == "csv" else iter_ndjson_records(stream)
+
+    pk = request.pk
+    errors: List[Dict[str, Any]] = []
+    invalid = 0
+    queued = 0
+    last_line: Optional[int] = None
+    # Where and why the import stopped before the end of the body
+    stopped: Optional[Dict[str, Any]] = None
+    unexpected = False
+
+    writer = BufferedBatchWriter()
+    try:
+        # Exiting the writer flushes the rows parsed so far, error or not
+        with writer:
+            for last_line, payload in records:
+                if payload is None:
+                    item, error = None, "Invalid JSON line"
+                else:
+                    item, error = build_application_item(pk, payload)
+                if error:
+                    invalid += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"line": last_line, "error": error})
+                    continue
+                writer.put(item, tag=last_line)
+                queued += 1
+                # Untagged: a lost history item does not fail the line
+                writer.put(creation_history_item(item))
+    except UnreadableBody as e:
+        stopped = {"line": e.line, "error": f"Could not parse {fmt} body: {e}"}
+    except Exception:
+        logger.exception("Unexpected error during import")
+        unexpected = True
+        stopped = {"line": last_line, "error": "Import interrupted"}
+    finally:
+        failed_lines = [line_number for line_number in writer.failed if line_number is not None]
+        # After an unexpected error, what reached the table is not known exactly
+        _account_imported(pk, queued - len(failed_lines), exact=not unexpected)
+
+    if stopped is not None and not queued:
+        if unexpected:
+            return server_error("Failed to import applications")
+        return bad_request(f"{stopped['error']} (line {stopped['line']})")
+
+    if len(failed_lines) < len(writer.failed):
+        logger.warning("%d creation history items not written for %s", len(writer.failed) - len(failed_lines), pk)
+
+    for line_number in failed_lines:
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line_number, "error": "Write failed"})
+
+    failed = invalid + len(failed_lines)
+    body: Dict[str, Any] = {
+        "imported": queued - len(failed_lines),
+        "failed": failed,
+        "errors": errors,
+    }
+    if stopped is not None:
+        body["stoppedAtLine"] = stopped["line"]
+        body["errors"].append(stopped)
+    return json_response(body, status=201 if failed == 0 and stopped is None else 207)
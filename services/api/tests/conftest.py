@@ -0,0 +1,197 @@
+"""Fixtures of the API tests: the Lambda handler over each storage engine.
+
+`api` drives app.handler with HTTP API v2 events (benchmarks/events.py)
+against a fresh table of the engine under test:
+- memory, sqlite: the local engines (data.local_table)
+- moto: ClientTable over moto's DynamoDB. The stream consumer is fed from
+  moto's DynamoDB Streams after every request, as the local engines do on
+  every write, so derived items (search index, history cleanup) are there
+  for the next request on all engines.
+
+Run from services/api: python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR / "src"))
+sys.path.insert(0, str(API_DIR / "benchmarks"))
+
+# Read at import time by data.cache: the tests check the table, not the cache
+os.environ.setdefault("CACHE_TTL_SECONDS", "0")
+
+import app  # noqa: E402
+import indexer  # noqa: E402
+from core import cursor  # noqa: E402
+from data import dynamo  # noqa: E402
+from data.cache import cache  # noqa: E402
+from events import http_event  # noqa: E402
+
+ENGINES = ("memory", "sqlite", "moto")
+
+TABLE_NAME = "jobtracker-test"
+REGION = "eu-west-3"
+
+
+class Response(NamedTuple):
+    status: int
+    body: Any
+    headers: Dict[str, str]
+
+
+def _decode_body(response: Dict[str, Any]) -> Any:
+    raw = response.get("body")
+    if not raw:
+        return None
+    if response.get("isBase64Encoded"):
+        data = base64.b64decode(raw)
+        coding = (response.get("headers") or {}).get("content-encoding")
+        if coding == "gzip":
+            raw = gzip.decompress(data)
+        else:
+            import brotli
+
+            raw = brotli.decompress(data)
+    return json.loads(raw)
+
+
+def create_table(client) -> None:
+    """Mirrors infra/stacks/backend_stack.py (table, StatusIndex, stream)."""
+    client.create_table(
+        TableName=TABLE_NAME,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+            {"AttributeName": "GSI1PK", "AttributeType": "S"},
+            {"AttributeName": "updatedAt", "AttributeType": "S"},
+        ],
+        KeySchema=[
+            {"AttributeName": "PK", "KeyType": "HASH"},
+            {"AttributeName": "SK", "KeyType": "RANGE"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": dynamo.STATUS_INDEX,
+                "KeySchema": [
+                    {"AttributeName": "GSI1PK", "KeyType": "HASH"},
+                    {"AttributeName": "updatedAt", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
+        StreamSpecification={"StreamEnabled": True, "StreamViewType": "NEW_AND_OLD_IMAGES"},
+    )
+
+
+class MotoStream:
+    """Reads moto's DynamoDB stream of the table and hands it to indexer.handler.
+
+    moto rolls a cancelled transaction back by swapping in a copy of the
+    table, stream included, so every drain takes fresh shard iterators,
+    after the last sequence number read.
+    """
+
+    def __init__(self, dynamodb_client, streams_client) -> None:
+        self._streams = streams_client
+        self._arn = dynamodb_client.describe_table(TableName=TABLE_NAME)["Table"]["LatestStreamArn"]
+        self._last_sequence: Dict[str, str] = {}
+
+    def _iterator(self, shard_id: str) -> str:
+        position: Dict[str, Any] = {"ShardIteratorType": "TRIM_HORIZON"}
+        if shard_id in self._last_sequence:
+            position = {"ShardIteratorType": "AFTER_SEQUENCE_NUMBER", "SequenceNumber": self._last_sequence[shard_id]}
+        return self._streams.get_shard_iterator(StreamArn=self._arn, ShardId=shard_id, **position)["ShardIterator"]
+
+    def drain(self) -> None:
+        records = []
+        for shard in self._streams.describe_stream(StreamArn=self._arn)["StreamDescription"]["Shards"]:
+            shard_records = self._streams.get_records(ShardIterator=self._iterator(shard["ShardId"]))["Records"]
+            if shard_records:
+                self._last_sequence[shard["ShardId"]] = shard_records[-1]["dynamodb"]["SequenceNumber"]
+            records.extend(shard_records)
+
+        # The event source filter of the stack: application items only
+        records = [record for record in records if record["dynamodb"]["Keys"]["SK"]["S"].startswith("APP#")]
+        if records:
+            indexer.handler({"Records": records}, None)
+
+
+class Api:
+    """The handler of one engine, called route by route."""
+
+    def __init__(self, engine: str, stream: Optional[MotoStream] = None) -> None:
+        self.engine = engine
+        self._stream = stream
+
+    @property
+    def table(self):
+        return dynamo.get_table()
+
+    def call(
+        self,
+        route: str,
+        *,
+        sub: str = "user-1",
+        path_params: Optional[Dict[str, str]] = None,
+        query: Optional[Dict[str, str]] = None,
+        body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        event = http_event(
+            route,
+            sub,
+            path_params=path_params,
+            query=query,
+            body=body,
+            headers={"accept-encoding": "identity", **(headers or {})},
+        )
+        # The handler prints one EMF metrics line per request
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = app.handler(event, None)
+        if self._stream is not None:
+            self._stream.drain()
+        return Response(response["statusCode"], _decode_body(response), response.get("headers") or {})
+
+
+@pytest.fixture(params=ENGINES)
+def api(request, monkeypatch, tmp_path):
+    engine = request.param
+    monkeypatch.setenv("TABLE_NAME", TABLE_NAME)
+    monkeypatch.setenv("CURSOR_SECRET", "test-cursor-secret")
+    monkeypatch.setenv("STORAGE_ENGINE", "dynamodb" if engine == "moto" else engine)
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "jobtracker.sqlite3"))
+    monkeypatch.setattr(dynamo, "_table", None)
+    monkeypatch.setattr(dynamo, "_client", None)
+    monkeypatch.setattr(cursor, "_key", None)
+    cache.clear()
+
+    if engine != "moto":
+        yield Api(engine)
+        return
+
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    for name, value in {
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_SESSION_TOKEN": "testing",
+        "AWS_DEFAULT_REGION": REGION,
+    }.items():
+        monkeypatch.setenv(name, value)
+    with moto.mock_aws():
+        client = boto3.client("dynamodb", region_name=REGION)
+        create_table(client)
+        yield Api(engine, MotoStream(client, boto3.client("dynamodbstreams", region_name=REGION)))
@@ -0,0 +1,45 @@
+"""What `import app` (the Lambda init phase) loads.
+
+Its duration is checked against the committed budget by
+benchmarks/bench_coldstart.py; this pins the modules that must stay off
+the cold path, whatever the machine.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Loaded on first use only: the SDK's resource layer, the lazily routed
+# import/export, and the local storage engines
+COLD_MODULES = ("boto3", "routes.imports", "routes.exports", "data.local_table", "data.sqlite_store", "sqlite3")
+
+
+def _modules_loaded_by_import() -> set:
+    env = {
+        **os.environ,
+        "AWS_DEFAULT_REGION": "eu-west-3",
+        "TABLE_NAME": "coldstart-test",
+        "PYTHONPATH": str(SRC_DIR),
+    }
+    env.pop("STORAGE_ENGINE", None)
+    out = subprocess.run(
+        [sys.executable, "-c", "import json, sys, app; print(json.dumps(sorted(sys.modules)))"],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(out.stdout.splitlines()[-1]))
+
+
+def test_import_leaves_optional_modules_cold():
+    loaded = _modules_loaded_by_import()
+    assert "routes.applications" in loaded
+    assert [module for module in COLD_MODULES if module in loaded] == []
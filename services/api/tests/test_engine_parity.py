@@ -0,0 +1,330 @@
+"""The same route-level flows against every storage engine (see conftest.api).
+
+The local engines emulate DynamoDB (data.local_table); these flows pin the
+behaviour the routes rely on so the emulation cannot drift from what moto,
+and DynamoDB, do: conditional failures, transaction cancellation reasons,
+StatusIndex paging, and the stream and TTL side effects.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime
+from urllib.parse import urlparse
+
+import pytest
+from botocore.exceptions import ClientError
+
+from data.dynamo import (
+    STATUS_INDEX,
+    TOMBSTONE_TTL_SECONDS,
+    cancellation_reasons,
+    history_prefix,
+    iter_query,
+    status_index_pk,
+)
+
+PK = "USER#user-1"
+
+
+def _create(api, title="Backend Engineer", company="Qonto", **fields):
+    response = api.call("POST /applications", body={"title": title, "company": company, **fields})
+    assert response.status == 201, response.body
+    return response.body
+
+
+def _patch(api, app_id, **changes):
+    return api.call("PATCH /applications/{id}", path_params={"id": app_id}, body=changes)
+
+
+def _pages(api, query):
+    """Every page of GET /applications for `query`, following nextCursor."""
+    pages, cursor = [], None
+    while True:
+        response = api.call("GET /applications", query={**query, **({"cursor": cursor} if cursor else {})})
+        assert response.status == 200, response.body
+        pages.append(response.body)
+        cursor = response.body["nextCursor"]
+        if not cursor:
+            return pages
+
+
+def _ids(pages, key="items"):
+    return [item["applicationId"] for page in pages for item in page[key]]
+
+
+def _search(api, q):
+    response = api.call("GET /applications/search", query={"q": q})
+    assert response.status == 200, response.body
+    return [item["applicationId"] for item in response.body["items"]]
+
+
+def test_crud_and_conditional_requests(api):
+    created = _create(api)
+    app_id = created["applicationId"]
+
+    got = api.call("GET /applications/{id}", path_params={"id": app_id})
+    assert got.status == 200
+    assert got.body["status"] == "IN_PROGRESS"
+    etag = got.headers["etag"]
+
+    unchanged = api.call("GET /applications/{id}", path_params={"id": app_id}, headers={"if-none-match": etag})
+    assert unchanged.status == 304
+    assert unchanged.headers["vary"] == "accept-encoding"
+
+    assert _patch(api, app_id, notes="Call back on Monday").status == 200
+    changed = api.call("GET /applications/{id}", path_params={"id": app_id}, headers={"if-none-match": etag})
+    assert changed.status == 200
+    assert changed.body["notes"] == "Call back on Monday"
+    assert changed.headers["etag"] != etag
+
+    assert api.call("DELETE /applications/{id}", path_params={"id": app_id}).status == 200
+    assert api.call("GET /applications/{id}", path_params={"id": app_id}).status == 404
+
+
+def test_conditional_failures_on_missing_cards(api):
+    missing = {"id": "00000000-0000-0000-0000-000000000000"}
+    assert _patch(api, missing["id"], notes="x").status == 404
+    assert _patch(api, missing["id"], status="ACCEPTED").status == 404
+    assert _patch(api, missing["id"], status="CLOSED", closedReason="REFUSED").status == 404
+    assert _patch(api, missing["id"], closedReason="REFUSED").status == 404
+    assert api.call("DELETE /applications/{id}", path_params=missing).status == 404
+
+    # Nothing was created by the failed conditional writes
+    assert api.table.get_item(Key={"PK": PK, "SK": f"APP#{missing['id']}"}).get("Item") is None
+
+    app_id = _create(api)["applicationId"]
+    response = api.call("POST /applications/batch-delete", body={"ids": [app_id, missing["id"]]})
+    assert response.status == 200
+    assert (response.body["deleted"], response.body["notFound"], response.body["failed"]) == (1, 1, 0)
+    tombstones = list(
+        iter_query(
+            KeyConditionExpression="PK = :pk AND begins_with(SK, :prefix)",
+            ExpressionAttributeValues={":pk": PK, ":prefix": "DEL#"},
+        )
+    )
+    assert [item["applicationId"] for item in tombstones] == [app_id]
+
+
+def test_transaction_cancellation_reasons(api):
+    app_id = _create(api)["applicationId"]
+    key = {"PK": PK, "SK": f"APP#{app_id}"}
+
+    with pytest.raises(ClientError) as raised:
+        api.table.transact_write_items(
+            [
+                {
+                    "Update": {
+                        "Key": key,
+                        "UpdateExpression": "SET notes = :notes",
+                        "ConditionExpression": "#status = :expected",
+                        "ExpressionAttributeNames": {"#status": "status"},
+                        "ExpressionAttributeValues": {":notes": "x", ":expected": "CLOSED"},
+                        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+                    }
+                },
+                {"Put": {"Item": {"PK": PK, "SK": "TEST#other"}}},
+            ]
+        )
+    assert raised.value.response["Error"]["Code"] == "TransactionCanceledException"
+    reasons = cancellation_reasons(raised.value)
+    assert [reason.get("Code") for reason in reasons] == ["ConditionalCheckFailed", "None"]
+    assert reasons[0]["Item"]["status"] == "IN_PROGRESS"
+    assert reasons[0]["Item"]["applicationId"] == app_id
+    assert api.table.get_item(Key={"PK": PK, "SK": "TEST#other"}).get("Item") is None
+
+
+def test_idempotent_create_replays_from_the_cancellation(api):
+    body = {"title": "SRE", "company": "Alan"}
+    first = api.call("POST /applications", body=body, headers={"idempotency-key": "k-1"})
+    replay = api.call("POST /applications", body=body, headers={"idempotency-key": "k-1"})
+    assert (first.status, replay.status) == (201, 201)
+    assert replay.headers.get("Idempotent-Replayed") == "true"
+    assert replay.body["applicationId"] == first.body["applicationId"]
+
+    other = api.call("POST /applications", body={**body, "title": "SRE II"}, headers={"idempotency-key": "k-1"})
+    assert other.status == 422
+
+    stats = api.call("GET /applications/stats").body
+    assert stats["total"] == 1
+
+
+def test_status_changes_keep_the_stats_exact(api):
+    """Status PATCH and DELETE guess the previous state; wrong guesses retry from ALL_OLD."""
+    ids = [_create(api, title=f"Role {i}")["applicationId"] for i in range(4)]
+    assert _patch(api, ids[0], status="ACCEPTED").status == 200
+    # Guessed IN_PROGRESS, actually ACCEPTED
+    assert _patch(api, ids[0], status="CLOSED", closedReason="REFUSED").status == 200
+    assert _patch(api, ids[1], status="CLOSED", closedReason="ABANDONED").status == 200
+    # closedReason alone: guessed the other reason, which is right here
+    assert _patch(api, ids[1], closedReason="REFUSED").status == 200
+    # ...and wrong here (already REFUSED)
+    assert _patch(api, ids[1], closedReason="REFUSED").status == 200
+    # Guessed IN_PROGRESS, actually CLOSED
+    assert api.call("DELETE /applications/{id}", path_params={"id": ids[0]}).status == 200
+    assert api.call("DELETE /applications/{id}", path_params={"id": ids[2]}).status == 200
+
+    stats = api.call("GET /applications/stats").body
+    assert stats["total"] == 2
+    assert stats["byStatus"] == {"IN_PROGRESS": 1, "CLOSED": 1}
+    assert stats["closedByReason"] == {"REFUSED": 1}
+
+    history = api.call("GET /applications/{id}/history", path_params={"id": ids[1]}, query={"order": "asc"}).body
+    assert [(item["from"], item["to"]) for item in history["items"]] == [(None, "IN_PROGRESS"), ("IN_PROGRESS", "CLOSED")]
+
+
+def test_status_patch_answers_with_the_card_and_its_etag(api):
+    app_id = _create(api, notes="Referral")["applicationId"]
+
+    # The guessed state holds (IN_PROGRESS), then does not (ACCEPTED, retried)
+    for changes in ({"status": "ACCEPTED"}, {"status": "CLOSED", "closedReason": "REFUSED"}):
+        patched = _patch(api, app_id, **changes)
+        assert patched.status == 200, patched.body
+        got = api.call("GET /applications/{id}", path_params={"id": app_id})
+        assert patched.body == got.body
+        assert patched.headers["etag"] == got.headers["etag"]
+        assert patched.body["notes"] == "Referral"
+
+    revalidated = api.call("GET /applications/{id}", path_params={"id": app_id}, headers={"if-none-match": patched.headers["etag"]})
+    assert revalidated.status == 304
+
+def test_batch_status_retry_splits_a_chunk_grown_past_the_transaction_limit(api):
+    from routes.applications import _transition_chunk
+
+    ids = [_create(api, title=f"Role {i}")["applicationId"] for i in range(60)]
+    assert api.call("GET /applications/stats").body["byStatus"] == {"IN_PROGRESS": 60}
+    stored = iter_query(
+        KeyConditionExpression="PK = :pk AND begins_with(SK, :prefix)",
+        ExpressionAttributeValues={":pk": PK, ":prefix": "APP#"},
+    )
+    # Read as already ACCEPTED: one write each. As stored, each also needs its
+    # history item, 121 writes in all once the cancellation refreshes them.
+    stale = {card["applicationId"]: dict(card, status="ACCEPTED", version=-1) for card in stored}
+
+    results = {}
+    _transition_chunk(PK, stale, {"status": "ACCEPTED"}, results)
+    assert [results[app_id]["ok"] for app_id in ids] == [True] * 60
+
+    by_status = api.call("GET /applications/stats").body["byStatus"]
+    assert {status: count for status, count in by_status.items() if count} == {"ACCEPTED": 60}
+    history = api.call("GET /applications/{id}/history", path_params={"id": ids[-1]}, query={"order": "asc"}).body
+    assert [(item["from"], item["to"]) for item in history["items"]] == [(None, "IN_PROGRESS"), ("IN_PROGRESS", "ACCEPTED")]
+
+def test_status_index_paging(api):
+    ids = [_create(api, title=f"Role {i}")["applicationId"] for i in range(7)]
+    for app_id in ids[1::2]:
+        assert _patch(api, app_id, status="ACCEPTED").status == 200
+    assert _patch(api, ids[0], status="CLOSED", closedReason="REFUSED").status == 200
+    assert _patch(api, ids[2], notes="touched").status == 200
+
+    stored = iter_query(
+        KeyConditionExpression="PK = :pk AND begins_with(SK, :prefix)",
+        ExpressionAttributeValues={":pk": PK, ":prefix": "APP#"},
+    )
+    cards = {card["applicationId"]: card for card in stored}
+    by_recency = sorted(cards, key=lambda app_id: cards[app_id]["updatedAt"], reverse=True)
+
+    accepted = _pages(api, {"status": "ACCEPTED", "limit": "2"})
+    assert len(accepted) == 2
+    assert _ids(accepted) == [app_id for app_id in by_recency if cards[app_id]["status"] == "ACCEPTED"]
+
+    oldest_first = _pages(api, {"status": "IN_PROGRESS", "order": "asc", "limit": "1"})
+    assert _ids(oldest_first) == [app_id for app_id in reversed(by_recency) if cards[app_id]["status"] == "IN_PROGRESS"]
+
+    # Across statuses: the merge of the StatusIndex partitions
+    merged = _pages(api, {"sort": "updatedAt", "limit": "3", "fields": "applicationId,status"})
+    assert _ids(merged) == by_recency
+    assert set(merged[0]["items"][0]) == {"applicationId", "status"}
+
+    base_table = _pages(api, {"limit": "3"})
+    assert sorted(_ids(base_table)) == sorted(ids)
+
+    # The index keeps only the current status partition of each card
+    in_index = api.table.query(
+        IndexName=STATUS_INDEX,
+        KeyConditionExpression="GSI1PK = :gsi1pk",
+        ExpressionAttributeValues={":gsi1pk": status_index_pk(PK, "IN_PROGRESS")},
+    )["Items"]
+    assert sorted(item["applicationId"] for item in in_index) == sorted(ids[2::2][:2] + [ids[6]])
+
+    mismatched = api.call("GET /applications", query={"status": "CLOSED", "cursor": accepted[0]["nextCursor"]})
+    assert mismatched.status == 400
+
+
+def test_delta_sync_and_tombstone_ttl(api):
+    kept = _create(api)["applicationId"]
+    since = api.call("GET /applications/{id}", path_params={"id": kept}).body["updatedAt"]
+    gone = _create(api, title="Data Engineer")["applicationId"]
+    assert _patch(api, kept, status="ACCEPTED").status == 200
+    deleted = api.call("DELETE /applications/{id}", path_params={"id": gone})
+    assert deleted.status == 200
+
+    pages = _pages(api, {"since": since, "limit": "1"})
+    assert set(_ids(pages)) == {kept}
+    assert [item["applicationId"] for page in pages for item in page["deleted"]] == [gone]
+    assert pages[-1]["watermark"] >= since
+
+    tombstone = api.table.get_item(Key={"PK": PK, "SK": f"DEL#{gone}"})["Item"]
+    expected_expiry = int(datetime.fromisoformat(tombstone["updatedAt"]).timestamp()) + TOMBSTONE_TTL_SECONDS
+    assert tombstone["expiresAt"] == expected_expiry
+    assert tombstone["GSI1PK"] == status_index_pk(PK, "DELETED")
+
+
+def test_stream_side_effects(api):
+    app_id = _create(api, title="Platform Engineer", company="Doctolib", location="Lyon")["applicationId"]
+    assert _search(api, "doctolib") == [app_id]
+    assert _search(api, "plat") == [app_id]
+
+    assert _patch(api, app_id, company="Back Market").status == 200
+    assert _search(api, "doctolib") == []
+    assert _search(api, "back market") == [app_id]
+
+    assert _patch(api, app_id, status="ACCEPTED").status == 200
+    history_query = {
+        "KeyConditionExpression": "PK = :pk AND begins_with(SK, :prefix)",
+        "ExpressionAttributeValues": {":pk": PK, ":prefix": history_prefix(app_id)},
+    }
+    assert len(list(iter_query(**history_query))) == 2
+
+    assert api.call("DELETE /applications/{id}", path_params={"id": app_id}).status == 200
+    assert _search(api, "market") == []
+    assert list(iter_query(**history_query)) == []
+
+
+def test_import_stopped_by_an_unreadable_row_keeps_the_stats_exact(api):
+    _create(api)
+    # Built now: later reads use the stored counters, not a rebuild
+    assert api.call("GET /applications/stats").body["total"] == 1
+    rows = "".join(f"Role {i},Company {i}\r\n" for i in range(100))
+    body = "title,company\r\n" + rows + "Too long," + "x" * (128 * 1024 + 1) + "\r\nNever read,Company\r\n"
+
+    response = api.call("POST /applications/import", query={"format": "csv"}, body=body)
+    assert response.status == 207, response.body
+    assert response.body["imported"] == 100
+    assert response.body["stoppedAtLine"] == 102
+    assert response.body["errors"][-1]["line"] == 102
+
+    listed = _pages(api, {"limit": "100", "fields": "applicationId"})
+    assert len(_ids(listed)) == 101
+    assert api.call("GET /applications/stats").body["total"] == 101
+
+    # Nothing written: a plain 400
+    unreadable_header = api.call("POST /applications/import", query={"format": "csv"}, body="x" * (128 * 1024 + 1))
+    assert unreadable_header.status == 400
+    assert unreadable_header.body["message"].endswith("(line 1)")
+
+
+def test_export_leaves_out_the_table_keys(api, monkeypatch, tmp_path):
+    monkeypatch.setenv("EXPORT_DIR", str(tmp_path / "exports"))
+    app_id = _create(api, notes="Ask about remote")["applicationId"]
+    assert _patch(api, app_id, status="ACCEPTED").status == 200
+
+    response = api.call("POST /applications/export")
+    assert response.status == 201, response.body
+    with gzip.open(urlparse(response.body["url"]).path, "rt") as exported:
+        [card] = [json.loads(line) for line in exported]
+
+    assert not {"PK", "SK", "GSI1PK"} & set(card)
+    assert (card["applicationId"], card["notes"], card["status"]) == (app_id, "Ask about remote", "ACCEPTED")
+    assert [(entry["from"], entry["to"]) for entry in card["history"]] == [(None, "IN_PROGRESS"), ("IN_PROGRESS", "ACCEPTED")]